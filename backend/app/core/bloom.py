@@ -0,0 +1,250 @@
+import math
+import struct
+from typing import Dict, Iterable, Optional, Union
+import numpy as np
+
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _splitmix64(values: np.ndarray, seed: int) -> np.ndarray:
+    """
+    Vectorized 64-bit mixing hash of integer keys
+    """
+    with np.errstate(over="ignore"):
+        z = values.astype(np.uint64) + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return (z ^ (z >> np.uint64(31))) & _MASK64
+
+
+class BloomFilter:
+    """
+    Bloom filter over integer ids, sized for a capacity and false-positive rate
+
+    Bit positions come from double hashing two splitmix64 hashes, so
+    membership for a whole array of ids is checked in one vectorized pass.
+    """
+
+    HEADER = struct.Struct("<QII")  # bits, hashes, count
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        num_bits: Optional[int] = None,
+        num_hashes: Optional[int] = None,
+        bits: Optional[np.ndarray] = None,
+        count: int = 0
+    ):
+        if num_bits is None:
+            num_bits = max(64, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        if num_hashes is None:
+            num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else np.zeros((num_bits + 7) // 8, dtype=np.uint8)
+        self.count = count
+
+    def _positions(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Bit positions, shape (len(ids), num_hashes)
+        """
+        h1 = _splitmix64(ids, 1)
+        h2 = _splitmix64(ids, 2) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.num_bits)
+
+    def add_many(self, ids: Iterable[int]) -> None:
+        ids = np.fromiter(ids, dtype=np.int64)
+        if ids.size == 0:
+            return
+
+        positions = self._positions(ids).ravel()
+        np.bitwise_or.at(
+            self.bits,
+            (positions >> np.uint64(3)).astype(np.intp),
+            (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8))
+        )
+        self.count += int(ids.size)
+
+    def add(self, item_id: int) -> None:
+        self.add_many((item_id,))
+
+    def contains_many(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Boolean array: True where the id may have been added
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if ids.size == 0:
+            return np.zeros(0, dtype=bool)
+
+        positions = self._positions(ids)
+        bytes_ = self.bits[(positions >> np.uint64(3)).astype(np.intp)]
+        masks = np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)
+        return np.all(bytes_ & masks, axis=1)
+
+    def __contains__(self, item_id: int) -> bool:
+        return bool(self.contains_many(np.array([item_id]))[0])
+
+    def merge(self, other: "BloomFilter") -> None:
+        """
+        Union with a filter of the same shape (bitwise OR)
+        """
+        if (other.num_bits, other.num_hashes) != (self.num_bits, self.num_hashes):
+            raise ValueError("Cannot merge Bloom filters of different shapes")
+        np.bitwise_or(self.bits, other.bits, out=self.bits)
+        self.count = max(self.count, other.count)
+
+    def to_bytes(self) -> bytes:
+        return self.HEADER.pack(self.num_bits, self.num_hashes, self.count) + self.bits.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        num_bits, num_hashes, count = cls.HEADER.unpack_from(data)
+        bits = np.frombuffer(data, dtype=np.uint8, offset=cls.HEADER.size).copy()
+        return cls(0, 0.0, num_bits=num_bits, num_hashes=num_hashes, bits=bits, count=count)
+
+
+def _exact_contains(sorted_ids: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    positions = np.minimum(np.searchsorted(sorted_ids, ids), sorted_ids.size - 1)
+    return sorted_ids[positions] == ids
+
+
+class RotatingBloomFilter:
+    """
+    Time-bucketed Bloom filters: one generation per period, oldest dropped
+
+    Memory stays bounded however many ids are added, and ids age out after
+    `generations` periods. Generations are keyed by absolute period number,
+    so two copies of the same filter can be merged generation by generation.
+
+    With an `exact_limit`, a generation starts as a sorted array of ids and
+    only becomes a Bloom filter sized for `capacity` once it holds more than
+    that many ids, so sparse generations take a few bytes per id and have
+    no false positives.
+    """
+
+    HEADER = struct.Struct("<dIdI")  # period_seconds, generations, error_rate, capacity
+    GENERATION_HEADER = struct.Struct("<qI")  # period number, payload length
+
+    # Exact generation payloads start with this in place of BloomFilter's
+    # bit count, which is never zero
+    EXACT_MARKER = struct.Struct("<Q").pack(0)
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        period_seconds: float,
+        generations: int,
+        exact_limit: int = 0
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.period_seconds = period_seconds
+        self.generations = generations
+        self.exact_limit = exact_limit
+        self._filters: Dict[int, Union[BloomFilter, np.ndarray]] = {}
+
+    def _period(self, now: float) -> int:
+        return int(now // self.period_seconds)
+
+    def _rotate(self, now: float) -> int:
+        current = self._period(now)
+        for period in [period for period in self._filters if period <= current - self.generations]:
+            del self._filters[period]
+        return current
+
+    def _add_to_generation(self, period: int, ids: np.ndarray) -> None:
+        generation = self._filters.get(period)
+        if isinstance(generation, BloomFilter):
+            generation.add_many(ids)
+            return
+
+        if generation is not None:
+            ids = np.union1d(generation, ids)
+        else:
+            ids = np.unique(ids)
+        if ids.size <= self.exact_limit:
+            self._filters[period] = ids
+            return
+
+        # Each generation gets an equal share of the error budget
+        bloom = BloomFilter(self.capacity, self.error_rate / self.generations)
+        bloom.add_many(ids)
+        self._filters[period] = bloom
+
+    def add_many(self, ids: Iterable[int], now: float) -> None:
+        current = self._rotate(now)
+        self._add_to_generation(current, np.fromiter(ids, dtype=np.int64))
+
+    def contains_many(self, ids: np.ndarray, now: float) -> np.ndarray:
+        self._rotate(now)
+        ids = np.asarray(ids, dtype=np.int64)
+        found = np.zeros(ids.size, dtype=bool)
+        for generation in self._filters.values():
+            if isinstance(generation, BloomFilter):
+                found |= generation.contains_many(ids)
+            else:
+                found |= _exact_contains(generation, ids)
+        return found
+
+    def merge(self, other: "RotatingBloomFilter") -> None:
+        """
+        Union with another filter, generation by generation
+
+        Generations only `other` has are taken as they are; this filter's
+        capacity, error rate and exact limit apply to generations it creates
+        or converts from then on.
+        """
+        for period, generation in other._filters.items():
+            if period not in self._filters:
+                self._filters[period] = generation
+            elif isinstance(generation, BloomFilter) and isinstance(self._filters[period], BloomFilter):
+                self._filters[period].merge(generation)
+            elif isinstance(generation, BloomFilter):
+                generation.add_many(self._filters[period])
+                self._filters[period] = generation
+            else:
+                self._add_to_generation(period, generation)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(
+            generation.bits.nbytes if isinstance(generation, BloomFilter) else generation.nbytes
+            for generation in self._filters.values()
+        )
+
+    def to_bytes(self, now: float) -> bytes:
+        self._rotate(now)
+        parts = [self.HEADER.pack(self.period_seconds, self.generations, self.error_rate, self.capacity)]
+        for period in sorted(self._filters):
+            generation = self._filters[period]
+            if isinstance(generation, BloomFilter):
+                payload = generation.to_bytes()
+            else:
+                payload = self.EXACT_MARKER + generation.astype("<i8").tobytes()
+            parts.append(self.GENERATION_HEADER.pack(period, len(payload)))
+            parts.append(payload)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RotatingBloomFilter":
+        period_seconds, generations, error_rate, capacity = cls.HEADER.unpack_from(data)
+        rotating = cls(capacity, error_rate, period_seconds, generations)
+
+        offset = cls.HEADER.size
+        while offset < len(data):
+            period, length = cls.GENERATION_HEADER.unpack_from(data, offset)
+            offset += cls.GENERATION_HEADER.size
+            payload = data[offset:offset + length]
+            if payload.startswith(cls.EXACT_MARKER):
+                rotating._filters[period] = np.frombuffer(payload, dtype="<i8", offset=len(cls.EXACT_MARKER)).astype(np.int64)
+            else:
+                rotating._filters[period] = BloomFilter.from_bytes(payload)
+            offset += length
+
+        return rotating
@@ -0,0 +1,330 @@
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.redis import get_redis, shared_store_enabled
+
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    Size-bounded in-process cache with per-entry TTL
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class CacheBackend(ABC):
+    """
+    Shared cache tier interface (string values)
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    async def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        return [await self.get(key) for key in keys]
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        ...
+
+    async def set_many(self, values: Dict[str, str], ttl: int) -> None:
+        for key, value in values.items():
+            await self.set(key, value, ttl)
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """
+        Atomically increment a counter that never expires; returns the new value
+        """
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Local stand-in for the Redis cache tier
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[float, str]] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._values[key]
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._values[key] = (time.monotonic() + ttl, value)
+
+    async def delete(self, key: str) -> None:
+        self._values.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        value = int(await self.get(key) or 0) + 1
+        self._values[key] = (float("inf"), str(value))
+        return value
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis-backed shared cache tier
+    """
+
+    async def get(self, key: str) -> Optional[str]:
+        return await get_redis().get(key)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        return await get_redis().mget(keys)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await get_redis().set(key, value, ex=ttl)
+
+    async def set_many(self, values: Dict[str, str], ttl: int) -> None:
+        pipe = get_redis().pipeline(transaction=False)
+        for key, value in values.items():
+            pipe.set(key, value, ex=ttl)
+        await pipe.execute()
+
+    async def delete(self, key: str) -> None:
+        await get_redis().delete(key)
+
+    async def incr(self, key: str) -> int:
+        return await get_redis().incr(key)
+
+
+class TieredCache:
+    """
+    Two-tier cache: a small in-process LRU in front of a shared backend
+
+    Values must be JSON-serializable. The local tier uses a short TTL since
+    invalidations only reach the local LRU of the worker that made the write.
+    Shared tier failures are logged and treated as misses.
+
+    Groups of keys that are invalidated together (e.g. every feed page)
+    embed a generation number in their keys. Invalidating the group bumps
+    the generation, so readers move on to fresh keys and the old entries
+    are left to expire by TTL; nothing has to enumerate them.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        backend: CacheBackend,
+        max_entries: int = 1024,
+        local_ttl: float = 10
+    ):
+        self.namespace = namespace
+        self.backend = backend
+        self.local = LRUCache(max_entries, local_ttl)
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.shared_errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        key = self._key(key)
+
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        try:
+            raw = await self.backend.get(key)
+        except Exception:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache get failed for {key}", exc_info=True)
+            return None
+
+        if raw is None:
+            self.shared_misses += 1
+            return None
+
+        self.shared_hits += 1
+        value = json.loads(raw)
+        self.local.set(key, value)
+        return value
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Look up several keys at once; returns only the keys that were found
+        """
+        found: Dict[str, Any] = {}
+        shared_keys = []
+        for key in keys:
+            value = self.local.get(self._key(key))
+            if value is not None:
+                found[key] = value
+            else:
+                shared_keys.append(key)
+
+        if not shared_keys:
+            return found
+
+        try:
+            raws = await self.backend.get_many([self._key(key) for key in shared_keys])
+        except Exception:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache get failed for {len(shared_keys)} keys", exc_info=True)
+            return found
+
+        for key, raw in zip(shared_keys, raws):
+            if raw is None:
+                self.shared_misses += 1
+                continue
+            self.shared_hits += 1
+            found[key] = json.loads(raw)
+            self.local.set(self._key(key), found[key])
+
+        return found
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        key = self._key(key)
+        self.local.set(key, value, min(ttl, self.local.ttl))
+
+        try:
+            await self.backend.set(key, json.dumps(value), ttl)
+        except Exception:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache set failed for {key}", exc_info=True)
+
+    async def set_many(self, values: Dict[str, Any], ttl: int) -> None:
+        for key, value in values.items():
+            self.local.set(self._key(key), value, min(ttl, self.local.ttl))
+
+        try:
+            await self.backend.set_many(
+                {self._key(key): json.dumps(value) for key, value in values.items()},
+                ttl
+            )
+        except Exception:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache set failed for {len(values)} keys", exc_info=True)
+
+    async def invalidate(self, key: str) -> None:
+        key = self._key(key)
+        self.local.delete(key)
+
+        try:
+            await self.backend.delete(key)
+        except Exception:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache delete failed for {key}", exc_info=True)
+
+    async def generation(self, group: str) -> int:
+        """
+        Current generation of a key group, to embed in the group's keys
+
+        Kept in the local tier like any value, so other workers see a bump
+        within the local TTL.
+        """
+        key = self._key(f"{group}:generation")
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        try:
+            raw = await self.backend.get(key)
+        except Exception:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache get failed for {key}", exc_info=True)
+            return 0
+
+        value = int(raw or 0)
+        self.local.set(key, value)
+        return value
+
+    async def invalidate_group(self, group: str) -> None:
+        """
+        Invalidate every key built from the group's current generation
+        """
+        key = self._key(f"{group}:generation")
+
+        try:
+            value = await self.backend.incr(key)
+        except Exception:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache increment failed for {key}", exc_info=True)
+            # Still move this worker off the current generation
+            value = (self.local.get(key) or 0) + 1
+
+        self.local.set(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "local": self.local.stats(),
+            "shared": {
+                "hits": self.shared_hits,
+                "misses": self.shared_misses,
+                "errors": self.shared_errors,
+            },
+        }
+
+
+def create_cache_backend() -> CacheBackend:
+    """
+    Redis outside development/testing, in-memory stand-in otherwise
+    """
+    return RedisCacheBackend() if shared_store_enabled() else InMemoryCacheBackend()
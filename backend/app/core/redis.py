@@ -0,0 +1,39 @@
+from app.core.config import settings
+
+
+_client = None
+
+
+def shared_store_enabled() -> bool:
+    """
+    Whether shared state should live in Redis
+
+    Development and testing run with in-process stand-ins so no Redis
+    server is required.
+    """
+    return settings.ENVIRONMENT not in ("development", "testing")
+
+
+def get_redis():
+    """
+    Get the shared async Redis client (created lazily)
+    """
+    global _client
+
+    if _client is None:
+        import redis.asyncio as aioredis
+
+        _client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+
+    return _client
+
+
+async def close_redis() -> None:
+    """
+    Close the shared Redis client if it was opened
+    """
+    global _client
+
+    if _client is not None:
+        await _client.close()
+        _client = None
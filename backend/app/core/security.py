@@ -1,20 +1,32 @@
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
 
 
+# bcrypt work factor (cost doubles per round); stored hashes with a lower
+# cost are re-hashed on the user's next successful login
+PASSWORD_HASH_ROUNDS = 12
+
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=PASSWORD_HASH_ROUNDS,
+    bcrypt__min_rounds=PASSWORD_HASH_ROUNDS
+)
 
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """
-    Hash a plain password
+    Hash a plain password, with the configured work factor unless `rounds` is given
     """
-    return pwd_context.hash(password)
+    if rounds is None:
+        return pwd_context.hash(password)
+    return pwd_context.copy(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds).hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -24,6 +36,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password, also returning a new hash if the stored one uses outdated settings
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def new_token_id() -> str:
+    """
+    Random id for the jti (token) and fam (login session) claims
+    """
+    return uuid.uuid4().hex
+
+
 def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token
@@ -35,7 +61,7 @@ def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "type": "access", "jti": new_token_id()})
     
     encoded_jwt = jwt.encode(
         to_encode,
@@ -53,7 +79,7 @@ def create_refresh_token(data: Dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "type": "refresh", "jti": new_token_id()})
     
     encoded_jwt = jwt.encode(
         to_encode,
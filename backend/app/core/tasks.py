@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Runs an async callback on a fixed interval in the background
+
+    Used by the write-behind components to flush buffered state. The
+    callback runs once more on stop so nothing buffered is lost on shutdown.
+    Stopping never cancels a callback mid-run: a flush that has already
+    swapped out its buffer is allowed to finish writing it.
+    """
+
+    def __init__(self, name: str, callback: Callable[[], Awaitable], interval: float):
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """
+        Start the background loop
+        """
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        """
+        Stop the background loop and run the callback a final time
+
+        Waits for a callback that is already running to complete.
+        """
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+
+        await self._run_once()
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                await self._run_once()
+
+    async def _run_once(self) -> None:
+        try:
+            await self.callback()
+        except Exception:
+            logger.exception(f"Periodic task {self.name} failed")
@@ -6,6 +6,10 @@ Base = declarative_base()
 from app.models.user import User
 from app.models.recipe import Recipe
 from app.models.video import Video
-from app.models.engagement import Like, Save
+from app.models.engagement import Like, Save, RecipeCounterShard
 from app.models.follower import Follower
-from app.models.recommendation import EngagementLog, RecommendationWeight
\ No newline at end of file
+from app.models.recommendation import EngagementLog, RecommendationWeight, UserSeenFilter, RecipeNeighbor, JobCheckpoint, RecipeContentVector
+from app.models.ingredient import Ingredient, RecipeIngredient
+from app.models.tag import Tag, RecipeTag
+from app.models.trending import RecipeTrending
+from app.models.timeline import TimelineEntry, TimelineHead
\ No newline at end of file
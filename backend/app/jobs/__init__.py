@@ -0,0 +1,5 @@
+"""
+Offline and periodic jobs
+
+Run with `python -m app.jobs.<name>`.
+"""
@@ -0,0 +1,88 @@
+"""
+Rebuild the content vectors of all published recipes
+
+Recipes are vectorized in id order, one batch per transaction, and
+vectors of unpublished recipes are dropped. Run after changing the
+vectorizer settings in app.services.content_index; running API workers
+pick the new vectors up on their next sync.
+
+Usage:
+    python -m app.jobs.build_content_index [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import logging
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.database.session import AsyncSessionLocal, close_db
+from app.models.recipe import Recipe
+from app.models.recommendation import RecipeContentVector
+from app.services.content_index import vectorize_recipe
+
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild(batch_size: int) -> int:
+    """
+    Vectorize every published recipe, committing once per batch; returns recipes written
+    """
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            delete(RecipeContentVector).where(
+                RecipeContentVector.recipe_id.in_(
+                    select(Recipe.id).where(Recipe.is_published == False)
+                )
+            )
+        )
+        await db.commit()
+
+    total = 0
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Recipe.id, Recipe.title, Recipe.description, Recipe.tags, Recipe.ingredients)
+                .where(Recipe.is_published == True, Recipe.id > last_id)
+                .order_by(Recipe.id)
+                .limit(batch_size)
+            )
+            recipes = result.all()
+            if not recipes:
+                break
+
+            stmt = pg_insert(RecipeContentVector.__table__)
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["recipe_id"],
+                    set_={"vector": stmt.excluded.vector, "updated_at": func.clock_timestamp()}
+                ),
+                [
+                    {"recipe_id": recipe.id, "vector": vectorize_recipe(recipe).tobytes()}
+                    for recipe in recipes
+                ]
+            )
+            await db.commit()
+
+        last_id = recipes[-1].id
+        total += len(recipes)
+        logger.info(f"Vectorized {total} recipes (last id {last_id})")
+
+    return total
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        total = await rebuild(args.batch_size)
+        logger.info(f"Done: {total} recipes vectorized")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
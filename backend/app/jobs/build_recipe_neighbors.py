@@ -0,0 +1,247 @@
+"""
+Build item-item recipe neighbors from likes and saves
+
+Cosine similarity between recipes' user-interaction vectors, computed one
+chunk of recipes at a time so only chunk_size rows of the similarity
+matrix are ever in memory. With --incremental, only recipes that gained
+likes/saves since the last run (and recipes sharing users with them) are
+recomputed; run a full build periodically to account for unlikes.
+
+Usage:
+    python -m app.jobs.build_recipe_neighbors [--incremental] [--top-n 20] [--chunk-size 1000]
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+import numpy as np
+import scipy.sparse as sp
+from sqlalchemy import select, insert, delete, literal, union_all, union, func, bindparam
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert as pg_insert, ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.session import AsyncSessionLocal, close_db
+from app.models.engagement import Like, Save
+from app.models.recipe import Recipe
+from app.models.recommendation import RecipeNeighbor, JobCheckpoint
+
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "recipe_neighbors"
+
+# A save says more about taste than a like
+INTERACTION_WEIGHTS = {"like": 1.0, "save": 2.0}
+
+# Rows fetched per round trip while loading interactions
+LOAD_PARTITION_SIZE = 50000
+
+
+async def load_interactions(db: AsyncSession) -> Tuple[sp.csr_matrix, np.ndarray]:
+    """
+    Row-normalized recipe x user matrix and the recipe id of each row
+    """
+    interactions = union_all(
+        select(Like.recipe_id, Like.user_id, literal(INTERACTION_WEIGHTS["like"])),
+        select(Save.recipe_id, Save.user_id, literal(INTERACTION_WEIGHTS["save"]))
+    )
+
+    recipe_parts, user_parts, weight_parts = [], [], []
+    result = await db.stream(interactions)
+    async for rows in result.partitions(LOAD_PARTITION_SIZE):
+        recipe_parts.append(np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)))
+        user_parts.append(np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows)))
+        weight_parts.append(np.fromiter((row[2] for row in rows), dtype=np.float32, count=len(rows)))
+
+    if not recipe_parts:
+        return sp.csr_matrix((0, 0), dtype=np.float32), np.zeros(0, dtype=np.int64)
+
+    recipe_ids, rows = np.unique(np.concatenate(recipe_parts), return_inverse=True)
+    _, columns = np.unique(np.concatenate(user_parts), return_inverse=True)
+    weights = np.concatenate(weight_parts)
+
+    # Duplicate (recipe, user) entries, i.e. liked and saved, are summed
+    matrix = sp.csr_matrix(
+        (weights, (rows, columns)),
+        shape=(recipe_ids.size, int(columns.max()) + 1),
+        dtype=np.float32
+    )
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    matrix = sp.diags(1.0 / np.maximum(norms, 1e-12)).astype(np.float32) @ matrix
+    return matrix.tocsr(), recipe_ids
+
+
+def top_neighbors(matrix: sp.csr_matrix, rows: np.ndarray, top_n: int):
+    """
+    Yield (row, neighbor_rows, scores) for each of `rows`, best first
+    """
+    similarities = (matrix[rows] @ matrix.T).tocsr()
+
+    for i, row in enumerate(rows):
+        start, end = similarities.indptr[i], similarities.indptr[i + 1]
+        columns = similarities.indices[start:end]
+        scores = similarities.data[start:end]
+
+        keep = columns != row
+        columns, scores = columns[keep], scores[keep]
+        if columns.size > top_n:
+            best = np.argpartition(-scores, top_n - 1)[:top_n]
+            columns, scores = columns[best], scores[best]
+
+        order = np.argsort(-scores, kind="stable")
+        yield row, columns[order], scores[order]
+
+
+def affected_rows(matrix: sp.csr_matrix, changed_rows: np.ndarray) -> np.ndarray:
+    """
+    Changed rows plus every row sharing a user with them
+    """
+    if changed_rows.size == 0:
+        return changed_rows
+
+    co_interacted = (matrix[changed_rows] @ matrix.T).tocsc()
+    touched = np.flatnonzero(np.diff(co_interacted.indptr))
+    return np.union1d(changed_rows, touched)
+
+
+async def get_checkpoint(db: AsyncSession) -> Optional[datetime]:
+    result = await db.execute(select(JobCheckpoint.last_run_at).where(JobCheckpoint.name == JOB_NAME))
+    return result.scalar_one_or_none()
+
+
+async def set_checkpoint(db: AsyncSession, started_at: datetime) -> None:
+    stmt = pg_insert(JobCheckpoint).values(name=JOB_NAME, last_run_at=started_at)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"last_run_at": stmt.excluded.last_run_at}
+        )
+    )
+
+
+async def get_changed_recipe_ids(db: AsyncSession, since: datetime) -> np.ndarray:
+    result = await db.execute(
+        union(
+            select(Like.recipe_id).where(Like.created_at >= since),
+            select(Save.recipe_id).where(Save.created_at >= since)
+        )
+    )
+    return np.array(result.scalars().all(), dtype=np.int64)
+
+
+_neighbors = RecipeNeighbor.__table__
+_NEIGHBOR_COLUMNS = ["recipe_id", "rank", "neighbor_id", "score"]
+
+
+def _neighbors_insert():
+    """
+    INSERT ... SELECT of a chunk passed as one array per column
+
+    Pairs whose recipe or neighbor was deleted since the interactions were
+    loaded are dropped by the joins instead of failing the chunk on the
+    foreign keys; ranks are renumbered so each list stays contiguous.
+    """
+    pairs = (
+        func.unnest(*[
+            bindparam(f"{column}s", type_=ARRAY(_neighbors.c[column].type))
+            for column in _NEIGHBOR_COLUMNS
+        ])
+        .table_valued(*_NEIGHBOR_COLUMNS)
+        .render_derived(name="pairs")
+    )
+    neighbor = aliased(Recipe)
+    rank = func.row_number().over(partition_by=pairs.c.recipe_id, order_by=pairs.c.rank) - 1
+    return insert(_neighbors).from_select(
+        _NEIGHBOR_COLUMNS,
+        select(pairs.c.recipe_id, rank, pairs.c.neighbor_id, pairs.c.score)
+        .join(Recipe, Recipe.id == pairs.c.recipe_id)
+        .join(neighbor, neighbor.id == pairs.c.neighbor_id)
+    )
+
+
+_NEIGHBORS_INSERT = _neighbors_insert()
+
+
+async def write_neighbors(db: AsyncSession, recipe_ids: np.ndarray, neighbor_lists) -> None:
+    """
+    Replace the neighbor lists of a chunk of recipes (caller commits)
+    """
+    chunk_ids = []
+    params = {f"{column}s": [] for column in _NEIGHBOR_COLUMNS}
+    for row, neighbor_rows, scores in neighbor_lists:
+        recipe_id = int(recipe_ids[row])
+        chunk_ids.append(recipe_id)
+        for rank, (neighbor_row, score) in enumerate(zip(neighbor_rows, scores)):
+            params["recipe_ids"].append(recipe_id)
+            params["ranks"].append(rank)
+            params["neighbor_ids"].append(int(recipe_ids[neighbor_row]))
+            params["scores"].append(float(score))
+
+    await db.execute(delete(RecipeNeighbor).where(RecipeNeighbor.recipe_id.in_(chunk_ids)))
+    if params["recipe_ids"]:
+        await db.execute(_NEIGHBORS_INSERT, params)
+
+
+async def build(top_n: int, chunk_size: int, incremental: bool) -> int:
+    """
+    Recompute neighbor lists, committing once per chunk; returns recipes updated
+    """
+    started_at = datetime.now(timezone.utc)
+
+    async with AsyncSessionLocal() as db:
+        matrix, recipe_ids = await load_interactions(db)
+        since = await get_checkpoint(db) if incremental else None
+
+        if since is not None:
+            changed = await get_changed_recipe_ids(db, since)
+            changed_rows = np.flatnonzero(np.isin(recipe_ids, changed))
+            targets = affected_rows(matrix, changed_rows)
+        else:
+            targets = np.arange(recipe_ids.size)
+            # Recipes that lost all their interactions keep no neighbors
+            await db.execute(
+                delete(RecipeNeighbor).where(
+                    RecipeNeighbor.recipe_id.not_in(
+                        union(select(Like.recipe_id), select(Save.recipe_id))
+                    )
+                )
+            )
+            await db.commit()
+
+    logger.info(f"{recipe_ids.size} recipes with interactions, {targets.size} to update")
+
+    total = 0
+    for start in range(0, targets.size, chunk_size):
+        chunk = targets[start:start + chunk_size]
+        async with AsyncSessionLocal() as db:
+            await write_neighbors(db, recipe_ids, top_neighbors(matrix, chunk, top_n))
+            await db.commit()
+
+        total += chunk.size
+        logger.info(f"Updated {total}/{targets.size} recipes")
+
+    async with AsyncSessionLocal() as db:
+        await set_checkpoint(db, started_at)
+        await db.commit()
+
+    return total
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top-n", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--incremental", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        total = await build(args.top_n, args.chunk_size, args.incremental)
+        logger.info(f"Done: {total} neighbor lists written")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
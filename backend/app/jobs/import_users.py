@@ -0,0 +1,181 @@
+"""
+Bulk-import user accounts from a CSV or NDJSON file
+
+Each record needs `email` and `username`, plus either `password` (hashed
+here) or `password_hash` (an existing bcrypt hash, stored as is). Records
+whose email or username already exists are skipped, as are invalid ones.
+
+Passwords are hashed on all cores while the previous batch is being
+inserted; each batch is one multi-row INSERT ... ON CONFLICT DO NOTHING.
+A --rounds value below the configured work factor makes the import
+cheaper; those hashes are upgraded when the user next logs in.
+
+Usage:
+    python -m app.jobs.import_users users.csv [--format csv|ndjson] [--batch-size 1000]
+        [--workers N] [--rounds 10]
+"""
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Tuple
+from pydantic import BaseModel, EmailStr, Field, ValidationError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.database.session import AsyncSessionLocal, close_db
+from app.models.user import User
+from app.core.security import hash_password, PASSWORD_HASH_ROUNDS
+
+
+logger = logging.getLogger(__name__)
+
+_users = User.__table__
+
+
+class ImportedUser(BaseModel):
+    email: EmailStr
+    username: str = Field(..., min_length=3, max_length=50)
+    password: Optional[str] = Field(None, min_length=8, max_length=100)
+    password_hash: Optional[str] = Field(None, pattern=r"^\$2[aby]\$\d{2}\$.{53}$")
+
+
+def read_records(path: str, file_format: str) -> Iterator[Tuple[int, Dict]]:
+    """
+    Yield (line number, raw record) from the input file
+
+    CSV rows with extra fields and NDJSON lines that are not valid JSON
+    objects are logged and skipped.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        if file_format == "csv":
+            for line_number, record in enumerate(csv.DictReader(handle), start=2):
+                # DictReader puts fields beyond the header under the key None
+                if None in record:
+                    logger.warning(f"Line {line_number}: skipped, more fields than the header")
+                    continue
+                yield line_number, record
+        else:
+            for line_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as error:
+                    logger.warning(f"Line {line_number}: skipped, invalid JSON ({error.msg})")
+                    continue
+                if not isinstance(record, dict):
+                    logger.warning(f"Line {line_number}: skipped, not a JSON object")
+                    continue
+                yield line_number, record
+
+
+def parse_batches(path: str, file_format: str, batch_size: int) -> Iterator[List[ImportedUser]]:
+    """
+    Valid records in batches; invalid ones are logged and dropped
+    """
+    batch = []
+    for line_number, record in read_records(path, file_format):
+        try:
+            user = ImportedUser(**{key: value for key, value in record.items() if value not in ("", None)})
+        except ValidationError as error:
+            logger.warning(f"Line {line_number}: skipped, {error.errors()[0]['msg']}")
+            continue
+        if not user.password and not user.password_hash:
+            logger.warning(f"Line {line_number}: skipped, no password or password_hash")
+            continue
+
+        batch.append(user)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def hash_batch(executor: ProcessPoolExecutor, batch: List[ImportedUser], rounds: int) -> List[Dict]:
+    """
+    Insert parameters for a batch, hashing plain passwords across the pool
+    """
+    plain = [user.password for user in batch if not user.password_hash]
+    hashes = iter(executor.map(partial(hash_password, rounds=rounds), plain, chunksize=16))
+
+    return [
+        {
+            "email": user.email,
+            "username": user.username,
+            "hashed_password": user.password_hash or next(hashes),
+        }
+        for user in batch
+    ]
+
+
+async def insert_batch(params: List[Dict]) -> int:
+    """
+    Insert one batch, skipping existing emails/usernames; returns rows inserted
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            pg_insert(_users).on_conflict_do_nothing().returning(_users.c.id),
+            params
+        )
+        inserted = len(result.all())
+        await db.commit()
+    return inserted
+
+
+async def import_users(path: str, file_format: str, batch_size: int, workers: int, rounds: int) -> Tuple[int, int]:
+    """
+    Import the file; returns (inserted, skipped as duplicates)
+    """
+    loop = asyncio.get_running_loop()
+    inserted = skipped = 0
+
+    # spawn: workers must not inherit the event loop or DB pool
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        pending: Optional[asyncio.Future] = None
+        for batch in parse_batches(path, file_format, batch_size):
+            # Hash this batch while the previous one is being inserted
+            hashing = loop.run_in_executor(None, hash_batch, executor, batch, rounds)
+            if pending is not None:
+                params = await pending
+                count = await insert_batch(params)
+                inserted += count
+                skipped += len(params) - count
+                logger.info(f"Imported {inserted} users ({skipped} duplicates skipped)")
+            pending = hashing
+
+        if pending is not None:
+            params = await pending
+            count = await insert_batch(params)
+            inserted += count
+            skipped += len(params) - count
+
+    return inserted, skipped
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--rounds", type=int, default=PASSWORD_HASH_ROUNDS)
+    args = parser.parse_args()
+
+    file_format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        inserted, skipped = await import_users(args.path, file_format, args.batch_size, args.workers, args.rounds)
+        logger.info(f"Done: {inserted} users imported, {skipped} duplicates skipped")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+Add full-text search to an existing recipes table
+
+Creates what Recipe's after_create listeners only create for new tables:
+the recipes_search_vector_update() function, the search_vector column and
+the trigger that maintains it. Existing rows are then backfilled in
+batches and the GIN index is built CONCURRENTLY, so writes to recipes are
+never blocked for longer than the short DDL steps. Every step is
+idempotent; rerun the job if it is interrupted.
+
+Usage:
+    python -m app.jobs.migrate_search_vector [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import logging
+from sqlalchemy import select, update, text
+from app.database.session import AsyncSessionLocal, engine, close_db
+from app.models.recipe import Recipe, recipes_search_vector_function, recipes_search_vector_trigger
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "ix_recipes_search_vector"
+
+# Give up on a DDL step instead of queueing every recipe query behind it
+DDL_LOCK_TIMEOUT = "5s"
+
+
+async def create_trigger() -> None:
+    """
+    Create the function, column and trigger in one short transaction
+    """
+    async with engine.begin() as conn:
+        await conn.execute(text(f"SET LOCAL lock_timeout = '{DDL_LOCK_TIMEOUT}'"))
+        await conn.execute(recipes_search_vector_function)
+        await conn.execute(text("ALTER TABLE recipes ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+        await conn.execute(text("DROP TRIGGER IF EXISTS recipes_search_vector ON recipes"))
+        await conn.execute(recipes_search_vector_trigger)
+
+
+async def backfill(batch_size: int) -> int:
+    """
+    Fill search_vector for rows written before the trigger, committing once per batch
+    """
+    last_id = 0
+    total = 0
+
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Recipe.id)
+                .where(Recipe.id > last_id)
+                .order_by(Recipe.id)
+                .limit(batch_size)
+            )
+            recipe_ids = result.scalars().all()
+            if not recipe_ids:
+                return total
+
+            # Rewriting title fires the trigger, so the document is built by
+            # the same function that maintains it; updated_at is left alone
+            result = await db.execute(
+                update(Recipe)
+                .where(Recipe.id.in_(recipe_ids))
+                .where(Recipe.search_vector.is_(None))
+                .values(title=Recipe.title, updated_at=Recipe.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        last_id = recipe_ids[-1]
+        total += result.rowcount
+        logger.info(f"Backfilled {total} recipes (up to id {last_id})")
+
+
+async def create_index() -> None:
+    """
+    Build the GIN index without blocking writes
+
+    A CONCURRENTLY build that failed leaves an invalid index behind, which
+    IF NOT EXISTS would skip; it is dropped and rebuilt instead.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        result = await conn.execute(
+            text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+            {"name": INDEX_NAME}
+        )
+        valid = result.scalar()
+        if valid:
+            return
+        if valid is False:
+            logger.info(f"Dropping invalid index {INDEX_NAME}")
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}"))
+
+        await conn.execute(text(f"CREATE INDEX CONCURRENTLY {INDEX_NAME} ON recipes USING gin (search_vector)"))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        await create_trigger()
+        logger.info("Created search_vector column and trigger")
+        total = await backfill(args.batch_size)
+        logger.info(f"Backfilled {total} recipes, building {INDEX_NAME}")
+        await create_index()
+        logger.info("Done")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
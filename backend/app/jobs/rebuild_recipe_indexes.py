@@ -0,0 +1,111 @@
+"""
+Rebuild the ingredient posting lists and tag associations from the recipe JSON columns
+
+Tag usage counts are then recounted from the associations of published
+recipes, which also repairs any drift in the incrementally kept counts.
+
+Usage:
+    python -m app.jobs.rebuild_recipe_indexes [--batch-size 500]
+"""
+import argparse
+import asyncio
+import logging
+from sqlalchemy import select, update, func, and_
+from app.database.session import AsyncSessionLocal, close_db
+from app.models.recipe import Recipe
+from app.models.tag import Tag, RecipeTag
+from app.services.ingredient_service import IngredientService
+from app.services.tag_service import TagService
+
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild(batch_size: int) -> int:
+    """
+    Re-sync every recipe's ingredients and tags, committing once per batch
+    """
+    last_id = 0
+    total = 0
+
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Recipe.id, Recipe.ingredients, Recipe.tags, Recipe.is_published)
+                .where(Recipe.id > last_id)
+                .order_by(Recipe.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                return total
+
+            for recipe_id, ingredients, tags, is_published in rows:
+                await IngredientService.sync_recipe(db, recipe_id, ingredients or [])
+                await TagService.sync_recipe(db, recipe_id, tags or [], is_published)
+            await db.commit()
+
+        last_id = rows[-1].id
+        total += len(rows)
+        logger.info(f"Indexed {total} recipes")
+
+
+async def recount_tags(batch_size: int) -> int:
+    """
+    Recount each batch of tags from published recipes and rewrite only the rows that drifted
+    """
+    last_id = 0
+    repaired = 0
+
+    while True:
+        async with AsyncSessionLocal() as db:
+            # Lock the batch first: tag changes that commit before the lock
+            # are counted, and ones still in flight apply their delta after us
+            result = await db.execute(
+                select(Tag.id)
+                .where(Tag.id > last_id)
+                .order_by(Tag.id)
+                .limit(batch_size)
+                .with_for_update()
+            )
+            tag_ids = result.scalars().all()
+            if not tag_ids:
+                return repaired
+
+            actual = (
+                select(func.count())
+                .select_from(RecipeTag)
+                .join(Recipe, Recipe.id == RecipeTag.recipe_id)
+                .where(and_(RecipeTag.tag_id == Tag.id, Recipe.is_published == True))
+                .scalar_subquery()
+            )
+            result = await db.execute(
+                update(Tag)
+                .where(Tag.id.between(tag_ids[0], tag_ids[-1]))
+                .where(Tag.usage_count != actual)
+                .values(usage_count=actual)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        last_id = tag_ids[-1]
+        repaired += result.rowcount
+        logger.info(f"Recounted tags up to id {last_id}, {repaired} repaired")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        total = await rebuild(args.batch_size)
+        repaired = await recount_tags(args.batch_size)
+        logger.info(f"Done: {total} recipes indexed, {repaired} tag counts repaired")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
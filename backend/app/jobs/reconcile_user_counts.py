@@ -0,0 +1,94 @@
+"""
+Repair drift in the denormalized follower/following/recipe counts on users
+
+Usage:
+    python -m app.jobs.reconcile_user_counts [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import logging
+from sqlalchemy import select, update, func, or_
+from app.database.session import AsyncSessionLocal, close_db
+from app.models.user import User
+from app.models.follower import Follower
+from app.models.recipe import Recipe
+
+
+logger = logging.getLogger(__name__)
+
+
+def _count(column, user_id):
+    return select(func.count()).where(column == user_id).scalar_subquery()
+
+
+async def reconcile(batch_size: int) -> int:
+    """
+    Recount each batch of users and rewrite only the rows that drifted
+    """
+    last_id = 0
+    repaired = 0
+
+    while True:
+        async with AsyncSessionLocal() as db:
+            # Lock the batch first: follows that commit before the lock are
+            # counted, and ones still in flight apply their +1 after we commit
+            result = await db.execute(
+                select(User.id)
+                .where(User.id > last_id)
+                .order_by(User.id)
+                .limit(batch_size)
+                .with_for_update()
+            )
+            user_ids = result.scalars().all()
+            if not user_ids:
+                return repaired
+
+            actual = (
+                select(
+                    User.id.label("user_id"),
+                    _count(Follower.following_id, User.id).label("followers_count"),
+                    _count(Follower.follower_id, User.id).label("following_count"),
+                    _count(Recipe.author_id, User.id).label("recipes_count")
+                )
+                .where(User.id.between(user_ids[0], user_ids[-1]))
+                .subquery()
+            )
+            result = await db.execute(
+                update(User)
+                .where(User.id == actual.c.user_id)
+                .where(
+                    or_(
+                        User.followers_count != actual.c.followers_count,
+                        User.following_count != actual.c.following_count,
+                        User.recipes_count != actual.c.recipes_count
+                    )
+                )
+                .values(
+                    followers_count=actual.c.followers_count,
+                    following_count=actual.c.following_count,
+                    recipes_count=actual.c.recipes_count
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        last_id = user_ids[-1]
+        repaired += result.rowcount
+        logger.info(f"Checked users up to id {last_id}, {repaired} repaired")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        repaired = await reconcile(args.batch_size)
+        logger.info(f"Done: {repaired} users repaired")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
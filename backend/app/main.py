@@ -5,8 +5,23 @@ from contextlib import asynccontextmanager
 import logging
 from app.core.config import settings
 from app.core.middleware import RateLimitMiddleware, LoggingMiddleware
-from app.database.session import init_db, close_db
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.database.session import init_db, close_db, AsyncSessionLocal
 from app.routes import api_router
+from app.core.redis import close_redis
+from app.services.view_counter import view_counter
+from app.services.seen_set_service import seen_set
+from app.services.engagement_ingestor import engagement_ingestor
+from app.services.engagement_service import counter_folder
+from app.services.trending_service import trending_aggregator
+from app.services.follow_graph import follow_graph
+from app.services.content_index import content_index
+from app.services.password_hasher import password_hasher
+from app.core.dependencies import token_cache, principal_cache
+from app.services.token_revocation import revocation_list
+from app.services.activity_tracker import activity_tracker
+from app.services.recipe_service import recipe_cache
+from app.services.search_service import SearchService
 
 # Configure logging
 logging.basicConfig(
@@ -27,12 +42,49 @@ async def lifespan(app: FastAPI):
     # Initialize database (optional - use Alembic migrations instead)
     # await init_db()
     
+    # Load in-process search index (no-op for the Postgres backend)
+    async with AsyncSessionLocal() as db:
+        await SearchService.rebuild_index(db)
+    
+    # Load content vectors for similar-recipe and cold-start ranking
+    async with AsyncSessionLocal() as db:
+        await content_index.load(db)
+    
+    # Load revoked token ids into the local filter
+    await revocation_list.sync()
+    
+    # Boot the bcrypt worker processes
+    password_hasher.start()
+    
+    # Start write-behind flushers
+    view_counter.start()
+    seen_set.start()
+    engagement_ingestor.start()
+    counter_folder.start()
+    trending_aggregator.start()
+    content_index.start()
+    revocation_list.start()
+    activity_tracker.start()
+    
     logger.info("Feastro API started successfully")
     
     yield
     
     # Shutdown
     logger.info("Shutting down Feastro API...")
+    
+    # Flush buffered writes before the database goes away
+    await view_counter.stop()
+    await seen_set.stop()
+    await engagement_ingestor.stop()
+    await counter_folder.stop()
+    await trending_aggregator.stop()
+    await content_index.stop()
+    await revocation_list.stop()
+    await activity_tracker.stop()
+    await password_hasher.stop()
+    
+    await close_redis()
     await close_db()
     logger.info("Feastro API shut down successfully")
 
@@ -54,7 +106,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Process-Time"]
+    expose_headers=["X-Process-Time", NEXT_CURSOR_HEADER]
 )
 
 # Custom middleware
@@ -92,6 +144,29 @@ async def health_check():
     }
 
 
+# Internal metrics endpoint
+@app.get("/health/metrics", tags=["Health"])
+async def internal_metrics():
+    """
+    Counters for in-process caches and write-behind buffers
+    """
+    return {
+        "view_counter": view_counter.stats(),
+        "recipe_cache": recipe_cache.stats(),
+        "seen_set": seen_set.stats(),
+        "engagement_ingestor": engagement_ingestor.stats(),
+        "counter_folder": counter_folder.stats(),
+        "trending": trending_aggregator.stats(),
+        "follow_graph": follow_graph.stats(),
+        "content_index": content_index.stats(),
+        "password_hasher": password_hasher.stats(),
+        "token_cache": token_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+        "revocation_list": revocation_list.stats(),
+        "activity_tracker": activity_tracker.stats()
+    }
+
+
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def root():
@@ -0,0 +1,74 @@
+from sqlalchemy import Column, Integer, SmallInteger, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class Like(Base):
+    __tablename__ = "likes"
+    __table_args__ = (
+        UniqueConstraint("user_id", "recipe_id", name="uq_likes_user_recipe"),
+    )
+    
+    # Primary Key
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Foreign Keys
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    # Relationships
+    user = relationship("User", back_populates="likes")
+    recipe = relationship("Recipe", back_populates="likes")
+    
+    def __repr__(self):
+        return f"<Like(user_id={self.user_id}, recipe_id={self.recipe_id})>"
+
+
+class Save(Base):
+    __tablename__ = "saves"
+    __table_args__ = (
+        UniqueConstraint("user_id", "recipe_id", name="uq_saves_user_recipe"),
+    )
+    
+    # Primary Key
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Foreign Keys
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    # Relationships
+    user = relationship("User", back_populates="saves")
+    recipe = relationship("Recipe", back_populates="saves")
+    
+    def __repr__(self):
+        return f"<Save(user_id={self.user_id}, recipe_id={self.recipe_id})>"
+
+
+class RecipeCounterShard(Base):
+    """
+    Pending like/save deltas for hot recipes, spread over several rows
+
+    Concurrent likers of a viral recipe update different shards instead of
+    queueing on the recipe row; the shards are folded into the recipe's
+    counters periodically.
+    """
+    __tablename__ = "recipe_counter_shards"
+    
+    # Primary Key
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True)
+    
+    # Deltas not yet applied to recipes.likes_count / saves_count
+    likes_delta = Column(Integer, default=0, server_default="0", nullable=False)
+    saves_delta = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    def __repr__(self):
+        return f"<RecipeCounterShard(recipe_id={self.recipe_id}, shard={self.shard})>"
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class Follower(Base):
+    """
+    Follow relationship: follower_id follows following_id
+    """
+    __tablename__ = "followers"
+    __table_args__ = (
+        UniqueConstraint("follower_id", "following_id", name="uq_followers_follower_following"),
+        # Follower lists and fan-out: WHERE following_id
+        Index("ix_followers_following_follower", "following_id", "follower_id"),
+    )
+    
+    # Primary Key
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Foreign Keys
+    follower_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    following_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    # Relationships
+    follower = relationship("User", foreign_keys=[follower_id], back_populates="following")
+    following = relationship("User", foreign_keys=[following_id], back_populates="followers")
+    
+    def __repr__(self):
+        return f"<Follower(follower_id={self.follower_id}, following_id={self.following_id})>"
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.database.base import Base
+
+
+class Ingredient(Base):
+    __tablename__ = "ingredients"
+    
+    # Primary Key
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Normalized ingredient name (see IngredientService.normalize)
+    name = Column(String(100), unique=True, index=True, nullable=False)
+    
+    def __repr__(self):
+        return f"<Ingredient(id={self.id}, name={self.name})>"
+
+
+class RecipeIngredient(Base):
+    """
+    Posting list entry: recipe uses ingredient
+    """
+    __tablename__ = "recipe_ingredients"
+    __table_args__ = (
+        # Posting lists are read by ingredient
+        Index("ix_recipe_ingredients_ingredient_recipe", "ingredient_id", "recipe_id"),
+    )
+    
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    ingredient_id = Column(Integer, ForeignKey("ingredients.id", ondelete="CASCADE"), primary_key=True)
+    
+    def __repr__(self):
+        return f"<RecipeIngredient(recipe_id={self.recipe_id}, ingredient_id={self.ingredient_id})>"
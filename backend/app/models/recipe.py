@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, DateTime, JSON, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, DateTime, JSON, Index, DDL, event, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.database.base import Base
 import enum
@@ -22,6 +23,14 @@ class DietaryPreference(str, enum.Enum):
 
 class Recipe(Base):
     __tablename__ = "recipes"
+    __table_args__ = (
+        # Keyset pagination for published feeds: WHERE is_published ORDER BY created_at DESC, id DESC
+        Index("ix_recipes_published_created_at_id", "is_published", "created_at", "id"),
+        # Per-author timelines: WHERE author_id ORDER BY created_at DESC, id DESC
+        Index("ix_recipes_author_created_at_id", "author_id", "created_at", "id"),
+        # Full-text search over the trigger-maintained search_vector
+        Index("ix_recipes_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
@@ -55,9 +64,15 @@ class Recipe(Base):
     saves_count = Column(Integer, default=0, nullable=False)
     views_count = Column(Integer, default=0, nullable=False)
     
+    # Number of distinct normalized ingredients (maintained with recipe_ingredients)
+    ingredient_count = Column(Integer, default=0, nullable=False)
+    
     # Tags for search
     tags = Column(JSON, nullable=True)  # List of tags
     
+    # Full-text search document, maintained by the recipes_search_vector trigger
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+    
     # Status
     is_published = Column(Boolean, default=True, nullable=False)
     
@@ -73,4 +88,45 @@ class Recipe(Base):
     engagement_logs = relationship("EngagementLog", back_populates="recipe", cascade="all, delete-orphan")
     
     def __repr__(self):
-        return f"<Recipe(id={self.id}, title={self.title}, author_id={self.author_id})>"
\ No newline at end of file
+        return f"<Recipe(id={self.id}, title={self.title}, author_id={self.author_id})>"
+
+
+# Keep search_vector in sync with title, tags, ingredient names and description.
+# Weights A-D let ranking prefer title matches over description matches.
+# These listeners only cover create_all; existing databases are migrated
+# with app.jobs.migrate_search_vector.
+recipes_search_vector_function = DDL("""
+CREATE OR REPLACE FUNCTION recipes_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(
+            CASE WHEN json_typeof(NEW.tags) = 'array' THEN
+                (SELECT string_agg(tag, ' ') FROM json_array_elements_text(NEW.tags) AS tag)
+            END, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(
+            CASE WHEN json_typeof(NEW.ingredients) = 'array' THEN
+                (SELECT string_agg(item->>'name', ' ') FROM json_array_elements(NEW.ingredients) AS item)
+            END, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+""")
+
+recipes_search_vector_trigger = DDL("""
+CREATE TRIGGER recipes_search_vector
+BEFORE INSERT OR UPDATE OF title, description, tags, ingredients ON recipes
+FOR EACH ROW EXECUTE FUNCTION recipes_search_vector_update()
+""")
+
+event.listen(
+    Recipe.__table__,
+    "after_create",
+    recipes_search_vector_function.execute_if(dialect="postgresql")
+)
+event.listen(
+    Recipe.__table__,
+    "after_create",
+    recipes_search_vector_trigger.execute_if(dialect="postgresql")
+)
@@ -0,0 +1,136 @@
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, ForeignKey, DateTime, Index, UniqueConstraint, LargeBinary
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class EngagementLog(Base):
+    """
+    Raw engagement events (view, like, save, share, watch) used for recommendations
+    """
+    __tablename__ = "engagement_logs"
+    __table_args__ = (
+        Index("ix_engagement_logs_user_event_created", "user_id", "event_type", "created_at"),
+    )
+    
+    # Primary Key
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Foreign Keys
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # Event
+    event_type = Column(String(20), nullable=False)
+    watch_time = Column(Float, nullable=True)  # in seconds, for watch events
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    # Relationships
+    user = relationship("User", back_populates="engagement_logs")
+    recipe = relationship("Recipe", back_populates="engagement_logs")
+    
+    def __repr__(self):
+        return f"<EngagementLog(user_id={self.user_id}, recipe_id={self.recipe_id}, event_type={self.event_type})>"
+
+
+class RecommendationWeight(Base):
+    """
+    Per-user affinity for a recipe feature, e.g. "difficulty:easy" or "dietary_preference:vegan"
+    """
+    __tablename__ = "recommendation_weights"
+    __table_args__ = (
+        UniqueConstraint("user_id", "feature", name="uq_recommendation_weights_user_feature"),
+    )
+    
+    # Primary Key
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Foreign Keys
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # Feature and learned weight
+    feature = Column(String(100), nullable=False)
+    weight = Column(Float, default=0.0, nullable=False)
+    
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Relationships
+    user = relationship("User", back_populates="recommendation_weights")
+    
+    def __repr__(self):
+        return f"<RecommendationWeight(user_id={self.user_id}, feature={self.feature}, weight={self.weight})>"
+
+
+class UserSeenFilter(Base):
+    """
+    Serialized rotating Bloom filter of the recipe ids a user has viewed
+    """
+    __tablename__ = "user_seen_filters"
+    
+    # Primary Key
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Filter bits (see app.core.bloom.RotatingBloomFilter.to_bytes)
+    data = Column(LargeBinary, nullable=False)
+    
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<UserSeenFilter(user_id={self.user_id}, size={len(self.data or b'')})>"
+
+
+class RecipeNeighbor(Base):
+    """
+    Precomputed item-item neighbor: recipe_id's rank-th most similar recipe
+    """
+    __tablename__ = "recipe_neighbors"
+    
+    # Primary Key (a recipe's list is one contiguous index range)
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(SmallInteger, primary_key=True)
+    
+    # Neighbor and cosine similarity of their like/save vectors
+    neighbor_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False, index=True)
+    score = Column(Float, nullable=False)
+    
+    def __repr__(self):
+        return f"<RecipeNeighbor(recipe_id={self.recipe_id}, rank={self.rank}, neighbor_id={self.neighbor_id})>"
+
+
+class JobCheckpoint(Base):
+    """
+    Last successful run of an incremental job
+    """
+    __tablename__ = "job_checkpoints"
+    
+    # Primary Key
+    name = Column(String(100), primary_key=True)
+    
+    # Start time of the last successful run
+    last_run_at = Column(DateTime(timezone=True), nullable=False)
+    
+    def __repr__(self):
+        return f"<JobCheckpoint(name={self.name}, last_run_at={self.last_run_at})>"
+
+
+class RecipeContentVector(Base):
+    """
+    Hashed bag-of-words vector of a published recipe's text, for content similarity
+    """
+    __tablename__ = "recipe_content_vectors"
+    
+    # Primary Key
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    
+    # L2-normalized float32 vector (see app.services.content_index.vectorize)
+    vector = Column(LargeBinary, nullable=False)
+    
+    # Timestamps (other workers pull rows changed since their last sync)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<RecipeContentVector(recipe_id={self.recipe_id})>"
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.database.base import Base
+
+
+class Tag(Base):
+    __tablename__ = "tags"
+    __table_args__ = (
+        # Popular tags are read by usage
+        Index("ix_tags_usage_count", "usage_count"),
+    )
+    
+    # Primary Key
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Normalized tag name (see TagService.normalize)
+    name = Column(String(50), unique=True, index=True, nullable=False)
+    
+    # Number of published recipes using this tag (maintained incrementally on write)
+    usage_count = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<Tag(id={self.id}, name={self.name}, usage_count={self.usage_count})>"
+
+
+class RecipeTag(Base):
+    """
+    Association entry: recipe is tagged with tag
+    """
+    __tablename__ = "recipe_tags"
+    __table_args__ = (
+        # Tag filters and facets read by tag
+        Index("ix_recipe_tags_tag_recipe", "tag_id", "recipe_id"),
+    )
+    
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    
+    def __repr__(self):
+        return f"<RecipeTag(recipe_id={self.recipe_id}, tag_id={self.tag_id})>"
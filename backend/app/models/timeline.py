@@ -0,0 +1,47 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
+from app.database.base import Base
+
+
+class TimelineEntry(Base):
+    """
+    One slot of a user's following-feed inbox
+
+    Each inbox is a ring buffer of TIMELINE_INBOX_SIZE slots: a new entry
+    overwrites the slot at the user's head position, so an inbox never
+    grows past its capacity and needs no trimming.
+    """
+    __tablename__ = "timeline_entries"
+    __table_args__ = (
+        # Inbox pages: WHERE user_id ORDER BY created_at DESC, recipe_id DESC
+        Index("ix_timeline_entries_user_created_recipe", "user_id", "created_at", "recipe_id"),
+    )
+    
+    # Primary Key
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    slot = Column(Integer, primary_key=True)
+    
+    # Foreign Keys
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False, index=True)
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    
+    # Recipe creation time, copied so inbox pages sort without touching recipes
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    
+    def __repr__(self):
+        return f"<TimelineEntry(user_id={self.user_id}, slot={self.slot}, recipe_id={self.recipe_id})>"
+
+
+class TimelineHead(Base):
+    """
+    Write position of a user's inbox ring buffer
+    """
+    __tablename__ = "timeline_heads"
+    
+    # Primary Key
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Total entries ever written; the next slot is position % TIMELINE_INBOX_SIZE
+    position = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<TimelineHead(user_id={self.user_id}, position={self.position})>"
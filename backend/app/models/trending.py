@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Index
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class RecipeTrending(Base):
+    """
+    Time-decayed engagement score per recipe, kept in log space
+
+    `score` is log(sum(weight * exp(decay_rate * (event_time - epoch)))).
+    Decay applies equally to every recipe, so ordering by the raw value is
+    ordering by the decayed score and never needs recomputation.
+    """
+    __tablename__ = "recipe_trending"
+    __table_args__ = (
+        Index("ix_recipe_trending_score", "score", "recipe_id"),
+    )
+    
+    # Primary Key
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Log-space decayed score (see TrendingService)
+    score = Column(Float, nullable=False)
+    
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<RecipeTrending(recipe_id={self.recipe_id}, score={self.score})>"
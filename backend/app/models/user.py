@@ -33,10 +33,18 @@ class User(Base):
     # OAuth
     google_id = Column(String(255), unique=True, nullable=True, index=True)
     
+    # Denormalized counts, maintained in the same transaction as the rows
+    # they count (see UserService.follow_user and RecipeService)
+    followers_count = Column(Integer, default=0, server_default="0", nullable=False)
+    following_count = Column(Integer, default=0, server_default="0", nullable=False)
+    recipes_count = Column(Integer, default=0, server_default="0", nullable=False)
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+    # Written in batches by app.services.activity_tracker
     last_login = Column(DateTime(timezone=True), nullable=True)
+    last_seen = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     recipes = relationship("Recipe", back_populates="author", cascade="all, delete-orphan")
@@ -1,4 +1,6 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.session import get_db
 from app.schemas.auth import (
@@ -11,6 +13,8 @@ from app.schemas.auth import (
 from app.schemas.user import UserResponse
 from app.services.auth_service import AuthService
 from app.core.security import decode_token, verify_token_type
+from app.core.dependencies import bearer_scheme, decode_access_token
+from app.services.token_revocation import revocation_list
 
 router = APIRouter()
 
@@ -70,6 +74,9 @@ async def refresh_token(
 ):
     """
     Refresh access token using refresh token
+    
+    Refresh tokens are single-use: each refresh returns a new pair, and
+    presenting an already-used one revokes the whole login session.
     """
     # Decode refresh token
     payload = decode_token(refresh_data.refresh_token)
@@ -81,6 +88,19 @@ async def refresh_token(
             detail="Invalid token type"
         )
     
+    if await revocation_list.is_revoked(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
+    
+    # Rotate: consume this refresh token
+    if not await revocation_list.use_refresh_token(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token reuse detected"
+        )
+    
     # Get user from database
     from app.services.user_service import UserService
     user_id = int(payload.get("sub"))
@@ -92,21 +112,31 @@ async def refresh_token(
             detail="User not found"
         )
     
-    # Create new tokens
-    tokens = AuthService.create_tokens(user)
+    # Create new tokens in the same login session
+    tokens = AuthService.create_tokens(user, payload.get("fam"))
     
     return tokens
 
 
 @router.post("/logout")
-async def logout():
+async def logout(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+):
     """
-    Logout user (client-side token removal)
+    Logout user
+    
+    Revokes the access token and every token of its login session,
+    including the refresh token.
     """
-    # In a stateless JWT system, logout is handled client-side
-    # For a more secure implementation, you could:
-    # 1. Add tokens to a blacklist in Redis
-    # 2. Use shorter token expiration times
-    # 3. Implement token revocation
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    payload = decode_access_token(credentials.credentials)
+    await revocation_list.revoke_token(payload)
+    await revocation_list.revoke_family(payload)
     
-    return {"message": "Successfully logged out"}
\ No newline at end of file
+    return {"message": "Successfully logged out"}
@@ -0,0 +1,127 @@
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.database.session import get_db
+from app.core.dependencies import get_current_active_user, get_optional_current_user
+from app.models.user import User
+from app.schemas.engagement import (
+    EngagementCreate,
+    EngagementLogCreate,
+    EngagementLogAccepted,
+    EngagementType,
+    EngagementStats,
+    LikeResponse,
+    SaveResponse
+)
+from app.schemas.recipe import RecipeList
+from app.services.engagement_service import EngagementService
+from app.services.engagement_ingestor import engagement_ingestor
+from app.services.seen_set_service import seen_set
+
+router = APIRouter()
+
+
+@router.post("/like", response_model=LikeResponse)
+async def like_recipe(
+    engagement: EngagementCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Like a recipe
+    """
+    response = await EngagementService.like_recipe(db, current_user.id, engagement.recipe_id)
+    engagement_ingestor.record(current_user.id, engagement.recipe_id, EngagementType.LIKE.value)
+    return response
+
+
+@router.delete("/like/{recipe_id}", response_model=LikeResponse)
+async def unlike_recipe(
+    recipe_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Remove a like from a recipe
+    """
+    return await EngagementService.unlike_recipe(db, current_user.id, recipe_id)
+
+
+@router.post("/save", response_model=SaveResponse)
+async def save_recipe(
+    engagement: EngagementCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Save a recipe
+    """
+    response = await EngagementService.save_recipe(db, current_user.id, engagement.recipe_id)
+    engagement_ingestor.record(current_user.id, engagement.recipe_id, EngagementType.SAVE.value)
+    return response
+
+
+@router.delete("/save/{recipe_id}", response_model=SaveResponse)
+async def unsave_recipe(
+    recipe_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Remove a recipe from saved recipes
+    """
+    return await EngagementService.unsave_recipe(db, current_user.id, recipe_id)
+
+
+@router.get("/saved", response_model=List[RecipeList])
+async def get_saved_recipes(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get current user's saved recipes
+    """
+    return await EngagementService.get_saved_recipes(db, current_user.id, skip, limit)
+
+
+@router.get("/stats/{recipe_id}", response_model=EngagementStats)
+async def get_engagement_stats(
+    recipe_id: int,
+    current_user: Optional[User] = Depends(get_optional_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get like/save/view counts for a recipe
+    """
+    return await EngagementService.get_stats(
+        db,
+        recipe_id,
+        current_user.id if current_user else None
+    )
+
+
+@router.post("/log", response_model=EngagementLogAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def log_engagement(
+    engagement: EngagementLogCreate,
+    current_user: Optional[User] = Depends(get_optional_current_user)
+):
+    """
+    Queue an engagement event for the recommendation log
+    """
+    # Events are only attributed to signed-in users
+    if not current_user:
+        return EngagementLogAccepted(accepted=False)
+    
+    if engagement.engagement_type == EngagementType.VIEW:
+        seen_set.mark_seen(current_user.id, engagement.recipe_id)
+    
+    accepted = await engagement_ingestor.submit(
+        current_user.id,
+        engagement.recipe_id,
+        engagement.engagement_type.value,
+        engagement.watch_duration
+    )
+    
+    return EngagementLogAccepted(accepted=accepted)
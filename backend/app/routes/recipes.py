@@ -1,10 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from app.database.session import get_db
 from app.core.dependencies import get_current_user, get_current_active_user, get_optional_current_user
 from app.models.user import User
-from app.models.recipe import Recipe
 from app.schemas.recipe import (
     RecipeCreate,
     RecipeUpdate,
@@ -13,10 +12,18 @@ from app.schemas.recipe import (
     RecipeList
 )
 from app.services.recipe_service import RecipeService
-from sqlalchemy import select
+from app.services.seen_set_service import seen_set
+from app.services.engagement_ingestor import engagement_ingestor
+from app.services.trending_service import TrendingService
+from app.services.timeline_service import TimelineService
+from app.services.recommendation_service import RecommendationService
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
 
 router = APIRouter()
 
+# Maximum number of recipes per batch request
+MAX_BATCH_SIZE = 100
+
 
 @router.post("/", response_model=RecipeResponse, status_code=status.HTTP_201_CREATED)
 async def create_recipe(
@@ -33,36 +40,57 @@ async def create_recipe(
 
 @router.get("/", response_model=List[RecipeList])
 async def get_recipes(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     author_id: Optional[int] = None,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get list of recipes with pagination
+    
+    Pass the X-Next-Cursor header of a page as `cursor` to fetch the next one.
     """
-    recipes = await RecipeService.get_recipes(db, skip, limit, author_id)
-    
-    # Convert to RecipeList format
-    recipe_list = []
-    for recipe in recipes:
-        # Get author username
-        author_result = await db.execute(select(User).where(User.id == recipe.author_id))
-        author = author_result.scalar_one_or_none()
-        
-        recipe_list.append(RecipeList(
-            id=recipe.id,
-            title=recipe.title,
-            thumbnail_url=None,  # TODO: Get from video
-            cooking_time=recipe.cooking_time,
-            difficulty=recipe.difficulty,
-            likes_count=recipe.likes_count,
-            saves_count=recipe.saves_count,
-            author_username=author.username if author else "Unknown",
-            created_at=recipe.created_at
-        ))
-    
-    return recipe_list
+    recipes = await RecipeService.get_recipe_list(db, skip, limit, author_id, cursor)
+    
+    cursor_value = next_cursor(recipes, limit)
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
+    
+    return recipes
+
+
+@router.get("/batch", response_model=List[RecipeDetail])
+async def get_recipes_batch(
+    ids: str = Query(..., description="Comma-separated recipe IDs"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_current_user)
+):
+    """
+    Get many recipes by ID in one request
+    
+    Unknown IDs are omitted. Fetching details here does not count as a view.
+    """
+    try:
+        recipe_ids = [int(recipe_id) for recipe_id in ids.split(",") if recipe_id.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+    
+    if not recipe_ids or len(recipe_ids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Between 1 and {MAX_BATCH_SIZE} ids are required"
+        )
+    
+    return await RecipeService.get_recipes_by_ids(
+        db,
+        recipe_ids,
+        current_user.id if current_user else None
+    )
 
 
 @router.get("/{recipe_id}", response_model=RecipeDetail)
@@ -87,11 +115,28 @@ async def get_recipe(
         )
     
     # Increment view count
-    await RecipeService.increment_view_count(db, recipe_id)
+    RecipeService.increment_view_count(recipe_id)
+    
+    # Hide it from this user's personalized feed and log the view
+    if current_user:
+        seen_set.mark_seen(current_user.id, recipe_id)
+        engagement_ingestor.record(current_user.id, recipe_id, "view")
     
     return recipe
 
 
+@router.get("/{recipe_id}/similar", response_model=List[RecipeList])
+async def get_similar_recipes(
+    recipe_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get recipes liked and saved by the same people, or with similar ingredients and tags
+    """
+    return await RecommendationService.get_similar_recipes(db, recipe_id, limit)
+
+
 @router.put("/{recipe_id}", response_model=RecipeResponse)
 async def update_recipe(
     recipe_id: int,
@@ -102,9 +147,8 @@ async def update_recipe(
     """
     Update recipe
     """
-    # Get recipe
-    result = await db.execute(select(Recipe).where(Recipe.id == recipe_id))
-    recipe = result.scalar_one_or_none()
+    # Get recipe (ownership columns only)
+    recipe = await RecipeService.get_recipe_for_write(db, recipe_id)
     
     if not recipe:
         raise HTTPException(
@@ -133,9 +177,8 @@ async def delete_recipe(
     """
     Delete recipe
     """
-    # Get recipe
-    result = await db.execute(select(Recipe).where(Recipe.id == recipe_id))
-    recipe = result.scalar_one_or_none()
+    # Get recipe (ownership columns only)
+    recipe = await RecipeService.get_recipe_for_write(db, recipe_id)
     
     if not recipe:
         raise HTTPException(
@@ -158,32 +201,55 @@ async def delete_recipe(
 
 @router.get("/feed/discover", response_model=List[RecipeList])
 async def get_discover_feed(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get discover feed (all published recipes)
+    
+    Pass the X-Next-Cursor header of a page as `cursor` to fetch the next one.
+    """
+    recipes = await RecipeService.get_recipe_list(db, skip, limit, cursor=cursor)
+    
+    cursor_value = next_cursor(recipes, limit)
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
+    
+    return recipes
+
+
+@router.get("/feed/trending", response_model=List[RecipeList])
+async def get_trending_feed(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
     """
-    recipes = await RecipeService.get_recipes(db, skip, limit)
-    
-    # Convert to RecipeList format
-    recipe_list = []
-    for recipe in recipes:
-        # Get author username
-        author_result = await db.execute(select(User).where(User.id == recipe.author_id))
-        author = author_result.scalar_one_or_none()
-        
-        recipe_list.append(RecipeList(
-            id=recipe.id,
-            title=recipe.title,
-            thumbnail_url=None,
-            cooking_time=recipe.cooking_time,
-            difficulty=recipe.difficulty,
-            likes_count=recipe.likes_count,
-            saves_count=recipe.saves_count,
-            author_username=author.username if author else "Unknown",
-            created_at=recipe.created_at
-        ))
-    
-    return recipe_list
\ No newline at end of file
+    Get trending recipes ranked by time-decayed engagement
+    """
+    return await TrendingService.get_trending(db, skip, limit)
+
+
+@router.get("/feed/following", response_model=List[RecipeList])
+async def get_following_feed(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get newest recipes from followed users
+    
+    Pass the X-Next-Cursor header of a page as `cursor` to fetch the next one.
+    """
+    recipes = await TimelineService.get_following_feed(db, current_user.id, limit, cursor)
+    
+    cursor_value = next_cursor(recipes, limit)
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
+    
+    return recipes
\ No newline at end of file
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from app.database.session import get_db
+from app.core.dependencies import get_current_active_user
+from app.models.user import User
+from app.schemas.recipe import RecipeList
+from app.services.recommendation_service import RecommendationService
+
+router = APIRouter()
+
+
+@router.get("/feed", response_model=List[RecipeList])
+async def get_personalized_feed(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    exclude_seen: bool = True,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get personalized feed ranked for the current user
+    """
+    return await RecommendationService.get_personalized_feed(
+        db,
+        current_user.id,
+        skip,
+        limit,
+        exclude_seen
+    )
@@ -0,0 +1,98 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.database.session import get_db
+from app.schemas.recipe import (
+    RecipeList,
+    RecipeIngredientMatch,
+    RecipeSearchFilters,
+    SearchFacets,
+    TagResponse,
+    DifficultyLevel,
+    DietaryPreference
+)
+from app.services.search_service import SearchService
+from app.services.ingredient_service import IngredientService
+from app.services.tag_service import TagService
+
+router = APIRouter()
+
+
+def search_filters(
+    query: Optional[str] = None,
+    difficulty: Optional[DifficultyLevel] = None,
+    dietary_preference: Optional[DietaryPreference] = None,
+    max_cooking_time: Optional[int] = Query(None, gt=0),
+    tags: Optional[List[str]] = Query(None),
+    ingredient: Optional[str] = None
+) -> RecipeSearchFilters:
+    """
+    Search filters from query parameters
+    
+    Tags may be repeated (?tags=a&tags=b) or comma-separated.
+    """
+    if tags:
+        tags = [tag.strip() for value in tags for tag in value.split(",") if tag.strip()]
+    
+    return RecipeSearchFilters(
+        query=query,
+        difficulty=difficulty,
+        dietary_preference=dietary_preference,
+        max_cooking_time=max_cooking_time,
+        tags=tags or None,
+        ingredient=ingredient
+    )
+
+
+@router.get("/recipes", response_model=List[RecipeList])
+async def search_recipes(
+    filters: RecipeSearchFilters = Depends(search_filters),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Search recipes by text with optional filters
+    """
+    return await SearchService.search_recipes(db, filters, skip, limit)
+
+
+@router.get("/facets", response_model=SearchFacets)
+async def get_search_facets(
+    filters: RecipeSearchFilters = Depends(search_filters),
+    tag_limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get tag, difficulty and dietary counts for the recipes matching the filters
+    """
+    return await SearchService.get_facets(db, filters, tag_limit)
+
+
+@router.get("/tags/popular", response_model=List[TagResponse])
+async def get_popular_tags(
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the most used tags
+    """
+    return await TagService.get_popular_tags(db, limit)
+
+
+@router.get("/by-ingredients", response_model=List[RecipeIngredientMatch])
+async def search_by_ingredients(
+    ingredients: List[str] = Query(..., description="Ingredients on hand, repeated or comma-separated"),
+    min_coverage: float = Query(0.0, ge=0.0, le=1.0),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Find recipes you can cook with the ingredients you have
+    
+    Recipes are ranked by the share of their ingredients covered.
+    """
+    names = [name for value in ingredients for name in value.split(",")]
+    
+    return await IngredientService.find_by_ingredients(db, names, min_coverage, skip, limit)
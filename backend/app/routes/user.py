@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Dict, List, Optional
 from app.database.session import get_db
-from app.core.dependencies import get_current_user, get_current_active_user
+from app.core.dependencies import get_current_user, get_current_active_user, get_optional_current_user
 from app.models.user import User
 from app.schemas.user import (
     UserResponse,
@@ -12,9 +12,13 @@ from app.schemas.user import (
     FollowerResponse
 )
 from app.services.user_service import UserService
+from app.services.follow_graph import follow_graph
 
 router = APIRouter()
 
+# Maximum number of user ids per relationship check
+MAX_FOLLOW_CHECK_IDS = 100
+
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
@@ -39,6 +43,44 @@ async def update_current_user(
     return updated_user
 
 
+@router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
+async def deactivate_current_user(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Deactivate current user account
+    """
+    await UserService.deactivate_user(db, current_user.id)
+    return None
+
+
+@router.get("/me/following/check", response_model=Dict[int, bool])
+async def check_following(
+    ids: str = Query(..., description="Comma-separated user IDs"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Check whether the current user follows each of the given users
+    """
+    try:
+        user_ids = [int(user_id) for user_id in ids.split(",") if user_id.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+    
+    if not user_ids or len(user_ids) > MAX_FOLLOW_CHECK_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Between 1 and {MAX_FOLLOW_CHECK_IDS} ids are required"
+        )
+    
+    return await follow_graph.follows_many(db, current_user.id, user_ids)
+
+
 @router.get("/{username}/profile", response_model=UserProfile)
 async def get_user_profile(
     username: str,
@@ -87,12 +129,19 @@ async def get_followers(
     user_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_current_user)
 ):
     """
     Get user's followers
     """
-    followers = await UserService.get_followers(db, user_id, skip, limit)
+    followers = await UserService.get_followers(
+        db,
+        user_id,
+        skip,
+        limit,
+        current_user.id if current_user else None
+    )
     return followers
 
 
@@ -101,10 +150,17 @@ async def get_following(
     user_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_current_user)
 ):
     """
     Get users that this user follows
     """
-    following = await UserService.get_following(db, user_id, skip, limit)
+    following = await UserService.get_following(
+        db,
+        user_id,
+        skip,
+        limit,
+        current_user.id if current_user else None
+    )
     return following
\ No newline at end of file
@@ -0,0 +1,48 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from enum import Enum
+
+
+class EngagementType(str, Enum):
+    VIEW = "view"
+    LIKE = "like"
+    SAVE = "save"
+    SHARE = "share"
+    WATCH = "watch"
+    WATCH_COMPLETE = "watch_complete"
+
+
+class EngagementLogCreate(BaseModel):
+    recipe_id: int
+    engagement_type: EngagementType
+    watch_duration: Optional[float] = Field(default=None, ge=0)  # in seconds
+    watch_percentage: Optional[float] = Field(default=None, ge=0, le=1)
+
+
+class EngagementLogAccepted(BaseModel):
+    accepted: bool
+
+
+class EngagementCreate(BaseModel):
+    recipe_id: int
+
+
+class LikeResponse(BaseModel):
+    recipe_id: int
+    is_liked: bool
+    likes_count: int
+
+
+class SaveResponse(BaseModel):
+    recipe_id: int
+    is_saved: bool
+    saves_count: int
+
+
+class EngagementStats(BaseModel):
+    recipe_id: int
+    likes_count: int
+    saves_count: int
+    views_count: int
+    is_liked: bool = False
+    is_saved: bool = False
@@ -136,6 +136,7 @@ class RecipeList(BaseModel):
     difficulty: DifficultyLevel
     likes_count: int
     saves_count: int
+    author_id: Optional[int] = None
     author_username: str
     created_at: datetime
     
@@ -143,10 +144,35 @@ class RecipeList(BaseModel):
         from_attributes = True
 
 
+class RecipeIngredientMatch(RecipeList):
+    matched_count: int
+    ingredient_count: int
+    coverage: float
+
+
 class RecipeSearchFilters(BaseModel):
     query: Optional[str] = None
     difficulty: Optional[DifficultyLevel] = None
     dietary_preference: Optional[DietaryPreference] = None
     max_cooking_time: Optional[int] = None
     tags: Optional[List[str]] = None
-    ingredient: Optional[str] = None
\ No newline at end of file
+    ingredient: Optional[str] = None
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class SearchFacets(BaseModel):
+    tags: List[FacetCount]
+    difficulty: List[FacetCount]
+    dietary_preference: List[FacetCount]
+
+
+class TagResponse(BaseModel):
+    name: str
+    usage_count: int
+    
+    class Config:
+        from_attributes = True
\ No newline at end of file
@@ -72,6 +72,7 @@ class UserPublic(BaseModel):
     id: int
     username: str
     avatar_url: Optional[str]
+    is_following: bool = False
     
     class Config:
         from_attributes = True
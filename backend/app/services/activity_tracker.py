@@ -0,0 +1,112 @@
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from sqlalchemy import update, bindparam, func
+from app.database.session import AsyncSessionLocal
+from app.models.user import User
+from app.core.tasks import PeriodicTask
+
+
+# Seconds between flushes of buffered activity to the users table
+ACTIVITY_FLUSH_INTERVAL_SECONDS = 30.0
+
+_users = User.__table__
+
+
+class ActivityTracker:
+    """
+    Write-behind tracker for users' last_login and last_seen
+
+    Requests only overwrite an in-memory timestamp, so any number of
+    logins and requests by a user between flushes cost one row update.
+    Each flush is one batched UPDATE; GREATEST keeps a later timestamp
+    already written by another worker.
+    """
+
+    def __init__(self):
+        # user_id -> (last login, last seen) as POSIX seconds
+        self._buffer: Dict[int, Tuple[Optional[float], float]] = {}
+        self._task = PeriodicTask("activity-flush", self.flush, ACTIVITY_FLUSH_INTERVAL_SECONDS)
+        self.flushed_total = 0
+        self.flush_count = 0
+        self.failed_flushes = 0
+
+    def record_login(self, user_id: int) -> None:
+        now = time.time()
+        self._buffer[user_id] = (now, now)
+
+    def touch(self, user_id: int) -> None:
+        """
+        Record that a user made an authenticated request
+        """
+        last_login = self._buffer[user_id][0] if user_id in self._buffer else None
+        self._buffer[user_id] = (last_login, time.time())
+
+    def _restore(self, buffer: Dict[int, Tuple[Optional[float], float]]) -> None:
+        for user_id, (last_login, last_seen) in buffer.items():
+            if user_id in self._buffer:
+                newer_login, newer_seen = self._buffer[user_id]
+                last_login = max(filter(None, (last_login, newer_login)), default=None)
+                last_seen = max(last_seen, newer_seen)
+            self._buffer[user_id] = (last_login, last_seen)
+
+    async def flush(self) -> int:
+        if not self._buffer:
+            return 0
+
+        buffer, self._buffer = self._buffer, {}
+
+        stmt = (
+            update(_users)
+            .where(_users.c.id == bindparam("user_id"))
+            .values(
+                # GREATEST ignores NULLs, so a NULL login_at keeps the stored value
+                last_login=func.greatest(_users.c.last_login, bindparam("login_at", type_=_users.c.last_login.type)),
+                last_seen=func.greatest(_users.c.last_seen, bindparam("seen_at", type_=_users.c.last_seen.type)),
+                # Activity is not a profile change
+                updated_at=_users.c.updated_at
+            )
+        )
+        # Sorted ids keep lock order consistent between concurrent flushers
+        params = [
+            {
+                "user_id": user_id,
+                "login_at": datetime.fromtimestamp(buffer[user_id][0], timezone.utc) if buffer[user_id][0] else None,
+                "seen_at": datetime.fromtimestamp(buffer[user_id][1], timezone.utc),
+            }
+            for user_id in sorted(buffer)
+        ]
+
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(stmt, params)
+                await session.commit()
+        except Exception:
+            # Hand the timestamps back so the next flush retries them
+            self.failed_flushes += 1
+            self._restore(buffer)
+            raise
+
+        self.flushed_total += len(params)
+        self.flush_count += 1
+        return len(params)
+
+    def start(self) -> None:
+        self._task.start()
+
+    async def stop(self) -> None:
+        """
+        Stop periodic flushing and flush anything outstanding
+        """
+        await self._task.stop()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "buffered_users": len(self._buffer),
+            "flushed_total": self.flushed_total,
+            "flush_count": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+activity_tracker = ActivityTracker()
@@ -1,11 +1,13 @@
 from typing import Optional, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
-from app.core.security import hash_password, verify_password, create_access_token, create_refresh_token
-from datetime import datetime
+from app.core.security import create_access_token, create_refresh_token, new_token_id
+from app.services.password_hasher import password_hasher
+from app.services.activity_tracker import activity_tracker
 
 
 class AuthService:
@@ -17,37 +19,48 @@ class AuthService:
     async def register_user(db: AsyncSession, user_data: RegisterRequest) -> User:
         """
         Register a new user
+        
+        One INSERT ... RETURNING; duplicates are caught by the unique
+        indexes on email and username rather than checked beforehand.
         """
-        # Check if email already exists
-        result = await db.execute(select(User).where(User.email == user_data.email))
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
+        hashed_pwd = await password_hasher.hash(user_data.password)
         
-        # Check if username already exists
-        result = await db.execute(select(User).where(User.username == user_data.username))
-        if result.scalar_one_or_none():
+        try:
+            result = await db.execute(
+                insert(User)
+                .values(
+                    email=user_data.email,
+                    username=user_data.username,
+                    hashed_password=hashed_pwd
+                )
+                .returning(User)
+            )
+            new_user = result.scalar_one()
+            await db.commit()
+        except IntegrityError as error:
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already taken"
+                detail=AuthService._duplicate_user_detail(error)
             )
         
-        # Create new user
-        hashed_pwd = hash_password(user_data.password)
-        new_user = User(
-            email=user_data.email,
-            username=user_data.username,
-            hashed_password=hashed_pwd
-        )
-        
-        db.add(new_user)
-        await db.commit()
-        await db.refresh(new_user)
-        
         return new_user
     
+    @staticmethod
+    def _duplicate_user_detail(error: IntegrityError) -> str:
+        """
+        Registration error message for a unique violation on users
+        """
+        # asyncpg's UniqueViolationError (the driver error's cause) names the index
+        cause = getattr(error.orig, "__cause__", None)
+        constraint = getattr(cause, "constraint_name", None) or str(error.orig)
+        
+        if "username" in constraint:
+            return "Username already taken"
+        if "email" in constraint:
+            return "Email already registered"
+        raise error
+    
     @staticmethod
     async def authenticate_user(db: AsyncSession, login_data: LoginRequest) -> User:
         """
@@ -63,8 +76,9 @@ class AuthService:
                 detail="Incorrect email or password"
             )
         
-        # Verify password
-        if not verify_password(login_data.password, user.hashed_password):
+        # Verify password (in the hashing pool, off the event loop)
+        is_valid, new_hash = await password_hasher.verify(login_data.password, user.hashed_password)
+        if not is_valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
@@ -77,18 +91,25 @@ class AuthService:
                 detail="Account is inactive"
             )
         
-        # Update last login
-        user.last_login = datetime.utcnow()
-        await db.commit()
+        # Upgrade hashes made with an older work factor
+        if new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
+        
+        # Update last login (buffered, written by the activity tracker)
+        activity_tracker.record_login(user.id)
         
         return user
     
     @staticmethod
-    def create_tokens(user: User) -> TokenResponse:
+    def create_tokens(user: User, family: Optional[str] = None) -> TokenResponse:
         """
         Create access and refresh tokens for user
+        
+        `family` identifies the login session; refreshes pass the old
+        token's family so revoking it logs the whole session out.
         """
-        token_data = {"sub": str(user.id), "email": user.email}
+        token_data = {"sub": str(user.id), "email": user.email, "fam": family or new_token_id()}
         
         access_token = create_access_token(token_data)
         refresh_token = create_refresh_token(token_data)
@@ -0,0 +1,291 @@
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models.recipe import Recipe
+from app.models.recommendation import RecipeContentVector
+from app.services.search_service import tokenize
+from app.core.tasks import PeriodicTask
+from app.database.session import AsyncSessionLocal
+
+
+logger = logging.getLogger(__name__)
+
+# Hashed feature dimensions; each stored vector is 4 * this many bytes
+CONTENT_VECTOR_DIM = 256
+
+# Field weights, in the same order of importance as search ranking
+CONTENT_FIELD_WEIGHTS = {"title": 2.0, "tags": 1.5, "ingredients": 1.0, "description": 0.5}
+
+# Tokens too common across recipes to say anything about them
+CONTENT_STOP_TOKENS = frozenset({
+    "a", "an", "and", "the", "of", "with", "in", "to", "for", "or", "on", "my",
+    "salt", "pepper", "oil", "water", "sugar", "fresh", "ground", "taste",
+})
+
+# Seconds between pulls of vectors written by other workers
+CONTENT_INDEX_SYNC_INTERVAL_SECONDS = 30.0
+
+# Re-read this much before the newest vector seen on each sync. A vector is
+# stamped before its transaction commits, so a write can become visible
+# after another worker has already synced past its timestamp
+CONTENT_INDEX_SYNC_OVERLAP_SECONDS = 60.0
+
+# Rows fetched per round trip while loading the index
+CONTENT_INDEX_LOAD_PARTITION_SIZE = 10000
+
+_vectors = RecipeContentVector.__table__
+
+
+def _feature(token: str) -> Tuple[int, float]:
+    """
+    Stable (bucket, sign) of a token; the sign keeps collisions unbiased
+    """
+    digest = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+    return digest % CONTENT_VECTOR_DIM, 1.0 if digest >> 63 else -1.0
+
+
+def vectorize(
+    title: Optional[str],
+    description: Optional[str],
+    tags: Optional[Iterable[str]],
+    ingredient_names: Optional[Iterable[str]]
+) -> np.ndarray:
+    """
+    L2-normalized hashed bag-of-words vector of a recipe's text
+    """
+    fields = {
+        "title": tokenize(title),
+        "tags": [token for tag in tags or [] for token in tokenize(tag)],
+        "ingredients": [token for name in ingredient_names or [] for token in tokenize(name)],
+        "description": tokenize(description),
+    }
+
+    vector = np.zeros(CONTENT_VECTOR_DIM, dtype=np.float32)
+    for field, tokens in fields.items():
+        weight = CONTENT_FIELD_WEIGHTS[field]
+        for token in tokens:
+            if token not in CONTENT_STOP_TOKENS:
+                bucket, sign = _feature(token)
+                vector[bucket] += sign * weight
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def vectorize_recipe(recipe) -> np.ndarray:
+    """
+    Vector of a Recipe (or a row with the same text columns)
+    """
+    return vectorize(
+        recipe.title,
+        recipe.description,
+        recipe.tags,
+        [item.get("name", "") for item in recipe.ingredients or [] if isinstance(item, dict)]
+    )
+
+
+class ContentIndex:
+    """
+    In-memory nearest-neighbor index over recipe content vectors
+
+    Vectors are rows of one contiguous float32 matrix, so a query is a
+    single matrix-vector product followed by a partial sort. Rows grow by
+    doubling and removals swap the last row into the hole.
+    """
+
+    def __init__(self, dim: int = CONTENT_VECTOR_DIM):
+        self.dim = dim
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._rows: Dict[int, int] = {}
+        self._synced_at: Optional[datetime] = None
+        self._task = PeriodicTask("content-index-sync", self.sync, CONTENT_INDEX_SYNC_INTERVAL_SECONDS)
+        self.queries = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, recipe_id: int, vector: np.ndarray) -> None:
+        """
+        Add or replace the vector of a recipe
+        """
+        row = self._rows.get(recipe_id)
+        if row is None:
+            row = len(self._rows)
+            if row == self._matrix.shape[0]:
+                capacity = max(2 * row, 1024)
+                matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+                matrix[:row] = self._matrix[:row]
+                ids = np.zeros(capacity, dtype=np.int64)
+                ids[:row] = self._ids[:row]
+                self._matrix, self._ids = matrix, ids
+            self._rows[recipe_id] = row
+            self._ids[row] = recipe_id
+        self._matrix[row] = vector
+
+    def remove(self, recipe_id: int) -> None:
+        row = self._rows.pop(recipe_id, None)
+        if row is None:
+            return
+
+        last = len(self._rows)
+        if row != last:
+            moved_id = int(self._ids[last])
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+
+    def vector(self, recipe_id: int) -> Optional[np.ndarray]:
+        row = self._rows.get(recipe_id)
+        return None if row is None else self._matrix[row]
+
+    def nearest(
+        self,
+        vector: np.ndarray,
+        k: int,
+        exclude: Iterable[int] = ()
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ids and cosine scores of the k recipes closest to `vector`, best first
+        """
+        self.queries += 1
+        size = len(self._rows)
+        scores = self._matrix[:size] @ vector
+        for recipe_id in exclude:
+            row = self._rows.get(recipe_id)
+            if row is not None:
+                scores[row] = -np.inf
+
+        k = min(k, size)
+        if k <= 0:
+            return self._ids[:0], scores[:0]
+        best = np.argpartition(-scores, k - 1)[:k] if k < size else np.arange(size)
+        best = best[np.argsort(-scores[best], kind="stable")]
+        best = best[np.isfinite(scores[best])]
+        return self._ids[best], scores[best]
+
+    def similar(self, recipe_id: int, k: int, exclude: Iterable[int] = ()) -> List[int]:
+        """
+        Ids of the k recipes whose text is most like `recipe_id`'s
+        """
+        vector = self.vector(recipe_id)
+        if vector is None:
+            return []
+        ids, _ = self.nearest(vector, k, [recipe_id, *exclude])
+        return ids.tolist()
+
+    def profile(self, recipe_ids: Iterable[int]) -> Optional[np.ndarray]:
+        """
+        Normalized mean vector of the given recipes, e.g. a user's likes
+        """
+        rows = [self._rows[recipe_id] for recipe_id in recipe_ids if recipe_id in self._rows]
+        if not rows:
+            return None
+        mean = self._matrix[rows].mean(axis=0)
+        norm = np.linalg.norm(mean)
+        return mean / norm if norm > 0 else None
+
+    def scores_for(self, recipe_ids: np.ndarray, vector: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of each given recipe to `vector` (0 if not indexed)
+        """
+        rows = np.fromiter(
+            (self._rows.get(recipe_id, -1) for recipe_id in recipe_ids.tolist()),
+            dtype=np.int64,
+            count=recipe_ids.size
+        )
+        scores = np.zeros(recipe_ids.size, dtype=np.float32)
+        found = rows >= 0
+        scores[found] = self._matrix[rows[found]] @ vector
+        return scores
+
+    async def load(self, db: AsyncSession) -> None:
+        """
+        Replace the index with every stored vector
+        """
+        self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._rows = {}
+        self._synced_at = None
+        await self._pull(db, None)
+
+    async def sync(self) -> None:
+        """
+        Pull vectors written by other workers since the last load or sync
+        """
+        async with AsyncSessionLocal() as db:
+            await self._pull(db, self._synced_at)
+
+    async def _pull(self, db: AsyncSession, since: Optional[datetime]) -> None:
+        query = select(_vectors.c.recipe_id, _vectors.c.vector, _vectors.c.updated_at)
+        if since is not None:
+            query = query.where(
+                _vectors.c.updated_at >= since - timedelta(seconds=CONTENT_INDEX_SYNC_OVERLAP_SECONDS)
+            )
+
+        expected = self.dim * np.dtype(np.float32).itemsize
+        result = await db.stream(query)
+        async for rows in result.partitions(CONTENT_INDEX_LOAD_PARTITION_SIZE):
+            for recipe_id, data, updated_at in rows:
+                # Vectors from a different dimension wait for a rebuild
+                if len(data) == expected:
+                    self.add(recipe_id, np.frombuffer(data, dtype=np.float32))
+                if self._synced_at is None or updated_at > self._synced_at:
+                    self._synced_at = updated_at
+
+    async def index_recipe(self, db: AsyncSession, recipe_id: int) -> None:
+        """
+        Store and index the vector of a created or updated recipe
+
+        Unpublished recipes are dropped. Workers that already indexed
+        them keep them until restarted; reads filter on is_published.
+        """
+        result = await db.execute(
+            select(Recipe.title, Recipe.description, Recipe.tags, Recipe.ingredients, Recipe.is_published)
+            .where(Recipe.id == recipe_id)
+        )
+        recipe = result.one_or_none()
+
+        if recipe is None or not recipe.is_published:
+            await db.execute(delete(_vectors).where(_vectors.c.recipe_id == recipe_id))
+            await db.commit()
+            self.remove(recipe_id)
+            return
+
+        vector = vectorize_recipe(recipe)
+        # clock_timestamp() rather than now(), the transaction start, keeps
+        # the stamp close to the commit that makes it visible
+        stmt = pg_insert(_vectors).values(
+            recipe_id=recipe_id,
+            vector=vector.tobytes(),
+            updated_at=func.clock_timestamp()
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["recipe_id"],
+                set_={"vector": stmt.excluded.vector, "updated_at": stmt.excluded.updated_at}
+            )
+        )
+        await db.commit()
+        self.add(recipe_id, vector)
+
+    def start(self) -> None:
+        self._task.start()
+
+    async def stop(self) -> None:
+        await self._task.stop()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "recipes": len(self._rows),
+            "matrix_bytes": self._matrix.nbytes,
+            "queries": self.queries,
+        }
+
+
+content_index = ContentIndex()
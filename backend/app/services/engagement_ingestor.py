@@ -0,0 +1,283 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert, select, func, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import IntegrityError
+from app.database.session import AsyncSessionLocal
+from app.models.recommendation import EngagementLog
+from app.models.recipe import Recipe
+from app.models.user import User
+
+
+logger = logging.getLogger(__name__)
+
+# Events buffered between request handlers and the database writer
+ENGAGEMENT_QUEUE_SIZE = 10000
+
+# A batch is written when it reaches this many events or its oldest event
+# has waited this long, whichever comes first
+ENGAGEMENT_BATCH_SIZE = 500
+ENGAGEMENT_BATCH_MAX_WAIT_SECONDS = 1.0
+
+# What to do when the queue is full:
+#   "drop_newest" - discard the incoming event
+#   "drop_oldest" - discard the oldest queued event to make room
+#   "block"       - wait up to ENGAGEMENT_BLOCK_TIMEOUT_SECONDS for room
+#                   (submit() only; record() never waits and drops instead)
+ENGAGEMENT_OVERFLOW_POLICY = "drop_newest"
+ENGAGEMENT_BLOCK_TIMEOUT_SECONDS = 0.1
+
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+# Interval at which a partially filled batch checks for more events
+_BATCH_POLL_SECONDS = 0.05
+
+_logs = EngagementLog.__table__
+_EVENT_COLUMNS = ["user_id", "recipe_id", "event_type", "watch_time", "created_at"]
+
+
+def _batch_insert():
+    """
+    INSERT ... SELECT over the batch passed as one array per column
+
+    Joining recipes and users drops events for ids that do not exist (a
+    bogus client id or a just-deleted recipe) instead of letting one
+    foreign-key violation fail the whole batch.
+    """
+    events = (
+        func.unnest(*[
+            bindparam(f"{column}s", type_=ARRAY(_logs.c[column].type))
+            for column in _EVENT_COLUMNS
+        ])
+        .table_valued(*_EVENT_COLUMNS)
+        .render_derived(name="events")
+    )
+    return insert(_logs).from_select(
+        _EVENT_COLUMNS,
+        select(*[events.c[column] for column in _EVENT_COLUMNS])
+        .join(Recipe, Recipe.id == events.c.recipe_id)
+        .join(User, User.id == events.c.user_id)
+    )
+
+
+_BATCH_INSERT = _batch_insert()
+
+
+class EngagementIngestor:
+    """
+    Bounded queue of engagement events with a batching background writer
+
+    Request handlers enqueue events without touching the database; one
+    consumer task drains the queue and bulk-inserts each batch with a
+    single INSERT ... SELECT, outside any request transaction. Events for
+    unknown users or recipes are counted as rejected and skipped.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = ENGAGEMENT_QUEUE_SIZE,
+        batch_size: int = ENGAGEMENT_BATCH_SIZE,
+        max_wait: float = ENGAGEMENT_BATCH_MAX_WAIT_SECONDS,
+        overflow_policy: str = ENGAGEMENT_OVERFLOW_POLICY
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.overflow_policy = overflow_policy
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._task: Optional[asyncio.Task] = None
+        self._idle = False
+        self._closing = False
+
+        self.enqueued_total = 0
+        self.dropped_total = 0
+        self.inserted_total = 0
+        self.failed_total = 0
+        self.rejected_total = 0
+        self.batch_count = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+    @staticmethod
+    def build_event(
+        user_id: int,
+        recipe_id: int,
+        event_type: str,
+        watch_time: Optional[float] = None
+    ) -> Dict[str, Any]:
+        return {
+            "user_id": user_id,
+            "recipe_id": recipe_id,
+            "event_type": event_type,
+            "watch_time": watch_time,
+            # Stamped at enqueue time, not when the batch is written
+            "created_at": datetime.now(timezone.utc),
+        }
+
+    def record(
+        self,
+        user_id: int,
+        recipe_id: int,
+        event_type: str,
+        watch_time: Optional[float] = None
+    ) -> bool:
+        """
+        Enqueue an event without waiting; returns False if it was dropped
+        """
+        return self._offer(self.build_event(user_id, recipe_id, event_type, watch_time))
+
+    async def submit(
+        self,
+        user_id: int,
+        recipe_id: int,
+        event_type: str,
+        watch_time: Optional[float] = None
+    ) -> bool:
+        """
+        Enqueue an event, waiting briefly for room under the "block" policy
+        """
+        event = self.build_event(user_id, recipe_id, event_type, watch_time)
+        if self.overflow_policy != "block":
+            return self._offer(event)
+
+        try:
+            await asyncio.wait_for(self._queue.put(event), ENGAGEMENT_BLOCK_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            self.dropped_total += 1
+            return False
+
+        self.enqueued_total += 1
+        return True
+
+    def _offer(self, event: Dict[str, Any]) -> bool:
+        if self._closing:
+            self.dropped_total += 1
+            return False
+
+        if self._queue.full() and self.overflow_policy == "drop_oldest":
+            self._queue.get_nowait()
+            self.dropped_total += 1
+
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped_total += 1
+            return False
+
+        self.enqueued_total += 1
+        return True
+
+    async def _next_batch(self) -> List[Dict[str, Any]]:
+        self._idle = True
+        try:
+            batch = [await self._queue.get()]
+        finally:
+            self._idle = False
+
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            remaining = deadline - time.monotonic()
+            if len(batch) >= self.batch_size or remaining <= 0 or self._closing:
+                break
+            await asyncio.sleep(min(remaining, _BATCH_POLL_SECONDS))
+
+        return batch
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            inserted = await self._insert(batch)
+        except Exception:
+            # Events are best-effort; a failed batch is dropped, not retried
+            self.failed_total += len(batch)
+            logger.exception(f"Failed to write {len(batch)} engagement events")
+            return
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self.total_flush_ms += elapsed_ms
+            self.batch_count += 1
+
+        self.inserted_total += inserted
+        self.rejected_total += len(batch) - inserted
+
+    async def _insert(self, batch: List[Dict[str, Any]]) -> int:
+        """
+        Insert the events whose user and recipe exist; returns rows inserted
+        """
+        params = {f"{column}s": [event[column] for event in batch] for column in _EVENT_COLUMNS}
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(_BATCH_INSERT, params)
+                await session.commit()
+            return result.rowcount
+        except IntegrityError:
+            # A recipe or user deleted between the join and the insert;
+            # split so only the events referencing it are lost
+            if len(batch) == 1:
+                return 0
+            middle = len(batch) // 2
+            return await self._insert(batch[:middle]) + await self._insert(batch[middle:])
+
+    async def _run(self) -> None:
+        while not (self._closing and self._queue.empty()):
+            batch = await self._next_batch()
+            await self._write(batch)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run(), name="engagement-ingestor")
+
+    async def stop(self) -> None:
+        """
+        Stop accepting events and write out everything still queued
+        """
+        if self._task is None:
+            return
+
+        self._closing = True
+        if self._idle:
+            # Blocked on an empty queue; anything that arrives is written below
+            self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        while not self._queue.empty():
+            batch = []
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._write(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "overflow_policy": self.overflow_policy,
+            "enqueued_total": self.enqueued_total,
+            "dropped_total": self.dropped_total,
+            "inserted_total": self.inserted_total,
+            "failed_total": self.failed_total,
+            "rejected_total": self.rejected_total,
+            "batch_count": self.batch_count,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+            "avg_flush_ms": round(self.total_flush_ms / self.batch_count, 2) if self.batch_count else 0.0,
+        }
+
+
+engagement_ingestor = EngagementIngestor()
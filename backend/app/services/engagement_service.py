@@ -0,0 +1,339 @@
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func, literal, and_, exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException, status
+from app.models.recipe import Recipe
+from app.models.engagement import Like, Save, RecipeCounterShard
+from app.schemas.engagement import LikeResponse, SaveResponse, EngagementStats
+from app.schemas.recipe import RecipeList
+from app.core.tasks import PeriodicTask
+from app.database.session import AsyncSessionLocal
+from app.services.trending_service import trending_aggregator
+
+
+# Shards per hot recipe; each write picks one at random
+COUNTER_SHARDS = 16
+
+# Likes + saves per minute (seen by this worker) above which a recipe's
+# counter writes go to shards instead of the recipe row
+HOT_RECIPE_WRITES_PER_MINUTE = 60
+
+# Seconds between folds of shard deltas into the recipe counters
+COUNTER_FOLD_INTERVAL_SECONDS = 5.0
+
+# Advisory lock key so only one worker folds at a time
+COUNTER_FOLD_LOCK_ID = 0x464F4C44
+
+# Trending event recorded for a new like/save
+TRENDING_EVENTS = {"likes": "like", "saves": "save"}
+
+_recipes = Recipe.__table__
+_shards = RecipeCounterShard.__table__
+
+
+class _HotRecipeDetector:
+    """
+    Per-minute write counts, used to route hot recipes to sharded counters
+    """
+
+    def __init__(self):
+        self._window = 0
+        self._counts: Dict[int, int] = {}
+
+    def is_hot(self, recipe_id: int) -> bool:
+        window = int(time.monotonic() // 60)
+        if window != self._window:
+            self._window, self._counts = window, {}
+
+        self._counts[recipe_id] = self._counts.get(recipe_id, 0) + 1
+        return self._counts[recipe_id] > HOT_RECIPE_WRITES_PER_MINUTE
+
+
+_hot_recipes = _HotRecipeDetector()
+
+
+class EngagementService:
+    """
+    Likes and saves with idempotent writes and atomic counter updates
+    """
+
+    @staticmethod
+    async def like_recipe(db: AsyncSession, user_id: int, recipe_id: int) -> LikeResponse:
+        """
+        Like a recipe; liking twice is a no-op
+        """
+        count = await EngagementService._add(db, Like, "likes", user_id, recipe_id)
+        return LikeResponse(recipe_id=recipe_id, is_liked=True, likes_count=count)
+
+    @staticmethod
+    async def unlike_recipe(db: AsyncSession, user_id: int, recipe_id: int) -> LikeResponse:
+        """
+        Remove a like; unliking twice is a no-op
+        """
+        count = await EngagementService._remove(db, Like, "likes", user_id, recipe_id)
+        return LikeResponse(recipe_id=recipe_id, is_liked=False, likes_count=count)
+
+    @staticmethod
+    async def save_recipe(db: AsyncSession, user_id: int, recipe_id: int) -> SaveResponse:
+        """
+        Save a recipe; saving twice is a no-op
+        """
+        count = await EngagementService._add(db, Save, "saves", user_id, recipe_id)
+        return SaveResponse(recipe_id=recipe_id, is_saved=True, saves_count=count)
+
+    @staticmethod
+    async def unsave_recipe(db: AsyncSession, user_id: int, recipe_id: int) -> SaveResponse:
+        """
+        Remove a save; unsaving twice is a no-op
+        """
+        count = await EngagementService._remove(db, Save, "saves", user_id, recipe_id)
+        return SaveResponse(recipe_id=recipe_id, is_saved=False, saves_count=count)
+
+    @staticmethod
+    async def _add(db: AsyncSession, model, counter: str, user_id: int, recipe_id: int) -> int:
+        """
+        Insert the row and bump the counter in one statement
+
+        ON CONFLICT DO NOTHING RETURNING yields a row only when the insert
+        happened, so retries and races never count twice.
+        """
+        inserted = (
+            pg_insert(model.__table__)
+            .values(user_id=user_id, recipe_id=recipe_id)
+            .on_conflict_do_nothing(index_elements=["user_id", "recipe_id"])
+            .returning(model.__table__.c.recipe_id)
+            .cte("inserted")
+        )
+
+        try:
+            changed, count = await EngagementService._apply_delta(db, inserted, recipe_id, counter, 1)
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Recipe not found"
+            )
+
+        if count is None:
+            count = await EngagementService._read_count(db, recipe_id, counter)
+        await db.commit()
+
+        if changed:
+            trending_aggregator.record(recipe_id, TRENDING_EVENTS[counter])
+        return count
+
+    @staticmethod
+    async def _remove(db: AsyncSession, model, counter: str, user_id: int, recipe_id: int) -> int:
+        """
+        Delete the row and decrement the counter in one statement
+        """
+        table = model.__table__
+        deleted = (
+            delete(table)
+            .where(and_(table.c.user_id == user_id, table.c.recipe_id == recipe_id))
+            .returning(table.c.recipe_id)
+            .cte("deleted")
+        )
+
+        _, count = await EngagementService._apply_delta(db, deleted, recipe_id, counter, -1)
+        if count is None:
+            count = await EngagementService._read_count(db, recipe_id, counter)
+        await db.commit()
+        return count
+
+    @staticmethod
+    async def _apply_delta(
+        db: AsyncSession,
+        changed,
+        recipe_id: int,
+        counter: str,
+        delta: int
+    ) -> Tuple[bool, Optional[int]]:
+        """
+        Apply delta to the counter if the `changed` CTE returned a row
+
+        Returns whether a row changed, and the new count when it was
+        written to the recipe row (None if unchanged or sharded).
+        """
+        if _hot_recipes.is_hot(recipe_id):
+            column = f"{counter}_delta"
+            stmt = pg_insert(_shards).from_select(
+                ["recipe_id", "shard", column],
+                select(changed.c.recipe_id, literal(random.randrange(COUNTER_SHARDS)), literal(delta))
+            )
+            result = await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["recipe_id", "shard"],
+                    set_={column: _shards.c[column] + stmt.excluded[column]}
+                )
+                .returning(_shards.c.recipe_id)
+            )
+            return result.first() is not None, None
+
+        column = f"{counter}_count"
+        result = await db.execute(
+            update(_recipes)
+            .where(_recipes.c.id == changed.c.recipe_id)
+            .values({column: _recipes.c[column] + delta})
+            .returning(_recipes.c[column])
+        )
+        count = result.scalar_one_or_none()
+        return count is not None, count
+
+    @staticmethod
+    async def _read_count(db: AsyncSession, recipe_id: int, counter: str) -> int:
+        """
+        Current counter value including deltas still sitting in shards
+        """
+        pending = (
+            select(func.coalesce(func.sum(_shards.c[f"{counter}_delta"]), 0))
+            .where(_shards.c.recipe_id == recipe_id)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(_recipes.c[f"{counter}_count"] + pending).where(_recipes.c.id == recipe_id)
+        )
+        count = result.scalar_one_or_none()
+        if count is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Recipe not found"
+            )
+        return max(count, 0)
+
+    @staticmethod
+    async def get_stats(db: AsyncSession, recipe_id: int, user_id: Optional[int] = None) -> EngagementStats:
+        """
+        Counters for a recipe and, when signed in, the viewer's like/save state
+        """
+        likes_pending = (
+            select(func.coalesce(func.sum(_shards.c.likes_delta), 0))
+            .where(_shards.c.recipe_id == recipe_id)
+            .scalar_subquery()
+        )
+        saves_pending = (
+            select(func.coalesce(func.sum(_shards.c.saves_delta), 0))
+            .where(_shards.c.recipe_id == recipe_id)
+            .scalar_subquery()
+        )
+        columns = [
+            (Recipe.likes_count + likes_pending).label("likes_count"),
+            (Recipe.saves_count + saves_pending).label("saves_count"),
+            Recipe.views_count,
+        ]
+        if user_id:
+            columns += [
+                exists().where(and_(Like.user_id == user_id, Like.recipe_id == recipe_id)).label("is_liked"),
+                exists().where(and_(Save.user_id == user_id, Save.recipe_id == recipe_id)).label("is_saved"),
+            ]
+
+        result = await db.execute(select(*columns).where(Recipe.id == recipe_id))
+        row = result.first()
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Recipe not found"
+            )
+
+        stats = dict(row._mapping)
+        stats["likes_count"] = max(stats["likes_count"], 0)
+        stats["saves_count"] = max(stats["saves_count"], 0)
+        return EngagementStats(recipe_id=recipe_id, **stats)
+
+    @staticmethod
+    async def get_saved_recipes(
+        db: AsyncSession,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[RecipeList]:
+        """
+        Recipes the user saved, most recently saved first
+        """
+        from app.services.recipe_service import RecipeService
+
+        result = await db.execute(
+            RecipeService.recipe_list_query()
+            .join(Save, Save.recipe_id == Recipe.id)
+            .where(Save.user_id == user_id)
+            .order_by(Save.created_at.desc(), Save.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return [RecipeList(**row._mapping) for row in result]
+
+    @staticmethod
+    async def fold_counter_shards(db: AsyncSession) -> int:
+        """
+        Move all shard deltas into the recipe counters in one statement
+
+        Returns the number of recipes updated; 0 if another worker holds
+        the fold lock.
+        """
+        locked = await db.execute(select(func.pg_try_advisory_xact_lock(COUNTER_FOLD_LOCK_ID)))
+        if not locked.scalar():
+            await db.rollback()
+            return 0
+
+        folded = (
+            delete(_shards)
+            .returning(_shards.c.recipe_id, _shards.c.likes_delta, _shards.c.saves_delta)
+            .cte("folded")
+        )
+        totals = (
+            select(
+                folded.c.recipe_id,
+                func.sum(folded.c.likes_delta).label("likes_delta"),
+                func.sum(folded.c.saves_delta).label("saves_delta")
+            )
+            .group_by(folded.c.recipe_id)
+            .cte("totals")
+        )
+        result = await db.execute(
+            update(_recipes)
+            .where(_recipes.c.id == totals.c.recipe_id)
+            .values(
+                likes_count=_recipes.c.likes_count + totals.c.likes_delta,
+                saves_count=_recipes.c.saves_count + totals.c.saves_delta
+            )
+        )
+        await db.commit()
+        return result.rowcount
+
+
+class CounterShardFolder:
+    """
+    Periodically folds sharded counter deltas into the recipe rows
+    """
+
+    def __init__(self):
+        self._task = PeriodicTask("counter-shard-fold", self.fold, COUNTER_FOLD_INTERVAL_SECONDS)
+        self.folded_recipes_total = 0
+        self.fold_count = 0
+
+    async def fold(self) -> int:
+        async with AsyncSessionLocal() as session:
+            folded = await EngagementService.fold_counter_shards(session)
+
+        self.folded_recipes_total += folded
+        self.fold_count += 1
+        return folded
+
+    def start(self) -> None:
+        self._task.start()
+
+    async def stop(self) -> None:
+        await self._task.stop()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "folded_recipes_total": self.folded_recipes_total,
+            "fold_count": self.fold_count,
+        }
+
+
+counter_folder = CounterShardFolder()
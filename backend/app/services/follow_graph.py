@@ -0,0 +1,124 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.models.follower import Follower
+
+
+# Users whose following lists are kept in memory
+FOLLOW_GRAPH_CACHE_SIZE = 50000
+
+# Seconds a cached list is trusted before reloading, to pick up follows
+# made through other workers (this worker's follows apply immediately)
+FOLLOW_GRAPH_CACHE_TTL = 30
+
+# users.id is a 32-bit integer; larger ids cannot be followed
+_MAX_USER_ID = np.iinfo(np.int32).max
+
+
+class FollowGraphCache:
+    """
+    LRU cache of each user's followed ids as a sorted int32 array
+
+    A "does the viewer follow each of these users" check is one binary
+    search over the array for the whole batch, and costs at most one
+    query per viewer per TTL.
+    """
+
+    def __init__(self, max_users: int = FOLLOW_GRAPH_CACHE_SIZE, ttl: float = FOLLOW_GRAPH_CACHE_TTL):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._following: "OrderedDict[int, Tuple[np.ndarray, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get_following_ids(self, db: AsyncSession, user_id: int) -> np.ndarray:
+        """
+        Sorted ids of the users `user_id` follows
+        """
+        cached = self._following.get(user_id)
+        if cached and time.monotonic() - cached[1] < self.ttl:
+            self._following.move_to_end(user_id)
+            self.hits += 1
+            return cached[0]
+
+        self.misses += 1
+        result = await db.execute(
+            select(Follower.following_id)
+            .where(Follower.follower_id == user_id)
+            .order_by(Follower.following_id)
+        )
+        following = np.array(result.scalars().all(), dtype=np.int32)
+        self._store(user_id, following)
+        return following
+
+    async def follows_many(self, db: AsyncSession, viewer_id: int, user_ids: Iterable[int]) -> Dict[int, bool]:
+        """
+        Whether the viewer follows each of the given users, in one call
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+
+        follows = dict.fromkeys(user_ids, False)
+        # Out-of-range ids would overflow the int32 cast, and match nothing anyway
+        user_ids = [user_id for user_id in user_ids if 0 < user_id <= _MAX_USER_ID]
+        if not user_ids:
+            return follows
+
+        following = await self.get_following_ids(db, viewer_id)
+        targets = np.asarray(user_ids, dtype=np.int32)
+        positions = np.searchsorted(following, targets)
+        found = positions < following.size
+        found[found] = following[positions[found]] == targets[found]
+        follows.update(zip(user_ids, found.tolist()))
+        return follows
+
+    async def follows(self, db: AsyncSession, viewer_id: int, user_id: int) -> bool:
+        return (await self.follows_many(db, viewer_id, [user_id]))[user_id]
+
+    def on_follow(self, follower_id: int, following_id: int) -> None:
+        """
+        Apply a committed follow to the cached list, if loaded
+        """
+        cached = self._following.get(follower_id)
+        if cached is None:
+            return
+
+        following = cached[0]
+        position = int(np.searchsorted(following, following_id))
+        if position < following.size and following[position] == following_id:
+            return
+        self._following[follower_id] = (np.insert(following, position, following_id), cached[1])
+
+    def on_unfollow(self, follower_id: int, following_id: int) -> None:
+        """
+        Apply a committed unfollow to the cached list, if loaded
+        """
+        cached = self._following.get(follower_id)
+        if cached is None:
+            return
+
+        following = cached[0]
+        position = int(np.searchsorted(following, following_id))
+        if position < following.size and following[position] == following_id:
+            self._following[follower_id] = (np.delete(following, position), cached[1])
+
+    def _store(self, user_id: int, following: np.ndarray) -> None:
+        self._following[user_id] = (following, time.monotonic())
+        self._following.move_to_end(user_id)
+        while len(self._following) > self.max_users:
+            self._following.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cached_users": len(self._following),
+            "cached_bytes": sum(entry[0].nbytes for entry in self._following.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+follow_graph = FollowGraphCache()
@@ -0,0 +1,175 @@
+import re
+from typing import List, Dict, Any, Iterable
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, update, insert, func, literal, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models.recipe import Recipe
+from app.models.ingredient import Ingredient, RecipeIngredient
+from app.schemas.recipe import RecipeIngredientMatch
+
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+NON_WORD_PATTERN = re.compile(r"[^a-z0-9 ]")
+
+# Plurals formed with "es" (tomatoes, peaches, radishes, glasses, boxes)
+PLURAL_ES_SUFFIXES = ("oes", "ches", "shes", "sses", "xes", "zes")
+
+# Words the suffix rules below would get wrong
+IRREGULAR_SINGULARS = {
+    "leaves": "leaf",
+    "halves": "half",
+    "loaves": "loaf",
+    "cookies": "cookie",
+    "brownies": "brownie",
+    "smoothies": "smoothie",
+    "veggies": "veggie",
+    "molasses": "molasses",
+}
+
+
+class IngredientService:
+    """
+    Ingredient dictionary and recipe posting lists
+    """
+    
+    @staticmethod
+    def singularize(word: str) -> str:
+        """
+        Naive singular of one word (berries -> berry, tomatoes -> tomato)
+        """
+        if word in IRREGULAR_SINGULARS:
+            return IRREGULAR_SINGULARS[word]
+        if len(word) > 4 and word.endswith("ies"):
+            return word[:-3] + "y"
+        if len(word) > 4 and word.endswith(PLURAL_ES_SUFFIXES):
+            return word[:-2]
+        if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us")):
+            return word[:-1]
+        return word
+    
+    @staticmethod
+    def normalize(name: str) -> str:
+        """
+        Normalize an ingredient name: lowercase, plain words, each naively singular
+        """
+        words = NON_WORD_PATTERN.sub(" ", name.lower()).split()
+        return " ".join(map(IngredientService.singularize, words))[:100]
+    
+    @staticmethod
+    def matches(ingredient: str, query: str) -> bool:
+        """
+        Whether a normalized ingredient name contains a normalized query as whole words
+
+        "chicken" matches "chicken breast" and "smoked chicken", not "chickpea".
+        """
+        return f" {query} " in f" {ingredient} "
+    
+    @staticmethod
+    def name_matches(names: List[str]):
+        """
+        SQL condition: Ingredient.name contains any of the normalized names as whole words
+        """
+        # Normalized names are only [a-z0-9 ], so they need no LIKE escaping
+        padded = func.concat(" ", Ingredient.name, " ")
+        return or_(*[padded.like(f"% {name} %") for name in names])
+    
+    @staticmethod
+    def normalize_all(names: Iterable[str]) -> List[str]:
+        return sorted({normalized for normalized in map(IngredientService.normalize, names) if normalized})
+    
+    @staticmethod
+    async def sync_recipe(
+        db: AsyncSession,
+        recipe_id: int,
+        ingredients: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Replace a recipe's posting list entries (caller commits)
+        """
+        names = IngredientService.normalize_all(item.get("name", "") for item in ingredients)
+        
+        await db.execute(
+            delete(RecipeIngredient).where(RecipeIngredient.recipe_id == recipe_id)
+        )
+        
+        if names:
+            await db.execute(
+                pg_insert(Ingredient)
+                .values([{"name": name} for name in names])
+                .on_conflict_do_nothing(index_elements=[Ingredient.name])
+            )
+            await db.execute(
+                insert(RecipeIngredient).from_select(
+                    ["recipe_id", "ingredient_id"],
+                    select(literal(recipe_id), Ingredient.id).where(Ingredient.name.in_(names))
+                )
+            )
+        
+        await db.execute(
+            update(Recipe)
+            .where(Recipe.id == recipe_id)
+            .values(ingredient_count=len(names))
+            .execution_options(synchronize_session=False)
+        )
+    
+    @staticmethod
+    def recipes_with_ingredient(name: str):
+        """
+        Subquery of recipe ids with an ingredient matching a name (see matches)
+        """
+        return (
+            select(RecipeIngredient.recipe_id)
+            .join(Ingredient, Ingredient.id == RecipeIngredient.ingredient_id)
+            .where(IngredientService.name_matches([IngredientService.normalize(name)]))
+        )
+    
+    @staticmethod
+    async def find_by_ingredients(
+        db: AsyncSession,
+        names: List[str],
+        min_coverage: float = 0.0,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[RecipeIngredientMatch]:
+        """
+        Rank recipes by how much of their ingredient list the user has
+        
+        Merges the posting lists of the dictionary ingredients matching the
+        given names, counting each recipe ingredient covered once, so only
+        recipes sharing at least one ingredient are read. "chicken" covers
+        both "chicken breast" and "chicken stock".
+        """
+        from app.services.recipe_service import RecipeService
+        
+        names = IngredientService.normalize_all(names)
+        if not names:
+            return []
+        
+        matches = (
+            select(
+                RecipeIngredient.recipe_id,
+                func.count().label("matched_count")
+            )
+            .join(Ingredient, Ingredient.id == RecipeIngredient.ingredient_id)
+            .where(IngredientService.name_matches(names))
+            .group_by(RecipeIngredient.recipe_id)
+            .subquery()
+        )
+        coverage = (
+            matches.c.matched_count * 1.0 / func.greatest(Recipe.ingredient_count, 1)
+        ).label("coverage")
+        
+        query = (
+            RecipeService.recipe_list_query()
+            .add_columns(matches.c.matched_count, Recipe.ingredient_count, coverage)
+            .join(matches, matches.c.recipe_id == Recipe.id)
+            .where(Recipe.is_published == True)
+            .order_by(coverage.desc(), matches.c.matched_count.desc(), Recipe.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        if min_coverage > 0:
+            query = query.where(coverage >= min_coverage)
+        
+        result = await db.execute(query)
+        return [RecipeIngredientMatch(**row._mapping) for row in result]
@@ -0,0 +1,116 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from app.core.security import hash_password, verify_and_update_password
+
+
+# Worker processes running bcrypt; each busy worker holds one CPU core
+PASSWORD_HASH_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+
+# Callers allowed to wait for a worker before new ones are turned away
+PASSWORD_HASH_MAX_WAITING = 64
+
+# Retry-After sent with the 503 when the queue is full
+PASSWORD_HASH_RETRY_AFTER_SECONDS = 1
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a bounded process pool so hashing never blocks the event loop
+
+    A semaphore admits at most one hash per worker process; everyone else
+    waits on it, which is what the queue-time metrics measure. When more
+    than `max_waiting` callers are already queued, new ones fail fast with
+    503 so a login storm cannot build an unbounded backlog.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_waiting: int = PASSWORD_HASH_MAX_WAITING):
+        self.workers = workers
+        self.max_waiting = max_waiting
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore = asyncio.Semaphore(workers)
+        self.waiting = 0
+        self.running = 0
+        self.completed_total = 0
+        self.rejected_total = 0
+        self.total_queue_ms = 0.0
+        self.max_queue_ms = 0.0
+        self.total_hash_ms = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check a password; also returns a new hash if the stored one is outdated
+        """
+        return await self._run(verify_and_update_password, password, hashed_password)
+
+    async def _run(self, func: Callable, *args) -> Any:
+        if self.waiting >= self.max_waiting:
+            self.rejected_total += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-in attempts, please retry shortly",
+                headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)}
+            )
+
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        started_at = time.perf_counter()
+        self.running += 1
+        try:
+            # Scripts and jobs use the hasher without the app lifespan
+            self.start()
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            finished_at = time.perf_counter()
+            self.running -= 1
+            self._semaphore.release()
+
+            queue_ms = (started_at - queued_at) * 1000
+            self.completed_total += 1
+            self.total_queue_ms += queue_ms
+            self.max_queue_ms = max(self.max_queue_ms, queue_ms)
+            self.total_hash_ms += (finished_at - started_at) * 1000
+
+    def start(self) -> None:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and DB pool is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            # Boot the workers now rather than on the first login
+            for _ in range(self.workers):
+                self._executor.submit(os.getpid)
+
+    async def stop(self) -> None:
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    def stats(self) -> Dict[str, Any]:
+        completed = self.completed_total
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "waiting": self.waiting,
+            "completed_total": completed,
+            "rejected_total": self.rejected_total,
+            "avg_queue_ms": round(self.total_queue_ms / completed, 2) if completed else 0.0,
+            "max_queue_ms": round(self.max_queue_ms, 2),
+            "avg_hash_ms": round(self.total_hash_ms / completed, 2) if completed else 0.0,
+        }
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,59 @@
+from sqlalchemy.orm import load_only, defer
+from app.models.recipe import Recipe
+
+
+# Heavy JSON columns (several KB per row) that only the detail view needs
+RECIPE_CONTENT_COLUMNS = (Recipe.ingredients, Recipe.instructions, Recipe.tags)
+
+# Attributes needed to build a RecipeResponse
+RECIPE_RESPONSE_ATTRIBUTES = [
+    "id",
+    "title",
+    "description",
+    "author_id",
+    "cooking_time",
+    "servings",
+    "difficulty",
+    "dietary_preference",
+    "likes_count",
+    "saves_count",
+    "views_count",
+    "is_published",
+    "created_at",
+]
+
+
+class RecipeLoad:
+    """
+    Loader option profiles for Recipe ORM reads, one per use case
+
+    Columns outside a profile raise on access instead of silently
+    lazy-loading, so a path that needs more has to pick a wider profile.
+    """
+
+    # Feed and listing rows
+    LIST = (
+        load_only(
+            Recipe.id,
+            Recipe.author_id,
+            Recipe.video_id,
+            Recipe.title,
+            Recipe.cooking_time,
+            Recipe.difficulty,
+            Recipe.likes_count,
+            Recipe.saves_count,
+            Recipe.is_published,
+            Recipe.created_at,
+            raiseload=True
+        ),
+    )
+
+    # Ownership checks before update/delete; is_published decides whether
+    # tag counts and inboxes change with the write
+    OWNERSHIP = (load_only(Recipe.id, Recipe.author_id, Recipe.is_published, raiseload=True),)
+
+    # Everything except the heavy JSON columns
+    WITHOUT_CONTENT = tuple(defer(column, raiseload=True) for column in RECIPE_CONTENT_COLUMNS)
+
+    # Full row, content included
+    DETAIL = ()
@@ -1,13 +1,31 @@
 from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, or_, and_, tuple_, exists
 from fastapi import HTTPException, status
 from app.models.recipe import Recipe
 from app.models.user import User
 from app.models.video import Video
 from app.models.engagement import Like, Save
 from app.schemas.recipe import RecipeCreate, RecipeUpdate, RecipeDetail, RecipeList
+from app.core.pagination import decode_cursor
+from app.services.view_counter import view_counter
+from app.services.recipe_loading import RecipeLoad, RECIPE_RESPONSE_ATTRIBUTES
+from app.services.ingredient_service import IngredientService
+from app.services.tag_service import TagService
+from app.services.timeline_service import TimelineService
+from app.services.user_service import UserService
+from app.core.cache import TieredCache, create_cache_backend
+from app.core.config import settings
+
+
+# Feed pages change with every new recipe, so they get a short TTL
+RECIPE_LIST_CACHE_TTL = 30
+RECIPE_DETAIL_CACHE_TTL = min(settings.CACHE_TTL, 300)
+
+# Per-viewer RecipeDetail fields that never go into the shared cache
+VIEWER_STATE_FIELDS = {"is_liked", "is_saved"}
+
+recipe_cache = TieredCache("recipes", create_cache_backend(), max_entries=2048)
 
 
 class RecipeService:
@@ -45,11 +63,24 @@ class RecipeService:
         db.add(new_recipe)
         await db.flush()  # Flush to get the ID
         
+        # Index ingredients and tags in the same transaction
+        await IngredientService.sync_recipe(db, new_recipe.id, ingredients_dict)
+        await TagService.sync_recipe(db, new_recipe.id, recipe_data.tags or [], new_recipe.is_published)
+        
+        await UserService.adjust_recipes_count(db, author_id, 1)
+        
+        # Push into followers' following feeds
+        if new_recipe.is_published:
+            await TimelineService.fan_out(db, new_recipe.id, author_id)
+        
         # If video URL is provided, create video record
         # TODO: Implement video upload and processing
         
         await db.commit()
-        await db.refresh(new_recipe)
+        await db.refresh(new_recipe, attribute_names=RECIPE_RESPONSE_ATTRIBUTES)
+        
+        await RecipeService.invalidate_cache()
+        await RecipeService._after_write(db, new_recipe.id)
         
         return new_recipe
     
@@ -61,65 +92,174 @@ class RecipeService:
     ) -> Optional[RecipeDetail]:
         """
         Get recipe by ID with full details
+        
+        The viewer-independent part is cached. On a miss, the recipe, its
+        author, video and the viewer's like/save state come back in one
+        statement; on a hit, viewer state is one EXISTS query.
         """
-        result = await db.execute(
-            select(Recipe)
-            .options(selectinload(Recipe.author), selectinload(Recipe.video))
-            .where(Recipe.id == recipe_id)
-        )
-        recipe = result.scalar_one_or_none()
+        cached = await recipe_cache.get(f"detail:{recipe_id}")
+        if cached is None:
+            recipe_detail = await RecipeService.fetch_recipe_detail(db, recipe_id, current_user_id)
+            if not recipe_detail:
+                return None
+            await recipe_cache.set(
+                f"detail:{recipe_id}",
+                recipe_detail.model_dump(mode="json", exclude=VIEWER_STATE_FIELDS),
+                RECIPE_DETAIL_CACHE_TTL
+            )
+            return recipe_detail
         
-        if not recipe:
-            return None
+        recipe_detail = RecipeDetail(**cached)
+        
+        if current_user_id:
+            result = await db.execute(
+                select(*RecipeService._viewer_state_columns(current_user_id, recipe_id))
+            )
+            recipe_detail = recipe_detail.model_copy(update=dict(result.one()._mapping))
         
-        # Check if user liked/saved
-        is_liked = False
-        is_saved = False
+        return recipe_detail
+    
+    @staticmethod
+    async def fetch_recipe_detail(
+        db: AsyncSession,
+        recipe_id: int,
+        current_user_id: Optional[int] = None
+    ) -> Optional[RecipeDetail]:
+        """
+        Load a recipe detail from the database in a single statement
+        """
+        query = RecipeService.recipe_detail_query().where(Recipe.id == recipe_id)
         
         if current_user_id:
-            like_result = await db.execute(
-                select(Like).where(
-                    and_(Like.user_id == current_user_id, Like.recipe_id == recipe_id)
+            query = query.add_columns(
+                *RecipeService._viewer_state_columns(current_user_id, Recipe.id)
+            )
+        
+        result = await db.execute(query)
+        row = result.one_or_none()
+        
+        if not row:
+            return None
+        
+        return RecipeDetail(**row._mapping)
+    
+    @staticmethod
+    def _viewer_state_columns(user_id: int, recipe_id):
+        """
+        EXISTS columns for whether the user liked/saved the recipe
+        """
+        return (
+            exists().where(
+                and_(Like.user_id == user_id, Like.recipe_id == recipe_id)
+            ).label("is_liked"),
+            exists().where(
+                and_(Save.user_id == user_id, Save.recipe_id == recipe_id)
+            ).label("is_saved")
+        )
+    
+    @staticmethod
+    async def get_recipes_by_ids(
+        db: AsyncSession,
+        recipe_ids: List[int],
+        current_user_id: Optional[int] = None
+    ) -> List[RecipeDetail]:
+        """
+        Get full details for many recipes in a constant number of queries
+        
+        Cached details are reused, the rest are loaded in one statement, and
+        like/save state is resolved for all ids with one query each.
+        Unknown ids are skipped; results keep the requested order.
+        """
+        recipe_ids = list(dict.fromkeys(recipe_ids))
+        
+        cached = await recipe_cache.get_many([f"detail:{recipe_id}" for recipe_id in recipe_ids])
+        details = {
+            data["id"]: RecipeDetail(**data)
+            for data in cached.values()
+        }
+        
+        missing_ids = [recipe_id for recipe_id in recipe_ids if recipe_id not in details]
+        if missing_ids:
+            result = await db.execute(
+                RecipeService.recipe_detail_query().where(Recipe.id.in_(missing_ids))
+            )
+            loaded = [RecipeDetail(**row._mapping) for row in result]
+            for recipe_detail in loaded:
+                details[recipe_detail.id] = recipe_detail
+            
+            if loaded:
+                await recipe_cache.set_many(
+                    {
+                        f"detail:{recipe_detail.id}": recipe_detail.model_dump(
+                            mode="json",
+                            exclude=VIEWER_STATE_FIELDS
+                        )
+                        for recipe_detail in loaded
+                    },
+                    RECIPE_DETAIL_CACHE_TTL
+                )
+        
+        if current_user_id and details:
+            found_ids = list(details)
+            liked_result = await db.execute(
+                select(Like.recipe_id).where(
+                    and_(Like.user_id == current_user_id, Like.recipe_id.in_(found_ids))
+                )
+            )
+            liked_ids = set(liked_result.scalars().all())
+            
+            saved_result = await db.execute(
+                select(Save.recipe_id).where(
+                    and_(Save.user_id == current_user_id, Save.recipe_id.in_(found_ids))
                 )
             )
-            is_liked = like_result.scalar_one_or_none() is not None
+            saved_ids = set(saved_result.scalars().all())
             
-            save_result = await db.execute(
-                select(Save).where(
-                    and_(Save.user_id == current_user_id, Save.recipe_id == recipe_id)
+            for recipe_id, recipe_detail in details.items():
+                details[recipe_id] = recipe_detail.model_copy(
+                    update={
+                        "is_liked": recipe_id in liked_ids,
+                        "is_saved": recipe_id in saved_ids
+                    }
                 )
+        
+        return [details[recipe_id] for recipe_id in recipe_ids if recipe_id in details]
+    
+    @staticmethod
+    def recipe_detail_query():
+        """
+        Column projection for the viewer-independent part of RecipeDetail
+        """
+        return (
+            select(
+                Recipe.id,
+                Recipe.title,
+                Recipe.description,
+                Recipe.ingredients,
+                Recipe.instructions,
+                Recipe.cooking_time,
+                Recipe.servings,
+                Recipe.difficulty,
+                Recipe.dietary_preference,
+                Recipe.calories,
+                Recipe.protein,
+                Recipe.carbs,
+                Recipe.fat,
+                Recipe.tags,
+                Recipe.author_id,
+                User.username.label("author_username"),
+                User.avatar_url.label("author_avatar"),
+                Video.video_url,
+                Video.thumbnail_url,
+                Recipe.likes_count,
+                Recipe.saves_count,
+                Recipe.views_count,
+                Recipe.is_published,
+                Recipe.created_at,
+                Recipe.updated_at
             )
-            is_saved = save_result.scalar_one_or_none() is not None
-        
-        # Build response
-        return RecipeDetail(
-            id=recipe.id,
-            title=recipe.title,
-            description=recipe.description,
-            ingredients=recipe.ingredients,
-            instructions=recipe.instructions,
-            cooking_time=recipe.cooking_time,
-            servings=recipe.servings,
-            difficulty=recipe.difficulty,
-            dietary_preference=recipe.dietary_preference,
-            calories=recipe.calories,
-            protein=recipe.protein,
-            carbs=recipe.carbs,
-            fat=recipe.fat,
-            tags=recipe.tags,
-            author_id=recipe.author_id,
-            author_username=recipe.author.username,
-            author_avatar=recipe.author.avatar_url,
-            video_url=recipe.video.video_url if recipe.video else None,
-            thumbnail_url=recipe.video.thumbnail_url if recipe.video else None,
-            likes_count=recipe.likes_count,
-            saves_count=recipe.saves_count,
-            views_count=recipe.views_count,
-            is_liked=is_liked,
-            is_saved=is_saved,
-            is_published=recipe.is_published,
-            created_at=recipe.created_at,
-            updated_at=recipe.updated_at
+            .join(User, User.id == Recipe.author_id)
+            .outerjoin(Video, Video.id == Recipe.video_id)
         )
     
     @staticmethod
@@ -130,6 +270,9 @@ class RecipeService:
     ) -> Recipe:
         """
         Update recipe
+        
+        The recipe may be loaded with the ownership profile; only the
+        RecipeResponse attributes are refreshed afterwards.
         """
         # Update fields if provided
         if recipe_data.title is not None:
@@ -138,6 +281,7 @@ class RecipeService:
             recipe.description = recipe_data.description
         if recipe_data.ingredients is not None:
             recipe.ingredients = [ing.dict() for ing in recipe_data.ingredients]
+            await IngredientService.sync_recipe(db, recipe.id, recipe.ingredients)
         if recipe_data.instructions is not None:
             recipe.instructions = [inst.dict() for inst in recipe_data.instructions]
         if recipe_data.cooking_time is not None:
@@ -150,11 +294,21 @@ class RecipeService:
             recipe.dietary_preference = recipe_data.dietary_preference
         if recipe_data.tags is not None:
             recipe.tags = recipe_data.tags
-        if recipe_data.is_published is not None:
+            await TagService.sync_recipe(db, recipe.id, recipe.tags, recipe.is_published)
+        if recipe_data.is_published is not None and recipe_data.is_published != recipe.is_published:
             recipe.is_published = recipe_data.is_published
+            await TagService.set_published(db, recipe.id, recipe.is_published)
+            # Publishing pushes into followers' feeds; unpublishing takes it back out
+            if recipe.is_published:
+                await TimelineService.fan_out(db, recipe.id, recipe.author_id)
+            else:
+                await TimelineService.remove_recipe(db, recipe.id)
         
         await db.commit()
-        await db.refresh(recipe)
+        await db.refresh(recipe, attribute_names=RECIPE_RESPONSE_ATTRIBUTES)
+        
+        await RecipeService.invalidate_cache(recipe.id)
+        await RecipeService._after_write(db, recipe.id)
         
         return recipe
     
@@ -163,41 +317,165 @@ class RecipeService:
         """
         Delete recipe
         """
+        recipe_id = recipe.id
+        await TagService.remove_recipe(db, recipe_id, recipe.is_published)
+        await TimelineService.remove_recipe(db, recipe_id)
+        await UserService.adjust_recipes_count(db, recipe.author_id, -1)
         await db.delete(recipe)
         await db.commit()
+        
+        await RecipeService.invalidate_cache(recipe_id)
+        await RecipeService._after_delete(db, recipe_id)
         return True
     
+    @staticmethod
+    async def _after_write(db: AsyncSession, recipe_id: int) -> None:
+        """
+        Keep derived indexes in sync after a recipe is created or updated
+        """
+        from app.services.search_service import SearchService
+        from app.services.content_index import content_index
+        
+        await SearchService.index_recipe(db, recipe_id)
+        await content_index.index_recipe(db, recipe_id)
+    
+    @staticmethod
+    async def _after_delete(db: AsyncSession, recipe_id: int) -> None:
+        """
+        Drop a deleted recipe from derived indexes
+        """
+        from app.services.search_service import SearchService
+        from app.services.content_index import content_index
+        
+        SearchService.remove_recipe(recipe_id)
+        content_index.remove(recipe_id)
+    
+    @staticmethod
+    async def invalidate_cache(recipe_id: Optional[int] = None) -> None:
+        """
+        Drop cached feed pages and, if given, the cached detail of a recipe
+        """
+        await recipe_cache.invalidate_group("list")
+        if recipe_id is not None:
+            await recipe_cache.invalidate(f"detail:{recipe_id}")
+    
     @staticmethod
     async def get_recipes(
         db: AsyncSession,
         skip: int = 0,
         limit: int = 10,
-        author_id: Optional[int] = None
+        author_id: Optional[int] = None,
+        cursor: Optional[str] = None
     ) -> List[Recipe]:
         """
         Get list of recipes with pagination
+        
+        Rows are loaded with the list profile (no ingredients, instructions
+        or tags). When a cursor is given, paginates by keyset on (created_at, id)
+        and ignores skip, so deep pages cost the same as the first one.
         """
-        query = select(Recipe).where(Recipe.is_published == True)
+        query = select(Recipe).options(*RecipeLoad.LIST).where(Recipe.is_published == True)
         
         if author_id:
             query = query.where(Recipe.author_id == author_id)
         
-        query = query.offset(skip).limit(limit).order_by(Recipe.created_at.desc())
+        query = RecipeService._paginate(query, skip, limit, cursor)
         
         result = await db.execute(query)
         return result.scalars().all()
     
     @staticmethod
-    async def increment_view_count(db: AsyncSession, recipe_id: int) -> bool:
+    async def get_recipe_for_write(db: AsyncSession, recipe_id: int) -> Optional[Recipe]:
         """
-        Increment recipe view count
+        Get recipe for an ownership check before update or delete
+        
+        Loads only id, author_id and is_published, skipping the heavy JSON columns.
+        """
+        result = await db.execute(
+            select(Recipe).options(*RecipeLoad.OWNERSHIP).where(Recipe.id == recipe_id)
+        )
+        return result.scalar_one_or_none()
+    
+    @staticmethod
+    async def get_recipe_list(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 10,
+        author_id: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[RecipeList]:
         """
-        result = await db.execute(select(Recipe).where(Recipe.id == recipe_id))
-        recipe = result.scalar_one_or_none()
+        Get a page of recipe summaries in a single statement
         
-        if recipe:
-            recipe.views_count += 1
-            await db.commit()
-            return True
+        Selects only the RecipeList columns, with the author username and
+        video thumbnail joined in, instead of hydrating full Recipe rows.
+        Pages are cached briefly and dropped on any recipe write.
+        """
+        generation = await recipe_cache.generation("list")
+        cache_key = f"list:v{generation}:{author_id or 'all'}:{skip}:{limit}:{cursor or ''}"
+        cached = await recipe_cache.get(cache_key)
+        if cached is not None:
+            return [RecipeList(**item) for item in cached]
+        
+        query = RecipeService.recipe_list_query().where(Recipe.is_published == True)
+        
+        if author_id:
+            query = query.where(Recipe.author_id == author_id)
+        
+        query = RecipeService._paginate(query, skip, limit, cursor)
+        
+        result = await db.execute(query)
+        recipes = [RecipeList(**row._mapping) for row in result]
         
-        return False
\ No newline at end of file
+        await recipe_cache.set(
+            cache_key,
+            [recipe.model_dump(mode="json") for recipe in recipes],
+            RECIPE_LIST_CACHE_TTL
+        )
+        return recipes
+    
+    @staticmethod
+    def recipe_list_query():
+        """
+        Base column projection for RecipeList responses
+        """
+        return (
+            select(
+                Recipe.id,
+                Recipe.title,
+                Video.thumbnail_url,
+                Recipe.cooking_time,
+                Recipe.difficulty,
+                Recipe.likes_count,
+                Recipe.saves_count,
+                Recipe.author_id,
+                User.username.label("author_username"),
+                Recipe.created_at
+            )
+            .join(User, User.id == Recipe.author_id)
+            .outerjoin(Video, Video.id == Recipe.video_id)
+        )
+    
+    @staticmethod
+    def _paginate(query, skip: int, limit: int, cursor: Optional[str]):
+        """
+        Apply newest-first ordering with keyset or offset pagination
+        """
+        if cursor:
+            created_at, recipe_id = decode_cursor(cursor)
+            query = query.where(
+                tuple_(Recipe.created_at, Recipe.id) < tuple_(created_at, recipe_id)
+            )
+        elif skip:
+            query = query.offset(skip)
+        
+        return query.order_by(Recipe.created_at.desc(), Recipe.id.desc()).limit(limit)
+    
+    @staticmethod
+    def increment_view_count(recipe_id: int) -> None:
+        """
+        Increment recipe view count
+        
+        Views are buffered and written in periodic batches by the view counter.
+        """
+        view_counter.record(recipe_id)
\ No newline at end of file
@@ -0,0 +1,299 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, union_all
+from app.models.recipe import Recipe, DifficultyLevel, DietaryPreference
+from app.models.engagement import Like, Save
+from app.models.recommendation import RecommendationWeight, RecipeNeighbor
+from app.schemas.recipe import RecipeList
+from app.services.recipe_service import RecipeService
+from app.services.seen_set_service import seen_set
+from app.services.follow_graph import follow_graph
+from app.services.content_index import content_index
+
+
+# Most recent published recipes considered for ranking
+CANDIDATE_POOL_SIZE = 5000
+
+# Seconds the shared candidate pool is reused before reloading
+CANDIDATE_POOL_TTL = 30
+
+# Recency score halves every this many hours
+RECENCY_HALF_LIFE_HOURS = 48.0
+
+# Views added to the denominator so new recipes don't get extreme rates
+ENGAGEMENT_PRIOR_VIEWS = 20.0
+
+# Recent likes and saves averaged into a user's content profile
+CONTENT_PROFILE_SIZE = 50
+
+# Relative weight of each score component
+SCORE_WEIGHTS = {
+    "recency": 1.0,
+    "engagement": 0.8,
+    "affinity": 0.6,
+    "following": 0.5,
+    "content": 0.7,
+}
+
+DIFFICULTY_LEVELS = list(DifficultyLevel)
+DIETARY_PREFERENCES = list(DietaryPreference)
+
+
+@dataclass
+class CandidatePool:
+    """
+    Column arrays of the candidate recipes, one entry per recipe
+    """
+    ids: np.ndarray
+    author_ids: np.ndarray
+    created_at: np.ndarray  # POSIX seconds
+    likes: np.ndarray
+    saves: np.ndarray
+    views: np.ndarray
+    difficulty: np.ndarray  # index into DIFFICULTY_LEVELS
+    dietary: np.ndarray  # index into DIETARY_PREFERENCES
+    loaded_at: float
+
+
+class FeedRanker:
+    """
+    Vectorized scoring of a candidate pool for one user
+    """
+
+    @staticmethod
+    def score(
+        pool: CandidatePool,
+        weights: Dict[str, float],
+        followed_author_ids: np.ndarray,
+        now: float,
+        content: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Score all candidates in one batched pass
+        
+        `content` is each candidate's text similarity to what the user
+        liked and saved; it is what lets brand-new recipes with no
+        engagement yet reach the users they suit.
+        """
+        age_hours = np.maximum(now - pool.created_at, 0.0) / 3600.0
+        recency = np.exp2(-age_hours / RECENCY_HALF_LIFE_HOURS)
+
+        engagement = (pool.likes + 2.0 * pool.saves) / (pool.views + ENGAGEMENT_PRIOR_VIEWS)
+        engagement = np.log1p(engagement)
+        peak = engagement.max() if engagement.size else 0.0
+        if peak > 0:
+            engagement /= peak
+
+        difficulty_weights = np.array(
+            [weights.get(f"difficulty:{level.value}", 0.0) for level in DIFFICULTY_LEVELS]
+        )
+        dietary_weights = np.array(
+            [weights.get(f"dietary_preference:{pref.value}", 0.0) for pref in DIETARY_PREFERENCES]
+        )
+        affinity = np.tanh(difficulty_weights[pool.difficulty] + dietary_weights[pool.dietary])
+
+        following = np.isin(pool.author_ids, followed_author_ids).astype(np.float64)
+
+        scores = (
+            SCORE_WEIGHTS["recency"] * recency
+            + SCORE_WEIGHTS["engagement"] * engagement
+            + SCORE_WEIGHTS["affinity"] * affinity
+            + SCORE_WEIGHTS["following"] * following
+        )
+        if content is not None:
+            scores += SCORE_WEIGHTS["content"] * np.maximum(content, 0.0)
+        return scores
+
+    @staticmethod
+    def top_k(scores: np.ndarray, mask: np.ndarray, k: int) -> np.ndarray:
+        """
+        Indices of the k best eligible candidates, best first (partial sort)
+        """
+        eligible = np.flatnonzero(mask)
+        if k <= 0 or eligible.size == 0:
+            return eligible[:0]
+
+        eligible_scores = scores[eligible]
+        if k < eligible.size:
+            best = np.argpartition(-eligible_scores, k - 1)[:k]
+        else:
+            best = np.arange(eligible.size)
+
+        return eligible[best[np.argsort(-eligible_scores[best], kind="stable")]]
+
+
+class RecommendationService:
+    """
+    Personalized feed ranking
+    """
+
+    _pool: Optional[CandidatePool] = None
+    _pool_lock = asyncio.Lock()
+
+    @staticmethod
+    async def get_personalized_feed(
+        db: AsyncSession,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        exclude_seen: bool = True
+    ) -> List[RecipeList]:
+        """
+        Rank recent recipes for a user and return one page
+        """
+        pool = await RecommendationService._get_candidate_pool(db)
+        if pool.ids.size == 0:
+            return []
+
+        weights = await RecommendationService._get_weights(db, user_id)
+        followed = await RecommendationService._get_followed_author_ids(db, user_id)
+        content = await RecommendationService._get_content_scores(db, user_id, pool)
+
+        scores = FeedRanker.score(pool, weights, followed, time.time(), content)
+
+        mask = pool.author_ids != user_id
+        if exclude_seen:
+            mask &= ~await seen_set.seen_mask(db, user_id, pool.ids)
+
+        ranked = FeedRanker.top_k(scores, mask, skip + limit)[skip:]
+        page_ids = pool.ids[ranked].tolist()
+
+        if not page_ids:
+            return []
+
+        # The pool is reused for a while, so recipes unpublished since it
+        # was built are dropped here
+        result = await db.execute(
+            RecipeService.recipe_list_query()
+            .where(Recipe.id.in_(page_ids), Recipe.is_published == True)
+        )
+        recipes = {row.id: RecipeList(**row._mapping) for row in result}
+        return [recipes[recipe_id] for recipe_id in page_ids if recipe_id in recipes]
+
+    @staticmethod
+    async def get_similar_recipes(db: AsyncSession, recipe_id: int, limit: int = 10) -> List[RecipeList]:
+        """
+        Recipes similar to a recipe, most similar first
+        
+        Precomputed item-item neighbors (one primary-key range of
+        recipe_neighbors, see app.jobs.build_recipe_neighbors) come first.
+        Recipes without enough engagement for that are topped up from the
+        in-memory content index.
+        """
+        result = await db.execute(
+            select(RecipeNeighbor.neighbor_id)
+            .where(RecipeNeighbor.recipe_id == recipe_id)
+            .order_by(RecipeNeighbor.rank)
+            .limit(limit)
+        )
+        similar_ids = list(result.scalars().all())
+
+        if len(similar_ids) < limit:
+            # Ask for a few extra in case some are unpublished
+            similar_ids += content_index.similar(recipe_id, 2 * limit - len(similar_ids), exclude=similar_ids)
+
+        if not similar_ids:
+            return []
+
+        result = await db.execute(
+            RecipeService.recipe_list_query()
+            .where(Recipe.id.in_(similar_ids), Recipe.is_published == True)
+        )
+        recipes = {row.id: RecipeList(**row._mapping) for row in result}
+        return [recipes[similar_id] for similar_id in similar_ids if similar_id in recipes][:limit]
+
+    @staticmethod
+    async def _get_candidate_pool(db: AsyncSession) -> CandidatePool:
+        """
+        Load the shared candidate pool, reusing it for CANDIDATE_POOL_TTL seconds
+        """
+        pool = RecommendationService._pool
+        if pool and time.monotonic() - pool.loaded_at < CANDIDATE_POOL_TTL:
+            return pool
+
+        async with RecommendationService._pool_lock:
+            pool = RecommendationService._pool
+            if pool and time.monotonic() - pool.loaded_at < CANDIDATE_POOL_TTL:
+                return pool
+
+            result = await db.execute(
+                select(
+                    Recipe.id,
+                    Recipe.author_id,
+                    Recipe.created_at,
+                    Recipe.likes_count,
+                    Recipe.saves_count,
+                    Recipe.views_count,
+                    Recipe.difficulty,
+                    Recipe.dietary_preference
+                )
+                .where(Recipe.is_published == True)
+                .order_by(Recipe.created_at.desc(), Recipe.id.desc())
+                .limit(CANDIDATE_POOL_SIZE)
+            )
+            rows = result.all()
+
+            difficulty_index = {level: i for i, level in enumerate(DIFFICULTY_LEVELS)}
+            dietary_index = {pref: i for i, pref in enumerate(DIETARY_PREFERENCES)}
+
+            pool = CandidatePool(
+                ids=np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows)),
+                author_ids=np.fromiter((row.author_id for row in rows), dtype=np.int64, count=len(rows)),
+                created_at=np.fromiter(
+                    (row.created_at.timestamp() for row in rows), dtype=np.float64, count=len(rows)
+                ),
+                likes=np.fromiter((row.likes_count for row in rows), dtype=np.float64, count=len(rows)),
+                saves=np.fromiter((row.saves_count for row in rows), dtype=np.float64, count=len(rows)),
+                views=np.fromiter((row.views_count for row in rows), dtype=np.float64, count=len(rows)),
+                difficulty=np.fromiter(
+                    (difficulty_index[row.difficulty] for row in rows), dtype=np.int64, count=len(rows)
+                ),
+                dietary=np.fromiter(
+                    (dietary_index[row.dietary_preference] for row in rows), dtype=np.int64, count=len(rows)
+                ),
+                loaded_at=time.monotonic()
+            )
+            RecommendationService._pool = pool
+            return pool
+
+    @staticmethod
+    async def _get_weights(db: AsyncSession, user_id: int) -> Dict[str, float]:
+        result = await db.execute(
+            select(RecommendationWeight.feature, RecommendationWeight.weight)
+            .where(RecommendationWeight.user_id == user_id)
+        )
+        return {feature: weight for feature, weight in result}
+
+    @staticmethod
+    async def _get_followed_author_ids(db: AsyncSession, user_id: int) -> np.ndarray:
+        following = await follow_graph.get_following_ids(db, user_id)
+        return following.astype(np.int64)
+
+    @staticmethod
+    async def _get_content_scores(db: AsyncSession, user_id: int, pool: CandidatePool) -> Optional[np.ndarray]:
+        """
+        Similarity of each candidate to the user's recent likes and saves
+        """
+        if len(content_index) == 0:
+            return None
+
+        recent = union_all(
+            select(Like.recipe_id)
+            .where(Like.user_id == user_id)
+            .order_by(Like.created_at.desc())
+            .limit(CONTENT_PROFILE_SIZE),
+            select(Save.recipe_id)
+            .where(Save.user_id == user_id)
+            .order_by(Save.created_at.desc())
+            .limit(CONTENT_PROFILE_SIZE)
+        )
+        result = await db.execute(recent)
+        profile = content_index.profile(result.scalars().all())
+        if profile is None:
+            return None
+
+        return content_index.scores_for(pool.ids, profile)
@@ -0,0 +1,428 @@
+import os
+import re
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, cast, literal, union_all, String
+from app.models.recipe import Recipe, DifficultyLevel as ModelDifficulty, DietaryPreference as ModelDietary
+from app.models.tag import Tag, RecipeTag
+from app.schemas.recipe import RecipeList, RecipeSearchFilters, SearchFacets, FacetCount
+from app.services.recipe_service import RecipeService
+from app.services.ingredient_service import IngredientService
+from app.services.tag_service import TagService
+from app.core.config import settings
+
+
+# Text search configuration used by the search_vector trigger
+SEARCH_CONFIG = "english"
+
+# Where recipe search runs:
+#   "postgres" - full-text search over recipes.search_vector
+#   "memory"   - an inverted index kept in each worker's process; fine for
+#                tests and single-worker deployments with a small catalogue
+# Set with the SEARCH_BACKEND environment variable; defaults to "memory"
+# under testing and "postgres" everywhere else
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND") or (
+    "memory" if settings.ENVIRONMENT == "testing" else "postgres"
+)
+
+SEARCH_BACKENDS = ("postgres", "memory")
+
+# Field weights for the in-memory backend, mirroring the A-D tsvector weights
+FIELD_WEIGHTS = {"title": 1.0, "tags": 0.4, "ingredients": 0.2, "description": 0.1}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Lowercase alphanumeric tokens of a text
+    """
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class SearchBackend(ABC):
+    """
+    Recipe search backend interface
+    """
+
+    @abstractmethod
+    async def search(
+        self,
+        db: AsyncSession,
+        filters: RecipeSearchFilters,
+        skip: int,
+        limit: int
+    ) -> List[RecipeList]:
+        ...
+
+    @abstractmethod
+    async def facets(
+        self,
+        db: AsyncSession,
+        filters: RecipeSearchFilters,
+        tag_limit: int
+    ) -> SearchFacets:
+        """
+        Tag, difficulty and dietary counts over the recipes matching the filters
+        """
+
+    async def index(self, db: AsyncSession, recipe_id: int) -> None:
+        """
+        Add or replace a recipe in the index
+        """
+
+    def remove(self, recipe_id: int) -> None:
+        """
+        Remove a recipe from the index
+        """
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """
+        Rebuild the index from the database
+        """
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Full-text search over the GIN-indexed recipes.search_vector
+
+    Ranking and all filters run in one statement. The vector is maintained
+    by a database trigger, so index/remove are no-ops.
+    """
+
+    async def search(
+        self,
+        db: AsyncSession,
+        filters: RecipeSearchFilters,
+        skip: int,
+        limit: int
+    ) -> List[RecipeList]:
+        query = RecipeService.recipe_list_query()
+        query = self.apply_filters(query, filters)
+
+        if filters.query:
+            ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, filters.query)
+            query = query.order_by(
+                func.ts_rank_cd(Recipe.search_vector, ts_query).desc(),
+                Recipe.id.desc()
+            )
+        else:
+            query = query.order_by(Recipe.created_at.desc(), Recipe.id.desc())
+
+        result = await db.execute(query.offset(skip).limit(limit))
+        return [RecipeList(**row._mapping) for row in result]
+
+    async def facets(
+        self,
+        db: AsyncSession,
+        filters: RecipeSearchFilters,
+        tag_limit: int
+    ) -> SearchFacets:
+        filtered = self.apply_filters(
+            select(Recipe.id, Recipe.difficulty, Recipe.dietary_preference),
+            filters
+        ).cte("filtered")
+
+        difficulty_counts = select(
+            literal("difficulty").label("facet"),
+            cast(filtered.c.difficulty, String).label("value"),
+            func.count().label("count")
+        ).group_by(filtered.c.difficulty)
+
+        dietary_counts = select(
+            literal("dietary_preference").label("facet"),
+            cast(filtered.c.dietary_preference, String).label("value"),
+            func.count().label("count")
+        ).group_by(filtered.c.dietary_preference)
+
+        tag_counts = (
+            select(
+                literal("tags").label("facet"),
+                Tag.name.label("value"),
+                func.count().label("count")
+            )
+            .select_from(filtered)
+            .join(RecipeTag, RecipeTag.recipe_id == filtered.c.id)
+            .join(Tag, Tag.id == RecipeTag.tag_id)
+            .group_by(Tag.name)
+            .order_by(func.count().desc(), Tag.name)
+            .limit(tag_limit)
+            .subquery()
+        )
+
+        result = await db.execute(
+            union_all(difficulty_counts, dietary_counts, select(tag_counts))
+        )
+
+        facets = {"tags": [], "difficulty": [], "dietary_preference": []}
+        for facet, value, count in result:
+            # Enum columns store member names; report the API values
+            if facet == "difficulty":
+                value = ModelDifficulty[value].value
+            elif facet == "dietary_preference":
+                value = ModelDietary[value].value
+            facets[facet].append(FacetCount(value=value, count=count))
+
+        for counts in facets.values():
+            counts.sort(key=lambda facet_count: (-facet_count.count, facet_count.value))
+        return SearchFacets(**facets)
+
+    @staticmethod
+    def apply_filters(query, filters: RecipeSearchFilters):
+        """
+        Restrict a recipes query to published recipes matching the filters
+        """
+        query = query.where(Recipe.is_published == True)
+
+        if filters.query:
+            ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, filters.query)
+            query = query.where(Recipe.search_vector.op("@@")(ts_query))
+        if filters.difficulty:
+            query = query.where(Recipe.difficulty == filters.difficulty)
+        if filters.dietary_preference:
+            query = query.where(Recipe.dietary_preference == filters.dietary_preference)
+        if filters.max_cooking_time:
+            query = query.where(Recipe.cooking_time <= filters.max_cooking_time)
+        if filters.tags and TagService.normalize_all(filters.tags):
+            # Served from the indexed tag associations
+            query = query.where(Recipe.id.in_(TagService.recipes_with_tags(filters.tags)))
+        if filters.ingredient:
+            # Served from the ingredient posting lists
+            query = query.where(
+                Recipe.id.in_(IngredientService.recipes_with_ingredient(filters.ingredient))
+            )
+        return query
+
+
+class InMemorySearchBackend(SearchBackend):
+    """
+    Inverted-index search kept in process, for tests and small deployments
+
+    Postings map a token to per-recipe scores; filters are checked against
+    a small per-recipe metadata record. Results are hydrated in one query.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._tokens: Dict[int, Set[str]] = {}
+        self._documents: Dict[int, dict] = {}
+
+    async def index(self, db: AsyncSession, recipe_id: int) -> None:
+        result = await db.execute(select(Recipe).where(Recipe.id == recipe_id))
+        recipe = result.scalar_one_or_none()
+
+        self.remove(recipe_id)
+        if recipe:
+            self._add(recipe)
+
+    def _add(self, recipe: Recipe) -> None:
+        if not recipe.is_published:
+            return
+
+        ingredient_names = [item.get("name", "") for item in recipe.ingredients or []]
+        fields = {
+            "title": tokenize(recipe.title),
+            "tags": [token for tag in recipe.tags or [] for token in tokenize(tag)],
+            "ingredients": [token for name in ingredient_names for token in tokenize(name)],
+            "description": tokenize(recipe.description),
+        }
+
+        scores: Dict[str, float] = defaultdict(float)
+        for field, tokens in fields.items():
+            for token in tokens:
+                scores[token] += FIELD_WEIGHTS[field]
+
+        for token, score in scores.items():
+            self._postings[token][recipe.id] = score
+
+        self._tokens[recipe.id] = set(scores)
+        self._documents[recipe.id] = {
+            "difficulty": recipe.difficulty,
+            "dietary_preference": recipe.dietary_preference,
+            "cooking_time": recipe.cooking_time,
+            "tags": set(TagService.normalize_all(recipe.tags or [])),
+            "ingredients": set(IngredientService.normalize_all(ingredient_names)),
+            "created_at": recipe.created_at,
+        }
+
+    def remove(self, recipe_id: int) -> None:
+        for token in self._tokens.pop(recipe_id, ()):
+            postings = self._postings[token]
+            postings.pop(recipe_id, None)
+            if not postings:
+                del self._postings[token]
+        self._documents.pop(recipe_id, None)
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        self._postings.clear()
+        self._tokens.clear()
+        self._documents.clear()
+
+        result = await db.stream_scalars(select(Recipe).where(Recipe.is_published == True))
+        async for recipe in result:
+            self._add(recipe)
+
+    async def search(
+        self,
+        db: AsyncSession,
+        filters: RecipeSearchFilters,
+        skip: int,
+        limit: int
+    ) -> List[RecipeList]:
+        scores = self._matching(filters)
+        matches = list(scores)
+        matches.sort(
+            key=lambda recipe_id: (scores[recipe_id], self._documents[recipe_id]["created_at"], recipe_id),
+            reverse=True
+        )
+        page_ids = matches[skip:skip + limit]
+
+        if not page_ids:
+            return []
+
+        result = await db.execute(
+            RecipeService.recipe_list_query().where(Recipe.id.in_(page_ids))
+        )
+        recipes = {row.id: RecipeList(**row._mapping) for row in result}
+        return [recipes[recipe_id] for recipe_id in page_ids if recipe_id in recipes]
+
+    async def facets(
+        self,
+        db: AsyncSession,
+        filters: RecipeSearchFilters,
+        tag_limit: int
+    ) -> SearchFacets:
+        counts = {
+            "tags": defaultdict(int),
+            "difficulty": defaultdict(int),
+            "dietary_preference": defaultdict(int),
+        }
+        for recipe_id in self._matching(filters):
+            document = self._documents[recipe_id]
+            counts["difficulty"][document["difficulty"].value] += 1
+            counts["dietary_preference"][document["dietary_preference"].value] += 1
+            for tag in document["tags"]:
+                counts["tags"][tag] += 1
+
+        facets = {
+            facet: sorted(
+                (FacetCount(value=value, count=count) for value, count in values.items()),
+                key=lambda facet_count: (-facet_count.count, facet_count.value)
+            )
+            for facet, values in counts.items()
+        }
+        facets["tags"] = facets["tags"][:tag_limit]
+        return SearchFacets(**facets)
+
+    def _matching(self, filters: RecipeSearchFilters) -> Dict[int, float]:
+        """
+        Scores of all indexed recipes that match the query and filters
+        """
+        if filters.query:
+            scores = self._score(tokenize(filters.query))
+        else:
+            scores = {recipe_id: 0.0 for recipe_id in self._documents}
+
+        return {
+            recipe_id: score for recipe_id, score in scores.items()
+            if self._matches(self._documents[recipe_id], filters)
+        }
+
+    def _score(self, tokens: Iterable[str]) -> Dict[int, float]:
+        """
+        Intersect the postings of all query tokens, summing their scores
+        """
+        postings = sorted(
+            (self._postings.get(token, {}) for token in set(tokens)),
+            key=len
+        )
+        if not postings or not postings[0]:
+            return {}
+
+        scores = dict(postings[0])
+        for posting in postings[1:]:
+            scores = {
+                recipe_id: score + posting[recipe_id]
+                for recipe_id, score in scores.items()
+                if recipe_id in posting
+            }
+        return scores
+
+    @staticmethod
+    def _matches(document: dict, filters: RecipeSearchFilters) -> bool:
+        if filters.difficulty and document["difficulty"] != filters.difficulty:
+            return False
+        if filters.dietary_preference and document["dietary_preference"] != filters.dietary_preference:
+            return False
+        if filters.max_cooking_time and document["cooking_time"] > filters.max_cooking_time:
+            return False
+        if filters.tags and not set(TagService.normalize_all(filters.tags)) <= document["tags"]:
+            return False
+        if filters.ingredient:
+            query = IngredientService.normalize(filters.ingredient)
+            if not any(IngredientService.matches(name, query) for name in document["ingredients"]):
+                return False
+        return True
+
+
+def create_search_backend(name: str = SEARCH_BACKEND) -> SearchBackend:
+    """
+    Search backend selected by SEARCH_BACKEND
+    """
+    if name not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown search backend: {name}")
+    return InMemorySearchBackend() if name == "memory" else PostgresSearchBackend()
+
+
+class SearchService:
+    """
+    Recipe search service
+    """
+
+    backend: SearchBackend = create_search_backend()
+
+    @staticmethod
+    async def search_recipes(
+        db: AsyncSession,
+        filters: RecipeSearchFilters,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[RecipeList]:
+        """
+        Search published recipes by text and filters, best matches first
+        """
+        return await SearchService.backend.search(db, filters, skip, limit)
+
+    @staticmethod
+    async def get_facets(
+        db: AsyncSession,
+        filters: RecipeSearchFilters,
+        tag_limit: int = 20
+    ) -> SearchFacets:
+        """
+        Facet counts for a filter sidebar, computed in one pass
+        """
+        return await SearchService.backend.facets(db, filters, tag_limit)
+
+    @staticmethod
+    async def rebuild_index(db: AsyncSession) -> None:
+        """
+        Rebuild the search index (no-op for the Postgres backend)
+        """
+        await SearchService.backend.rebuild(db)
+
+    @staticmethod
+    async def index_recipe(db: AsyncSession, recipe_id: int) -> None:
+        """
+        Update the search index after a recipe write
+        """
+        await SearchService.backend.index(db, recipe_id)
+
+    @staticmethod
+    def remove_recipe(recipe_id: int) -> None:
+        """
+        Remove a deleted recipe from the search index
+        """
+        SearchService.backend.remove(recipe_id)
@@ -0,0 +1,203 @@
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.bloom import RotatingBloomFilter
+from app.core.tasks import PeriodicTask
+from app.database.session import AsyncSessionLocal
+from app.models.recommendation import UserSeenFilter
+
+
+# Target false-positive rate across all generations of a user's filter;
+# a false positive hides an unseen recipe from the feed. Applies to every
+# generation created after a change, including in existing users' filters
+SEEN_FILTER_ERROR_RATE = 0.01
+
+# Views per generation the Bloom filter is sized for (~8 KB at 1%)
+SEEN_FILTER_CAPACITY = 5000
+
+# Generations with up to this many views are kept as exact sorted id
+# arrays (8 bytes per view, no false positives) and only converted to a
+# Bloom filter past it, where the array would outgrow the filter
+SEEN_FILTER_EXACT_LIMIT = 1000
+
+# Length of one generation; views older than all generations age out
+SEEN_FILTER_PERIOD_SECONDS = 30 * 24 * 3600
+SEEN_FILTER_GENERATIONS = 6
+
+# Users whose filters are kept in memory, and how long a copy is trusted
+# before it is reloaded to pick up views recorded by other workers
+SEEN_FILTER_CACHE_SIZE = 10000
+SEEN_FILTER_CACHE_TTL = 60
+
+# Seconds between flushes of newly seen recipe ids to the database
+SEEN_FLUSH_INTERVAL_SECONDS = 10.0
+
+
+def new_seen_filter() -> RotatingBloomFilter:
+    return RotatingBloomFilter(
+        SEEN_FILTER_CAPACITY,
+        SEEN_FILTER_ERROR_RATE,
+        SEEN_FILTER_PERIOD_SECONDS,
+        SEEN_FILTER_GENERATIONS,
+        SEEN_FILTER_EXACT_LIMIT
+    )
+
+
+def load_seen_filter(data: Optional[bytes]) -> RotatingBloomFilter:
+    """
+    Stored filter under the current settings
+
+    Stored generations keep their shape; new ones follow the constants above.
+    """
+    seen_filter = new_seen_filter()
+    if data:
+        seen_filter.merge(RotatingBloomFilter.from_bytes(data))
+    return seen_filter
+
+
+class SeenSet:
+    """
+    Per-user rotating filters of viewed recipe ids
+
+    Most users view few recipes per generation, so their filters are exact
+    id arrays of a few hundred bytes; only heavy viewers reach Bloom filters.
+
+    Views are added to the cached filter right away and buffered per user;
+    each flush ORs the buffered ids into the stored filters under a row
+    lock, so concurrent workers never overwrite each other's views.
+    """
+
+    def __init__(self):
+        self._filters: "OrderedDict[int, Tuple[RotatingBloomFilter, float]]" = OrderedDict()
+        self._pending: Dict[int, List[int]] = defaultdict(list)
+        self._task = PeriodicTask("seen-set-flush", self.flush, SEEN_FLUSH_INTERVAL_SECONDS)
+        self.marked_total = 0
+        self.flushed_total = 0
+        self.loads = 0
+        self.failed_flushes = 0
+
+    def mark_seen(self, user_id: int, recipe_id: int) -> None:
+        """
+        Record that a user viewed a recipe
+        """
+        self._pending[user_id].append(recipe_id)
+        self.marked_total += 1
+
+        cached = self._filters.get(user_id)
+        if cached:
+            cached[0].add_many((recipe_id,), time.time())
+
+    async def get_filter(self, db: AsyncSession, user_id: int) -> RotatingBloomFilter:
+        """
+        User's seen filter, loaded from the database on a miss
+        """
+        cached = self._filters.get(user_id)
+        if cached and time.monotonic() - cached[1] < SEEN_FILTER_CACHE_TTL:
+            self._filters.move_to_end(user_id)
+            return cached[0]
+
+        result = await db.execute(
+            select(UserSeenFilter.data).where(UserSeenFilter.user_id == user_id)
+        )
+        data = result.scalar_one_or_none()
+        seen_filter = load_seen_filter(data)
+        self.loads += 1
+
+        # Views recorded here but not flushed yet
+        pending = self._pending.get(user_id)
+        if pending:
+            seen_filter.add_many(pending, time.time())
+
+        self._filters[user_id] = (seen_filter, time.monotonic())
+        self._filters.move_to_end(user_id)
+        while len(self._filters) > SEEN_FILTER_CACHE_SIZE:
+            self._filters.popitem(last=False)
+
+        return seen_filter
+
+    async def seen_mask(self, db: AsyncSession, user_id: int, recipe_ids: np.ndarray) -> np.ndarray:
+        """
+        Boolean array: True where the user has (probably) viewed the recipe
+        """
+        seen_filter = await self.get_filter(db, user_id)
+        return seen_filter.contains_many(recipe_ids, time.time())
+
+    async def flush(self) -> int:
+        """
+        Merge buffered views into the stored filters
+        """
+        if not self._pending:
+            return 0
+
+        pending, self._pending = dict(self._pending), defaultdict(list)
+
+        try:
+            await self._apply(pending)
+        except Exception:
+            # Hand the views back so the next flush retries them
+            self.failed_flushes += 1
+            for user_id, recipe_ids in pending.items():
+                self._pending[user_id][:0] = recipe_ids
+            raise
+
+        flushed = sum(len(recipe_ids) for recipe_ids in pending.values())
+        self.flushed_total += flushed
+        return flushed
+
+    async def _apply(self, pending: Dict[int, List[int]]) -> None:
+        now = time.time()
+        # Sorted ids keep lock order consistent between concurrent flushers
+        user_ids = sorted(pending)
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(UserSeenFilter.user_id, UserSeenFilter.data)
+                .where(UserSeenFilter.user_id.in_(user_ids))
+                .order_by(UserSeenFilter.user_id)
+                .with_for_update()
+            )
+            stored = {user_id: data for user_id, data in result}
+
+            rows = []
+            for user_id in user_ids:
+                data = stored.get(user_id)
+                seen_filter = load_seen_filter(data)
+                seen_filter.add_many(pending[user_id], now)
+                rows.append({"user_id": user_id, "data": seen_filter.to_bytes(now)})
+
+            stmt = pg_insert(UserSeenFilter)
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[UserSeenFilter.user_id],
+                    set_={"data": stmt.excluded.data, "updated_at": func.now()}
+                ),
+                rows
+            )
+            await session.commit()
+
+    def start(self) -> None:
+        self._task.start()
+
+    async def stop(self) -> None:
+        """
+        Stop periodic flushing and flush anything outstanding
+        """
+        await self._task.stop()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cached_users": len(self._filters),
+            "cached_bytes": sum(entry[0].size_bytes for entry in self._filters.values()),
+            "pending_users": len(self._pending),
+            "marked_total": self.marked_total,
+            "flushed_total": self.flushed_total,
+            "loads": self.loads,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+seen_set = SeenSet()
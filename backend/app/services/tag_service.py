@@ -0,0 +1,144 @@
+import re
+from typing import List, Iterable
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, update, insert, func, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models.tag import Tag, RecipeTag
+
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class TagService:
+    """
+    Normalized recipe tags with incrementally maintained usage counts
+
+    A tag's usage count is the number of published recipes using it, so
+    drafts never show up in popular tags.
+    """
+
+    @staticmethod
+    def normalize(tag: str) -> str:
+        """
+        Normalize a tag: lowercase, single spaces, no leading '#'
+        """
+        return WHITESPACE_PATTERN.sub(" ", tag.lower().lstrip("#")).strip()[:50]
+
+    @staticmethod
+    def normalize_all(tags: Iterable[str]) -> List[str]:
+        return sorted({normalized for normalized in map(TagService.normalize, tags) if normalized})
+
+    @staticmethod
+    async def sync_recipe(db: AsyncSession, recipe_id: int, tags: List[str], published: bool) -> None:
+        """
+        Bring a recipe's tag associations in line with its tags (caller commits)
+
+        Only the added and removed tags are touched, and if the recipe is
+        published their usage counts are adjusted by one each.
+        """
+        delta = 1 if published else 0
+        names = set(TagService.normalize_all(tags))
+
+        result = await db.execute(
+            select(Tag.id, Tag.name)
+            .join(RecipeTag, RecipeTag.tag_id == Tag.id)
+            .where(RecipeTag.recipe_id == recipe_id)
+        )
+        current = {name: tag_id for tag_id, name in result}
+
+        removed_ids = [tag_id for name, tag_id in current.items() if name not in names]
+        added = sorted(names - set(current))
+
+        if removed_ids:
+            await db.execute(
+                delete(RecipeTag).where(
+                    RecipeTag.recipe_id == recipe_id,
+                    RecipeTag.tag_id.in_(removed_ids)
+                )
+            )
+            await TagService._adjust_usage(db, removed_ids, -delta)
+
+        if added:
+            await db.execute(
+                pg_insert(Tag)
+                .values([{"name": name, "usage_count": 0} for name in added])
+                .on_conflict_do_nothing(index_elements=[Tag.name])
+            )
+            result = await db.execute(select(Tag.id).where(Tag.name.in_(added)))
+            added_ids = sorted(result.scalars().all())
+
+            await db.execute(
+                insert(RecipeTag).from_select(
+                    ["recipe_id", "tag_id"],
+                    select(literal(recipe_id), Tag.id).where(Tag.id.in_(added_ids))
+                )
+            )
+            await TagService._adjust_usage(db, added_ids, delta)
+
+    @staticmethod
+    async def set_published(db: AsyncSession, recipe_id: int, published: bool) -> None:
+        """
+        Count or uncount a recipe's tags when it is published or unpublished (caller commits)
+        """
+        result = await db.execute(
+            select(RecipeTag.tag_id)
+            .where(RecipeTag.recipe_id == recipe_id)
+            .order_by(RecipeTag.tag_id)
+        )
+        tag_ids = result.scalars().all()
+
+        if tag_ids:
+            await TagService._adjust_usage(db, tag_ids, 1 if published else -1)
+
+    @staticmethod
+    async def remove_recipe(db: AsyncSession, recipe_id: int, published: bool) -> None:
+        """
+        Release a recipe's tags before it is deleted (caller commits)
+        """
+        result = await db.execute(
+            delete(RecipeTag)
+            .where(RecipeTag.recipe_id == recipe_id)
+            .returning(RecipeTag.tag_id)
+        )
+        tag_ids = sorted(result.scalars().all())
+
+        if tag_ids and published:
+            await TagService._adjust_usage(db, tag_ids, -1)
+
+    @staticmethod
+    async def _adjust_usage(db: AsyncSession, tag_ids: List[int], delta: int) -> None:
+        if not delta:
+            return
+        await db.execute(
+            update(Tag)
+            .where(Tag.id.in_(tag_ids))
+            .values(usage_count=func.greatest(Tag.usage_count + delta, 0))
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def recipes_with_tags(tags: List[str]):
+        """
+        Subquery of recipe ids tagged with all of the given tags
+        """
+        names = TagService.normalize_all(tags)
+        return (
+            select(RecipeTag.recipe_id)
+            .join(Tag, Tag.id == RecipeTag.tag_id)
+            .where(Tag.name.in_(names))
+            .group_by(RecipeTag.recipe_id)
+            .having(func.count() == len(names))
+        )
+
+    @staticmethod
+    async def get_popular_tags(db: AsyncSession, limit: int = 20) -> List[Tag]:
+        """
+        Most used tags, read from the usage counters
+        """
+        result = await db.execute(
+            select(Tag)
+            .where(Tag.usage_count > 0)
+            .order_by(Tag.usage_count.desc())
+            .limit(limit)
+        )
+        return result.scalars().all()
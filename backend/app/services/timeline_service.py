@@ -0,0 +1,213 @@
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, literal, tuple_, union, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models.recipe import Recipe
+from app.models.user import User
+from app.models.follower import Follower
+from app.models.timeline import TimelineEntry, TimelineHead
+from app.schemas.recipe import RecipeList
+from app.core.pagination import decode_cursor
+
+
+# Capacity of each user's inbox ring buffer
+TIMELINE_INBOX_SIZE = 500
+
+# Authors with more followers than this are not pushed to inboxes; their
+# recipes are merged into followers' feeds at read time instead
+TIMELINE_PUSH_MAX_FOLLOWERS = 10000
+
+# Recent recipes copied into the inbox when following someone
+TIMELINE_BACKFILL_SIZE = 20
+
+_entries = TimelineEntry.__table__
+_heads = TimelineHead.__table__
+
+
+class TimelineService:
+    """
+    Following feed built from per-user inboxes (fan-out on write) merged
+    with recipes of very large authors (fan-out on read)
+    """
+
+    @staticmethod
+    async def is_pull_author(db: AsyncSession, author_id: int) -> bool:
+        result = await db.execute(select(User.followers_count).where(User.id == author_id))
+        return (result.scalar() or 0) > TIMELINE_PUSH_MAX_FOLLOWERS
+
+    @staticmethod
+    async def fan_out(db: AsyncSession, recipe_id: int, author_id: int) -> bool:
+        """
+        Push a new recipe into every follower's inbox (caller commits)
+
+        One statement advances all the followers' heads and writes the
+        recipe into the slot each head now points at. Returns False for
+        pull authors, whose recipes are not pushed.
+        """
+        if await TimelineService.is_pull_author(db, author_id):
+            return False
+
+        heads = pg_insert(_heads).from_select(
+            ["user_id", "position"],
+            select(Follower.follower_id, literal(1)).where(Follower.following_id == author_id)
+        )
+        heads = (
+            heads.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={"position": _heads.c.position + 1}
+            )
+            .returning(_heads.c.user_id, _heads.c.position)
+            .cte("heads")
+        )
+
+        created_at = select(Recipe.created_at).where(Recipe.id == recipe_id).scalar_subquery()
+        entries = pg_insert(_entries).from_select(
+            ["user_id", "slot", "recipe_id", "author_id", "created_at"],
+            select(
+                heads.c.user_id,
+                heads.c.position % TIMELINE_INBOX_SIZE,
+                literal(recipe_id),
+                literal(author_id),
+                created_at
+            )
+        )
+        await db.execute(
+            entries.on_conflict_do_update(
+                index_elements=["user_id", "slot"],
+                set_={
+                    "recipe_id": entries.excluded.recipe_id,
+                    "author_id": entries.excluded.author_id,
+                    "created_at": entries.excluded.created_at
+                }
+            )
+        )
+        return True
+
+    @staticmethod
+    async def backfill(db: AsyncSession, user_id: int, author_id: int) -> None:
+        """
+        Copy an author's latest recipes into a new follower's inbox (caller commits)
+        """
+        if await TimelineService.is_pull_author(db, author_id):
+            return
+
+        result = await db.execute(
+            select(Recipe.id, Recipe.created_at)
+            .where(and_(Recipe.author_id == author_id, Recipe.is_published == True))
+            .order_by(Recipe.created_at.desc(), Recipe.id.desc())
+            .limit(TIMELINE_BACKFILL_SIZE)
+        )
+        recipes = result.all()
+        if not recipes:
+            return
+
+        # Reserve one slot per recipe by advancing the head once
+        result = await db.execute(
+            pg_insert(_heads)
+            .values(user_id=user_id, position=len(recipes))
+            .on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={"position": _heads.c.position + len(recipes)}
+            )
+            .returning(_heads.c.position)
+        )
+        end = result.scalar_one()
+
+        stmt = pg_insert(_entries)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "slot"],
+                set_={
+                    "recipe_id": stmt.excluded.recipe_id,
+                    "author_id": stmt.excluded.author_id,
+                    "created_at": stmt.excluded.created_at
+                }
+            ),
+            [
+                {
+                    "user_id": user_id,
+                    "slot": (end - i) % TIMELINE_INBOX_SIZE,
+                    "recipe_id": recipe.id,
+                    "author_id": author_id,
+                    "created_at": recipe.created_at
+                }
+                for i, recipe in enumerate(recipes)
+            ]
+        )
+
+    @staticmethod
+    async def remove_author(db: AsyncSession, user_id: int, author_id: int) -> None:
+        """
+        Drop an unfollowed author's recipes from a user's inbox (caller commits)
+        """
+        await db.execute(
+            delete(_entries).where(and_(_entries.c.user_id == user_id, _entries.c.author_id == author_id))
+        )
+
+    @staticmethod
+    async def remove_recipe(db: AsyncSession, recipe_id: int) -> None:
+        """
+        Drop an unpublished or deleted recipe from every inbox (caller commits)
+        """
+        await db.execute(delete(_entries).where(_entries.c.recipe_id == recipe_id))
+
+    @staticmethod
+    async def get_following_feed(
+        db: AsyncSession,
+        user_id: int,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> List[RecipeList]:
+        """
+        Newest recipes from followed authors, one keyset page
+
+        Reads at most `limit` inbox entries plus `limit` recipes from pull
+        authors, whatever the number of followed accounts.
+        """
+        from app.services.recipe_service import RecipeService
+
+        position = decode_cursor(cursor) if cursor else None
+
+        # Filter on the recipe inside the subquery so unpublished entries
+        # do not use up the LIMIT and end the page early
+        inbox = (
+            select(_entries.c.recipe_id.label("recipe_id"))
+            .join(Recipe, Recipe.id == _entries.c.recipe_id)
+            .where(and_(_entries.c.user_id == user_id, Recipe.is_published == True))
+        )
+        if position:
+            inbox = inbox.where(tuple_(_entries.c.created_at, _entries.c.recipe_id) < tuple_(*position))
+        inbox = inbox.order_by(_entries.c.created_at.desc(), _entries.c.recipe_id.desc()).limit(limit)
+
+        result = await db.execute(
+            select(Follower.following_id)
+            .join(User, User.id == Follower.following_id)
+            .where(
+                and_(
+                    Follower.follower_id == user_id,
+                    User.followers_count > TIMELINE_PUSH_MAX_FOLLOWERS
+                )
+            )
+        )
+        pull_author_ids = result.scalars().all()
+
+        if pull_author_ids:
+            pulled = select(Recipe.id.label("recipe_id")).where(
+                and_(Recipe.author_id.in_(pull_author_ids), Recipe.is_published == True)
+            )
+            if position:
+                pulled = pulled.where(tuple_(Recipe.created_at, Recipe.id) < tuple_(*position))
+            pulled = pulled.order_by(Recipe.created_at.desc(), Recipe.id.desc()).limit(limit)
+            # UNION drops recipes pushed before their author crossed the threshold
+            page_ids = union(inbox, pulled).subquery()
+        else:
+            page_ids = inbox.subquery()
+
+        result = await db.execute(
+            RecipeService.recipe_list_query()
+            .join(page_ids, page_ids.c.recipe_id == Recipe.id)
+            .where(Recipe.is_published == True)
+            .order_by(Recipe.created_at.desc(), Recipe.id.desc())
+            .limit(limit)
+        )
+        return [RecipeList(**row._mapping) for row in result]
@@ -0,0 +1,281 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, List, Tuple
+import numpy as np
+from app.core.bloom import RotatingBloomFilter
+from app.core.config import settings
+from app.core.redis import get_redis, shared_store_enabled
+from app.core.tasks import PeriodicTask
+
+
+logger = logging.getLogger(__name__)
+
+# Longest-lived token; revocation records never need to outlive it
+MAX_TOKEN_LIFETIME_SECONDS = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+# Revocations expected per day; each daily filter generation is sized for it
+REVOCATION_FILTER_CAPACITY = 1_000_000
+REVOCATION_FILTER_ERROR_RATE = 0.01
+REVOCATION_FILTER_PERIOD_SECONDS = 86400
+
+# Seconds between pulls of revocations made by other workers
+REVOCATION_SYNC_INTERVAL_SECONDS = 2.0
+
+# Re-read this much of the log on each sync to cover clock skew between workers
+REVOCATION_SYNC_OVERLAP_SECONDS = 5.0
+
+REVOKED_KEY_PREFIX = "auth:revoked:"
+USED_KEY_PREFIX = "auth:used:"
+REVOCATION_LOG_KEY = "auth:revocation_log"
+
+
+class RevocationStore(ABC):
+    """
+    Shared record of revoked token ids and used refresh tokens
+    """
+
+    @abstractmethod
+    async def revoke(self, token_id: str, expires_at: float) -> None:
+        ...
+
+    @abstractmethod
+    async def is_revoked(self, token_ids: List[str]) -> bool:
+        ...
+
+    @abstractmethod
+    async def revoked_since(self, since: float) -> List[Tuple[str, float]]:
+        """
+        (token id, revoked at) of revocations made at or after `since`
+        """
+
+    @abstractmethod
+    async def mark_used(self, token_id: str, expires_at: float) -> bool:
+        """
+        Record a refresh token as used; False if it already was
+        """
+
+
+class InMemoryRevocationStore(RevocationStore):
+    """
+    Local stand-in for the Redis revocation store
+    """
+
+    # Seconds between sweeps of expired entries
+    PRUNE_INTERVAL_SECONDS = 60
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+        self._used: Dict[str, float] = {}
+        self._log: "deque[Tuple[float, str]]" = deque()
+        self._pruned_at = 0.0
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - MAX_TOKEN_LIFETIME_SECONDS
+        while self._log and self._log[0][0] < cutoff:
+            self._log.popleft()
+
+        if now - self._pruned_at < self.PRUNE_INTERVAL_SECONDS:
+            return
+        self._pruned_at = now
+        for entries in (self._revoked, self._used):
+            for token_id in [token_id for token_id, expires_at in entries.items() if expires_at <= now]:
+                del entries[token_id]
+
+    async def revoke(self, token_id: str, expires_at: float) -> None:
+        now = time.time()
+        self._revoked[token_id] = expires_at
+        self._log.append((now, token_id))
+        self._prune(now)
+
+    async def is_revoked(self, token_ids: List[str]) -> bool:
+        now = time.time()
+        return any(self._revoked.get(token_id, 0) > now for token_id in token_ids)
+
+    async def revoked_since(self, since: float) -> List[Tuple[str, float]]:
+        return [(token_id, revoked_at) for revoked_at, token_id in self._log if revoked_at >= since]
+
+    async def mark_used(self, token_id: str, expires_at: float) -> bool:
+        if self._used.get(token_id, 0) > time.time():
+            return False
+        self._used[token_id] = expires_at
+        return True
+
+
+class RedisRevocationStore(RevocationStore):
+    """
+    Redis-backed revocation store
+
+    Each revoked id is a key expiring at the token's exp. A sorted set of
+    (id, revoked at) lets workers pull revocations made since their last
+    sync; it is trimmed to the longest token lifetime.
+    """
+
+    async def revoke(self, token_id: str, expires_at: float) -> None:
+        now = time.time()
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.set(f"{REVOKED_KEY_PREFIX}{token_id}", 1, ex=max(int(expires_at - now) + 1, 1))
+        pipe.zadd(REVOCATION_LOG_KEY, {token_id: now})
+        pipe.zremrangebyscore(REVOCATION_LOG_KEY, "-inf", now - MAX_TOKEN_LIFETIME_SECONDS)
+        await pipe.execute()
+
+    async def is_revoked(self, token_ids: List[str]) -> bool:
+        return await get_redis().exists(*[f"{REVOKED_KEY_PREFIX}{token_id}" for token_id in token_ids]) > 0
+
+    async def revoked_since(self, since: float) -> List[Tuple[str, float]]:
+        return await get_redis().zrangebyscore(REVOCATION_LOG_KEY, since, "+inf", withscores=True)
+
+    async def mark_used(self, token_id: str, expires_at: float) -> bool:
+        ttl = max(int(expires_at - time.time()) + 1, 1)
+        return bool(await get_redis().set(f"{USED_KEY_PREFIX}{token_id}", 1, ex=ttl, nx=True))
+
+
+def _filter_key(token_id: str) -> int:
+    """
+    Filter id of a token id (the jti/fam claims are random hex)
+    """
+    return int(token_id[:15], 16)
+
+
+class RevocationList:
+    """
+    Revoked token ids: a local rotating Bloom filter in front of the shared store
+
+    Tokens carry a `jti` and a `fam` (the login session they descend from);
+    revoking either id rejects the token. The check is a fixed number of
+    bit probes whatever the number of revoked tokens, and only filter
+    positives (revoked tokens and ~1% false positives) reach the store.
+    Filter generations are daily and dropped once no token revoked in them
+    can still be unexpired; the store's entries expire at each token's exp.
+
+    Revocations made on other workers reach this filter within
+    REVOCATION_SYNC_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, store: RevocationStore):
+        self.store = store
+        self._filter = self._new_filter()
+        self._synced_at = 0.0
+        self._task = PeriodicTask("revocation-sync", self.sync, REVOCATION_SYNC_INTERVAL_SECONDS)
+        self.checks = 0
+        self.store_lookups = 0
+        self.revoked_total = 0
+        self.reuse_detected_total = 0
+
+    @staticmethod
+    def _new_filter() -> RotatingBloomFilter:
+        return RotatingBloomFilter(
+            REVOCATION_FILTER_CAPACITY,
+            REVOCATION_FILTER_ERROR_RATE,
+            REVOCATION_FILTER_PERIOD_SECONDS,
+            # One more generation than the longest token lifetime
+            MAX_TOKEN_LIFETIME_SECONDS // REVOCATION_FILTER_PERIOD_SECONDS + 1
+        )
+
+    @staticmethod
+    def _token_ids(claims: Dict) -> List[str]:
+        return [claims[claim] for claim in ("jti", "fam") if claims.get(claim)]
+
+    async def revoke(self, token_id: str, expires_at: float) -> None:
+        await self.store.revoke(token_id, expires_at)
+        self._filter.add_many([_filter_key(token_id)], time.time())
+        self.revoked_total += 1
+
+    async def revoke_token(self, claims: Dict) -> None:
+        """
+        Revoke one token until its exp
+        """
+        if claims.get("jti"):
+            await self.revoke(claims["jti"], claims["exp"])
+
+    async def revoke_family(self, claims: Dict) -> None:
+        """
+        Revoke every token issued to the login session `claims` belongs to
+        """
+        if claims.get("fam"):
+            await self.revoke(claims["fam"], time.time() + MAX_TOKEN_LIFETIME_SECONDS)
+
+    async def is_revoked(self, claims: Dict) -> bool:
+        """
+        Whether the token or its session was revoked
+
+        Tokens issued before ids were added carry none and cannot be revoked.
+        """
+        token_ids = self._token_ids(claims)
+        if not token_ids:
+            return False
+
+        self.checks += 1
+        keys = np.fromiter((_filter_key(token_id) for token_id in token_ids), dtype=np.int64, count=len(token_ids))
+        if not self._filter.contains_many(keys, time.time()).any():
+            return False
+
+        self.store_lookups += 1
+        try:
+            return await self.store.is_revoked(token_ids)
+        except Exception:
+            # Fail closed: the filter says this token may be revoked
+            logger.warning("Revocation store lookup failed", exc_info=True)
+            return True
+
+    async def use_refresh_token(self, claims: Dict) -> bool:
+        """
+        Consume a refresh token for rotation
+
+        A second use of the same token means it leaked (or the client
+        raced itself), so the whole session is revoked and False returned.
+        """
+        if not claims.get("jti"):
+            return True
+
+        if await self.store.mark_used(claims["jti"], claims["exp"]):
+            return True
+
+        self.reuse_detected_total += 1
+        logger.warning(f"Refresh token reuse detected for user {claims.get('sub')}")
+        await self.revoke_family(claims)
+        return False
+
+    async def sync(self) -> None:
+        """
+        Add revocations from the shared store made since the last sync
+        """
+        entries = await self.store.revoked_since(max(self._synced_at - REVOCATION_SYNC_OVERLAP_SECONDS, 0.0))
+        if not entries:
+            return
+
+        keys = np.fromiter((_filter_key(token_id) for token_id, _ in entries), dtype=np.int64, count=len(entries))
+        revoked_at = np.fromiter((float(at) for _, at in entries), dtype=np.float64, count=len(entries))
+
+        # Add each revocation to the generation of the day it was made
+        periods = (revoked_at // REVOCATION_FILTER_PERIOD_SECONDS).astype(np.int64)
+        for period in np.unique(periods):
+            self._filter.add_many(keys[periods == period], float(period) * REVOCATION_FILTER_PERIOD_SECONDS)
+
+        self._synced_at = max(self._synced_at, float(revoked_at.max()))
+
+    def start(self) -> None:
+        self._task.start()
+
+    async def stop(self) -> None:
+        await self._task.stop()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "checks": self.checks,
+            "store_lookups": self.store_lookups,
+            "revoked_total": self.revoked_total,
+            "reuse_detected_total": self.reuse_detected_total,
+            "filter_bytes": self._filter.size_bytes,
+        }
+
+
+def create_revocation_store() -> RevocationStore:
+    """
+    Redis outside development/testing, in-memory stand-in otherwise
+    """
+    return RedisRevocationStore() if shared_store_enabled() else InMemoryRevocationStore()
+
+
+revocation_list = RevocationList(create_revocation_store())
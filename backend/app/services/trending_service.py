@@ -0,0 +1,187 @@
+import math
+import time
+from collections import defaultdict
+from typing import Dict, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert, ARRAY
+from app.models.recipe import Recipe
+from app.models.trending import RecipeTrending
+from app.schemas.recipe import RecipeList
+from app.core.tasks import PeriodicTask
+from app.database.session import AsyncSessionLocal
+
+
+# Score contribution of one event of each kind
+TRENDING_WEIGHTS = {
+    "view": 1.0,
+    "like": 5.0,
+    "save": 10.0,
+}
+
+# Contributions halve every this many hours
+TRENDING_HALF_LIFE_HOURS = 24.0
+TRENDING_DECAY_RATE = math.log(2) / (TRENDING_HALF_LIFE_HOURS * 3600)
+
+# Reference time for log-space scores (2024-01-01 UTC)
+TRENDING_EPOCH = 1704067200
+
+# Seconds between flushes of buffered engagement into recipe_trending
+TRENDING_FLUSH_INTERVAL_SECONDS = 10.0
+
+# Rows whose decayed score fell below this are pruned, at most once per interval
+TRENDING_PRUNE_BELOW = 0.01
+TRENDING_PRUNE_INTERVAL_SECONDS = 3600
+
+_trending = RecipeTrending.__table__
+
+
+def _flush_upsert():
+    """
+    Upsert of a flush, passed as recipe_ids and scores arrays
+
+    Joining recipes skips ids whose recipe was deleted since its events
+    were recorded, which would otherwise fail the batch on the foreign key.
+    """
+    contributions = (
+        func.unnest(
+            bindparam("recipe_ids", type_=ARRAY(_trending.c.recipe_id.type)),
+            bindparam("scores", type_=ARRAY(_trending.c.score.type))
+        )
+        .table_valued("recipe_id", "score")
+        .render_derived(name="contributions")
+    )
+    stmt = pg_insert(_trending).from_select(
+        ["recipe_id", "score"],
+        select(contributions.c.recipe_id, contributions.c.score)
+        .join(Recipe, Recipe.id == contributions.c.recipe_id)
+        # Sorted ids keep lock order consistent between concurrent flushers
+        .order_by(contributions.c.recipe_id)
+    )
+    current, added = _trending.c.score, stmt.excluded.score
+    return stmt.on_conflict_do_update(
+        index_elements=["recipe_id"],
+        set_={
+            # log(exp(a) + exp(b)) without overflow
+            "score": func.greatest(current, added) + func.ln(1 + func.exp(-func.abs(current - added))),
+            "updated_at": func.now()
+        }
+    )
+
+
+_FLUSH_UPSERT = _flush_upsert()
+
+
+def decay_offset(now: float) -> float:
+    """
+    Log of the growth factor for an event at `now` relative to the epoch
+    """
+    return TRENDING_DECAY_RATE * (now - TRENDING_EPOCH)
+
+
+class TrendingAggregator:
+    """
+    Buffers engagement weights and folds them into recipe_trending
+
+    Each flush is one batched upsert that log-adds the new contribution to
+    the stored score, so history is never rescanned.
+    """
+
+    def __init__(self):
+        self._buffer: Dict[int, float] = defaultdict(float)
+        self._task = PeriodicTask("trending-flush", self.flush, TRENDING_FLUSH_INTERVAL_SECONDS)
+        self._last_prune = 0.0
+        self.flushed_recipes_total = 0
+        self.skipped_recipes_total = 0
+        self.flush_count = 0
+        self.pruned_total = 0
+
+    def record(self, recipe_id: int, event_type: str, count: int = 1) -> None:
+        """
+        Buffer `count` events of a kind for a recipe
+        """
+        weight = TRENDING_WEIGHTS.get(event_type)
+        if weight and count > 0:
+            self._buffer[recipe_id] += weight * count
+
+    def record_many(self, counts: Dict[int, int], event_type: str) -> None:
+        for recipe_id, count in counts.items():
+            self.record(recipe_id, event_type, count)
+
+    async def flush(self) -> int:
+        if not self._buffer:
+            return 0
+
+        buffer, self._buffer = dict(self._buffer), defaultdict(float)
+        now = time.time()
+        offset = decay_offset(now)
+        params = {
+            "recipe_ids": list(buffer),
+            "scores": [math.log(weight) + offset for weight in buffer.values()],
+        }
+
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(_FLUSH_UPSERT, params)
+                flushed = result.rowcount
+
+                if now - self._last_prune >= TRENDING_PRUNE_INTERVAL_SECONDS:
+                    result = await session.execute(
+                        delete(_trending).where(_trending.c.score < offset + math.log(TRENDING_PRUNE_BELOW))
+                    )
+                    self.pruned_total += result.rowcount
+                    self._last_prune = now
+
+                await session.commit()
+        except Exception:
+            # Hand the weights back so the next flush retries them; deleted
+            # recipes are dropped by the join then, so no id fails for good
+            for recipe_id, weight in buffer.items():
+                self._buffer[recipe_id] += weight
+            raise
+
+        self.flushed_recipes_total += flushed
+        self.skipped_recipes_total += len(buffer) - flushed
+        self.flush_count += 1
+        return flushed
+
+    def start(self) -> None:
+        self._task.start()
+
+    async def stop(self) -> None:
+        await self._task.stop()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "buffered_recipes": len(self._buffer),
+            "flushed_recipes_total": self.flushed_recipes_total,
+            "skipped_recipes_total": self.skipped_recipes_total,
+            "flush_count": self.flush_count,
+            "pruned_total": self.pruned_total,
+        }
+
+
+trending_aggregator = TrendingAggregator()
+
+
+class TrendingService:
+    """
+    Reads of the precomputed trending ranking
+    """
+
+    @staticmethod
+    async def get_trending(db: AsyncSession, skip: int = 0, limit: int = 20) -> List[RecipeList]:
+        """
+        Hottest published recipes, walked off the score index
+        """
+        from app.services.recipe_service import RecipeService
+
+        result = await db.execute(
+            RecipeService.recipe_list_query()
+            .join(RecipeTrending, RecipeTrending.recipe_id == Recipe.id)
+            .where(Recipe.is_published == True)
+            .order_by(RecipeTrending.score.desc(), RecipeTrending.recipe_id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return [RecipeList(**row._mapping) for row in result]
@@ -1,11 +1,15 @@
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, update, delete, and_, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.models.follower import Follower
-from app.models.recipe import Recipe
-from app.schemas.user import UserUpdate, UserProfile
+from app.schemas.user import UserUpdate, UserProfile, UserPublic
+from app.core.dependencies import invalidate_principal
+from app.services.follow_graph import follow_graph
+from app.services.timeline_service import TimelineService
 
 
 class UserService:
@@ -33,7 +37,14 @@ class UserService:
     async def update_user(db: AsyncSession, user: User, user_data: UserUpdate) -> User:
         """
         Update user profile
+        
+        `user` may be the shared, detached instance from the principal
+        cache, so changes are made on a copy merged into this session.
+        load=False copies it without re-reading or rewriting its columns,
+        so only the fields changed below are written.
         """
+        user = await db.merge(user, load=False)
+        
         # Check if username is being changed and if it's already taken
         if user_data.username and user_data.username != user.username:
             result = await db.execute(
@@ -54,9 +65,30 @@ class UserService:
         
         await db.commit()
         await db.refresh(user)
+        invalidate_principal(user.id)
         
         return user
     
+    @staticmethod
+    async def deactivate_user(db: AsyncSession, user_id: int) -> None:
+        """
+        Deactivate an account
+        
+        Its tokens are refused at once on this worker and within
+        PRINCIPAL_CACHE_TTL seconds on the others.
+        """
+        result = await db.execute(
+            update(User).where(User.id == user_id).values(is_active=False).returning(User.id)
+        )
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        
+        await db.commit()
+        invalidate_principal(user_id)
+    
     @staticmethod
     async def get_user_profile(
         db: AsyncSession,
@@ -65,57 +97,35 @@ class UserService:
     ) -> UserProfile:
         """
         Get user profile with stats
+        
+        Counts come from the denormalized columns, so this is one row read;
+        is_following is answered by the follow-graph cache.
         """
-        # Get user
-        user = await UserService.get_user_by_username(db, username)
-        if not user:
+        result = await db.execute(
+            select(
+                User.id,
+                User.username,
+                User.bio,
+                User.avatar_url,
+                User.followers_count,
+                User.following_count,
+                User.recipes_count,
+                User.created_at
+            ).where(User.username == username)
+        )
+        row = result.first()
+        
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
-        # Count followers
-        followers_result = await db.execute(
-            select(func.count(Follower.id)).where(Follower.following_id == user.id)
-        )
-        followers_count = followers_result.scalar() or 0
-        
-        # Count following
-        following_result = await db.execute(
-            select(func.count(Follower.id)).where(Follower.follower_id == user.id)
-        )
-        following_count = following_result.scalar() or 0
-        
-        # Count recipes
-        recipes_result = await db.execute(
-            select(func.count(Recipe.id)).where(Recipe.author_id == user.id)
-        )
-        recipes_count = recipes_result.scalar() or 0
-        
-        # Check if current user is following this user
         is_following = False
-        if current_user_id and current_user_id != user.id:
-            follow_result = await db.execute(
-                select(Follower).where(
-                    and_(
-                        Follower.follower_id == current_user_id,
-                        Follower.following_id == user.id
-                    )
-                )
-            )
-            is_following = follow_result.scalar_one_or_none() is not None
-        
-        return UserProfile(
-            id=user.id,
-            username=user.username,
-            bio=user.bio,
-            avatar_url=user.avatar_url,
-            followers_count=followers_count,
-            following_count=following_count,
-            recipes_count=recipes_count,
-            is_following=is_following,
-            created_at=user.created_at
-        )
+        if current_user_id and current_user_id != row.id:
+            is_following = await follow_graph.follows(db, current_user_id, row.id)
+        
+        return UserProfile(**row._mapping, is_following=is_following)
     
     @staticmethod
     async def follow_user(db: AsyncSession, follower_id: int, following_id: int) -> Follower:
@@ -128,28 +138,33 @@ class UserService:
                 detail="Cannot follow yourself"
             )
         
-        # Check if already following
-        result = await db.execute(
-            select(Follower).where(
-                and_(
-                    Follower.follower_id == follower_id,
-                    Follower.following_id == following_id
-                )
+        # Insert and detect duplicates in one statement, so concurrent
+        # requests can't both pass an existence check and double count
+        try:
+            result = await db.scalars(
+                pg_insert(Follower)
+                .values(follower_id=follower_id, following_id=following_id)
+                .on_conflict_do_nothing(index_elements=["follower_id", "following_id"])
+                .returning(Follower)
+            )
+            follow = result.one_or_none()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
             )
-        )
-        existing_follow = result.scalar_one_or_none()
         
-        if existing_follow:
+        if not follow:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Already following this user"
             )
         
-        # Create follow relationship
-        follow = Follower(follower_id=follower_id, following_id=following_id)
-        db.add(follow)
+        await UserService._adjust_follow_counts(db, follower_id, following_id, 1)
+        await TimelineService.backfill(db, follower_id, following_id)
         await db.commit()
-        await db.refresh(follow)
+        follow_graph.on_follow(follower_id, following_id)
         
         return follow
     
@@ -159,60 +174,117 @@ class UserService:
         Unfollow a user
         """
         result = await db.execute(
-            select(Follower).where(
+            delete(Follower)
+            .where(
                 and_(
                     Follower.follower_id == follower_id,
                     Follower.following_id == following_id
                 )
             )
+            .returning(Follower.id)
         )
-        follow = result.scalar_one_or_none()
         
-        if not follow:
+        if result.scalar_one_or_none() is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Follow relationship not found"
             )
         
-        await db.delete(follow)
+        await UserService._adjust_follow_counts(db, follower_id, following_id, -1)
+        await TimelineService.remove_author(db, follower_id, following_id)
         await db.commit()
+        follow_graph.on_unfollow(follower_id, following_id)
         
         return True
     
+    @staticmethod
+    async def _adjust_follow_counts(
+        db: AsyncSession,
+        follower_id: int,
+        following_id: int,
+        delta: int
+    ) -> None:
+        """
+        Update both users' follow counts in a single statement (caller commits)
+        """
+        await db.execute(
+            update(User)
+            .where(User.id.in_([follower_id, following_id]))
+            .values(
+                following_count=User.following_count + case((User.id == follower_id, delta), else_=0),
+                followers_count=User.followers_count + case((User.id == following_id, delta), else_=0)
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
+    @staticmethod
+    async def adjust_recipes_count(db: AsyncSession, user_id: int, delta: int) -> None:
+        """
+        Update a user's recipe count (caller commits)
+        """
+        await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(recipes_count=User.recipes_count + delta)
+            .execution_options(synchronize_session=False)
+        )
+    
     @staticmethod
     async def get_followers(
         db: AsyncSession,
         user_id: int,
         skip: int = 0,
-        limit: int = 20
-    ) -> List[User]:
+        limit: int = 20,
+        current_user_id: Optional[int] = None
+    ) -> List[UserPublic]:
         """
         Get user's followers
         """
         result = await db.execute(
-            select(User)
+            select(User.id, User.username, User.avatar_url)
             .join(Follower, Follower.follower_id == User.id)
             .where(Follower.following_id == user_id)
+            .order_by(Follower.id.desc())
             .offset(skip)
             .limit(limit)
         )
-        return result.scalars().all()
+        return await UserService._with_follow_state(db, result.all(), current_user_id)
     
     @staticmethod
     async def get_following(
         db: AsyncSession,
         user_id: int,
         skip: int = 0,
-        limit: int = 20
-    ) -> List[User]:
+        limit: int = 20,
+        current_user_id: Optional[int] = None
+    ) -> List[UserPublic]:
         """
         Get users that this user follows
         """
         result = await db.execute(
-            select(User)
+            select(User.id, User.username, User.avatar_url)
             .join(Follower, Follower.following_id == User.id)
             .where(Follower.follower_id == user_id)
+            .order_by(Follower.id.desc())
             .offset(skip)
             .limit(limit)
         )
-        return result.scalars().all()
\ No newline at end of file
+        return await UserService._with_follow_state(db, result.all(), current_user_id)
+    
+    @staticmethod
+    async def _with_follow_state(
+        db: AsyncSession,
+        rows,
+        current_user_id: Optional[int]
+    ) -> List[UserPublic]:
+        """
+        Build UserPublic rows with is_following checked in one batch
+        """
+        following = {}
+        if current_user_id:
+            following = await follow_graph.follows_many(db, current_user_id, [row.id for row in rows])
+        
+        return [
+            UserPublic(**row._mapping, is_following=following.get(row.id, False))
+            for row in rows
+        ]
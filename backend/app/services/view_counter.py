@@ -0,0 +1,172 @@
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Dict
+from sqlalchemy import update, bindparam
+from app.database.session import AsyncSessionLocal
+from app.models.recipe import Recipe
+from app.core.redis import get_redis, shared_store_enabled
+from app.core.tasks import PeriodicTask
+from app.services.trending_service import trending_aggregator
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds between flushes of buffered view counts to the database
+VIEW_FLUSH_INTERVAL_SECONDS = 5.0
+
+
+class ViewCountBackend(ABC):
+    """
+    Shared store that aggregates view deltas across workers
+    """
+
+    @abstractmethod
+    async def add(self, deltas: Dict[int, int]) -> None:
+        ...
+
+    @abstractmethod
+    async def drain(self) -> Dict[int, int]:
+        """
+        Atomically take and clear all pending deltas
+        """
+
+
+class LocalViewCountBackend(ViewCountBackend):
+    """
+    In-process stand-in for the Redis backend
+    """
+
+    def __init__(self):
+        self._deltas: Dict[int, int] = defaultdict(int)
+
+    async def add(self, deltas: Dict[int, int]) -> None:
+        for recipe_id, delta in deltas.items():
+            self._deltas[recipe_id] += delta
+
+    async def drain(self) -> Dict[int, int]:
+        deltas, self._deltas = dict(self._deltas), defaultdict(int)
+        return deltas
+
+
+class RedisViewCountBackend(ViewCountBackend):
+    """
+    Redis hash of recipe_id -> pending views shared by all workers
+    """
+
+    KEY = "recipes:views:pending"
+
+    async def add(self, deltas: Dict[int, int]) -> None:
+        pipe = get_redis().pipeline(transaction=False)
+        for recipe_id, delta in deltas.items():
+            pipe.hincrby(self.KEY, recipe_id, delta)
+        await pipe.execute()
+
+    async def drain(self) -> Dict[int, int]:
+        import redis
+
+        client = get_redis()
+        # RENAME is atomic, so concurrent drains never see the same deltas
+        draining_key = f"{self.KEY}:{uuid.uuid4().hex}"
+        try:
+            await client.rename(self.KEY, draining_key)
+        except redis.ResponseError:
+            return {}  # Nothing pending
+
+        pending = await client.hgetall(draining_key)
+        await client.delete(draining_key)
+        return {int(recipe_id): int(delta) for recipe_id, delta in pending.items()}
+
+
+class ViewCounter:
+    """
+    Write-behind aggregator for recipe view counts
+
+    Views are counted in memory, pushed to the shared backend and written
+    to the database as one batched relative UPDATE per flush, instead of a
+    read-modify-write of the recipe row on every request.
+    """
+
+    def __init__(self, backend: ViewCountBackend):
+        self.backend = backend
+        self._buffer: Dict[int, int] = defaultdict(int)
+        self._task = PeriodicTask("view-counter-flush", self.flush, VIEW_FLUSH_INTERVAL_SECONDS)
+        self.buffered_total = 0
+        self.flushed_total = 0
+        self.flush_count = 0
+        self.failed_flushes = 0
+
+    def record(self, recipe_id: int, count: int = 1) -> None:
+        """
+        Buffer a view of a recipe
+        """
+        self._buffer[recipe_id] += count
+        self.buffered_total += count
+
+    async def flush(self) -> int:
+        """
+        Push buffered views to the shared backend and apply pending deltas to the database
+        """
+        if self._buffer:
+            buffer, self._buffer = dict(self._buffer), defaultdict(int)
+            await self.backend.add(buffer)
+
+        deltas = await self.backend.drain()
+        if not deltas:
+            return 0
+
+        try:
+            await self._apply(deltas)
+        except Exception:
+            # Hand the deltas back so the next flush retries them
+            self.failed_flushes += 1
+            await self.backend.add(deltas)
+            raise
+
+        trending_aggregator.record_many(deltas, "view")
+
+        flushed = sum(deltas.values())
+        self.flushed_total += flushed
+        self.flush_count += 1
+        return flushed
+
+    async def _apply(self, deltas: Dict[int, int]) -> None:
+        recipes = Recipe.__table__
+        stmt = (
+            update(recipes)
+            .where(recipes.c.id == bindparam("recipe_id"))
+            .values(views_count=recipes.c.views_count + bindparam("delta"))
+        )
+        # Sorted ids keep lock order consistent between concurrent flushers
+        params = [
+            {"recipe_id": recipe_id, "delta": deltas[recipe_id]}
+            for recipe_id in sorted(deltas)
+        ]
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(stmt, params)
+            await session.commit()
+
+    def start(self) -> None:
+        self._task.start()
+
+    async def stop(self) -> None:
+        """
+        Stop periodic flushing and flush anything outstanding
+        """
+        await self._task.stop()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "buffered": sum(self._buffer.values()),
+            "buffered_total": self.buffered_total,
+            "flushed_total": self.flushed_total,
+            "flush_count": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+view_counter = ViewCounter(
+    RedisViewCountBackend() if shared_store_enabled() else LocalViewCountBackend()
+)
@@ -0,0 +1,93 @@
+"""
+Benchmark event-loop lag during a login storm: inline bcrypt vs the hashing pool
+
+Usage:
+    python -m benchmarks.bench_login_storm --logins 100 --concurrency 20
+
+A probe coroutine asks to wake every --probe-interval-ms and records how
+late it actually runs; that lateness is what every other request on the
+worker would see. Each login verifies one password. The inline variant
+reproduces the old AuthService path (passlib called directly in the
+coroutine). No database is needed.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from app.core.security import hash_password, verify_password, PASSWORD_HASH_ROUNDS
+from app.services.password_hasher import PasswordHasher
+
+
+PASSWORD = "correct horse battery staple"
+
+
+async def probe(interval: float, lags: list, done: asyncio.Event) -> None:
+    while not done.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(time.perf_counter() - expected, 0.0) * 1000)
+
+
+async def inline_login(hashed: str) -> None:
+    verify_password(PASSWORD, hashed)
+
+
+def pooled_login(hasher: PasswordHasher):
+    async def login(hashed: str) -> None:
+        await hasher.verify(PASSWORD, hashed)
+    return login
+
+
+async def run(name, login, hashed, logins, concurrency, probe_interval):
+    lags = []
+    done = asyncio.Event()
+    prober = asyncio.create_task(probe(probe_interval, lags, done))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await login(hashed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    done.set()
+    await prober
+
+    lags.sort()
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0
+    print(
+        f"{name:<8} logins/s={logins / elapsed:.1f} "
+        f"loop lag p50={statistics.median(lags) if lags else 0.0:.1f}ms "
+        f"p99={p99:.1f}ms max={max(lags, default=0.0):.1f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--probe-interval-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    hashed = hash_password(PASSWORD)
+    print(f"bcrypt rounds={PASSWORD_HASH_ROUNDS}")
+
+    hasher = PasswordHasher(workers=args.workers) if args.workers else PasswordHasher()
+    hasher.start()
+    try:
+        # Let the worker processes finish booting before measuring
+        await hasher.verify(PASSWORD, hashed)
+
+        interval = args.probe_interval_ms / 1000
+        await run("inline", inline_login, hashed, args.logins, args.concurrency, interval)
+        await run("pool", pooled_login(hasher), hashed, args.logins, args.concurrency, interval)
+        print(f"pool stats: {hasher.stats()}")
+    finally:
+        await hasher.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
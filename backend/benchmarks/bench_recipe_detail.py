@@ -0,0 +1,95 @@
+"""
+Benchmark GET /recipes/{id} data access: legacy query sequence vs single-statement fast path
+
+Usage:
+    python -m benchmarks.bench_recipe_detail --recipe-id 1 --user-id 1 --iterations 500
+
+Counts SQL statements and measures latency per request against the
+configured DATABASE_URL. The legacy path is reproduced here as it was
+before the fast path: recipe + two selectinloads, a Like and a Save lookup,
+then the view-count SELECT and UPDATE. Nothing is committed.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from sqlalchemy import event, select, and_
+from sqlalchemy.orm import selectinload
+from app.database.session import AsyncSessionLocal, engine
+from app.models.recipe import Recipe
+from app.models.engagement import Like, Save
+from app.services.recipe_service import RecipeService
+
+
+statement_count = 0
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    global statement_count
+    statement_count += 1
+
+
+async def legacy_get_recipe(db, recipe_id, user_id):
+    result = await db.execute(
+        select(Recipe)
+        .options(selectinload(Recipe.author), selectinload(Recipe.video))
+        .where(Recipe.id == recipe_id)
+    )
+    recipe = result.scalar_one_or_none()
+
+    if user_id:
+        await db.execute(select(Like).where(and_(Like.user_id == user_id, Like.recipe_id == recipe_id)))
+        await db.execute(select(Save).where(and_(Save.user_id == user_id, Save.recipe_id == recipe_id)))
+
+    # increment_view_count
+    result = await db.execute(select(Recipe).where(Recipe.id == recipe_id))
+    recipe = result.scalar_one_or_none()
+    recipe.views_count += 1
+    await db.flush()
+
+
+async def fast_get_recipe(db, recipe_id, user_id):
+    # Views are buffered in memory, so the request issues no write
+    await RecipeService.fetch_recipe_detail(db, recipe_id, user_id)
+
+
+async def run(name, func, recipe_id, user_id, iterations):
+    global statement_count
+
+    latencies = []
+    statements = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(iterations):
+            db.expunge_all()
+            statement_count = 0
+            start = time.perf_counter()
+            await func(db, recipe_id, user_id)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statements.append(statement_count)
+        await db.rollback()
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{name:<8} statements/request={statistics.mean(statements):.1f} "
+        f"p50={statistics.median(latencies):.2f}ms p99={p99:.2f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--recipe-id", type=int, required=True)
+    parser.add_argument("--user-id", type=int, default=None)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _count_statement)
+    try:
+        await run("legacy", legacy_get_recipe, args.recipe_id, args.user_id, args.iterations)
+        await run("fast", fast_get_recipe, args.recipe_id, args.user_id, args.iterations)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
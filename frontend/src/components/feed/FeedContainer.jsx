@@ -11,6 +11,7 @@ import { useAuth } from '@hooks/useAuth';
 export const FeedContainer = ({ feedType = 'discover' }) => {
   const [activeIndex, setActiveIndex] = useState(0);
   const containerRef = useRef(null);
+  const cursorRef = useRef(null);
   const { isAuthenticated } = useAuth();
 
   // Fetch function based on feed type
@@ -19,7 +20,13 @@ export const FeedContainer = ({ feedType = 'discover' }) => {
       if (feedType === 'personalized' && isAuthenticated) {
         return await recipeService.getPersonalizedFeed(page, pageSize);
       } else {
-        return await recipeService.getFeed(page, pageSize);
+        // Discover feed pages by cursor so deep pages stay cheap
+        if (page === 1) {
+          cursorRef.current = null;
+        }
+        const { items, nextCursor } = await recipeService.getFeedPage(cursorRef.current, pageSize);
+        cursorRef.current = nextCursor;
+        return items;
       }
     },
     [feedType, isAuthenticated]
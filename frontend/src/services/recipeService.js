@@ -1,4 +1,4 @@
-import { get, post, put, del } from './api';
+import api, { get, post, put, del } from './api';
 
 /**
  * Recipe Service
@@ -16,6 +16,26 @@ class RecipeService {
     }
   }
   
+  /**
+   * Get recipe feed page by cursor (keyset pagination)
+   */
+  async getFeedPage(cursor = null, pageSize = 10) {
+    try {
+      const params = new URLSearchParams({ limit: pageSize });
+      if (cursor) {
+        params.set('cursor', cursor);
+      }
+      
+      const response = await api.get(`/recipes/feed/discover?${params}`);
+      return {
+        items: response.data,
+        nextCursor: response.headers['x-next-cursor'] || null,
+      };
+    } catch (error) {
+      throw error;
+    }
+  }
+  
   /**
    * Get personalized feed
    */
@@ -175,7 +195,7 @@ class RecipeService {
    */
   async getTrendingRecipes(limit = 20) {
     try {
-      return await get(`/search/trending?limit=${limit}`);
+      return await get(`/recipes/feed/trending?limit=${limit}`);
     } catch (error) {
       throw error;
     }
@@ -186,7 +206,7 @@ class RecipeService {
    */
   async getSimilarRecipes(recipeId, limit = 10) {
     try {
-      return await get(`/recommendations/similar/${recipeId}?limit=${limit}`);
+      return await get(`/recipes/${recipeId}/similar?limit=${limit}`);
     } catch (error) {
       throw error;
     }